@@ -1,80 +1,36 @@
 # app/admin_pdf.py
 from io import BytesIO
 from datetime import datetime
-from pathlib import Path
 
 from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
 from reportlab.lib.units import mm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-
-
-# ===============================
-# Colors
-# ===============================
-BG = colors.HexColor("#0b1220")
-TEXT = colors.HexColor("#e6edf7")
-MUTED = colors.HexColor("#a6b3cc")
-ACCENT = colors.HexColor("#7c3aed")
-
-
-# ===============================
-# Font setup (Render-safe)
-# ===============================
-BASE_DIR = Path(__file__).resolve().parent
-FONT_DIR = BASE_DIR / "assets" / "fonts"
-FONT_REGULAR = FONT_DIR / "DejaVuSans.ttf"
-FONT_BOLD = FONT_DIR / "DejaVuSans-Bold.ttf"
-
-
-def _register_fonts():
-    """
-    Register a Unicode font so Turkish characters render correctly.
-    Uses repo path: app/assets/fonts/DejaVuSans.ttf
-    """
-    # already registered?
-    try:
-        pdfmetrics.getFont("DejaVu")
-        pdfmetrics.getFont("DejaVu-Bold")
-        return
-    except KeyError:
-        pass
-
-    if not FONT_REGULAR.exists():
-        raise FileNotFoundError(
-            f"Font not found: {FONT_REGULAR}. "
-            f"Make sure it's committed under app/assets/fonts/"
-        )
-
-    pdfmetrics.registerFont(TTFont("DejaVu", str(FONT_REGULAR)))
-
-    # Bold optional: fallback to regular if missing
-    if FONT_BOLD.exists():
-        pdfmetrics.registerFont(TTFont("DejaVu-Bold", str(FONT_BOLD)))
-    else:
-        pdfmetrics.registerFont(TTFont("DejaVu-Bold", str(FONT_REGULAR)))
 
+from app.pdf_template import ACCENT, MUTED, TEXT, ReportCanvas, fill_background
 
-def build_admin_analysis_pdf(company_name: str, sector_label: str, bullets: list[str]) -> bytes:
-    _register_fonts()
 
+def _page_chrome(c, w, h):
+    # her sayfa: arka plan + footer
+    fill_background(c, w, h)
+    c.setFillColor(MUTED)
+    c.setFont("DejaVu", 9.5)
+    c.drawString(18 * mm, 12 * mm, "cashguardtr.com • admin raporu")
+
+
+def _first_page_header(c, w, h):
+    c.setFillColor(TEXT)
+    c.setFont("DejaVu-Bold", 18)
+    c.drawString(18 * mm, h - 18 * mm, "CashGuard — Admin Analiz Raporu")
+
+
+def build_admin_analysis_pdf(company_name: str, sector_label: str, bullets: list[str]) -> bytes:
     buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=A4)
+    c = ReportCanvas(buf, page=_page_chrome, first_page=_first_page_header)
     w, h = A4
 
-    # background
-    c.setFillColor(BG)
-    c.rect(0, 0, w, h, fill=1, stroke=0)
-
     mx = 18 * mm
     y = h - 18 * mm
 
-    # header
-    c.setFillColor(TEXT)
-    c.setFont("DejaVu-Bold", 18)
-    c.drawString(mx, y, "CashGuard — Admin Analiz Raporu")
+    # header (başlık şablondan; firma satırı ve tarih dinamik)
     y -= 8 * mm
 
     c.setFont("DejaVu", 11)
@@ -94,8 +50,6 @@ def build_admin_analysis_pdf(company_name: str, sector_label: str, bullets: list
     for i, b in enumerate(bullets, start=1):
         if y < 20 * mm:
             c.showPage()
-            c.setFillColor(BG)
-            c.rect(0, 0, w, h, fill=1, stroke=0)
             y = h - 18 * mm
 
             c.setFillColor(TEXT)
@@ -111,11 +65,6 @@ def build_admin_analysis_pdf(company_name: str, sector_label: str, bullets: list
         c.drawString(mx + 7 * mm, y, f"{i}) {b}")
         y -= 7 * mm
 
-    # footer
-    c.setFillColor(MUTED)
-    c.setFont("DejaVu", 9.5)
-    c.drawString(mx, 12 * mm, "cashguardtr.com • admin raporu")
-
     c.save()
     pdf_bytes = buf.getvalue()
     buf.close()
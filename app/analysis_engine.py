@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Tuple, List, Optional, Any
+from typing import Dict, Tuple, List, Optional, Any, Iterator
 
 from openpyxl import load_workbook
 
 from app.fin_mapping import map_item_to_key, normalize_text, explain_key
 
+# Parser çıktısını etkileyen her değişiklikte artır (parse cache anahtarına girer)
+PARSER_VERSION = "2026.10.1"
+
 # Eski şema (geriye uyum)
 SHEET_BS = "BILANCO"
 SHEET_IS = "GELIR"
@@ -28,6 +31,80 @@ def _as_float(v: Any) -> float:
         return 0.0
 
 
+# ============================================================
+# 0) SHEET OKUMA — READ-ONLY, TEK GEÇİŞ (STREAMING)
+# ============================================================
+
+def _at(row: Tuple[Any, ...], c: int) -> Any:
+    """1-tabanlı kolon erişimi; satır kısa ise None döner (read-only satırlar değişken uzunlukta)."""
+    if 1 <= c <= len(row):
+        return row[c - 1]
+    return None
+
+
+class _SheetRows:
+    """
+    Worksheet üzerinde tek ileri geçişlik satır akışı.
+
+    - head(n): ilk n satırı tamponlar (header/tespit taramaları için, tekrar okunabilir).
+    - rows_from(r): r. satırdan itibaren (satir_no, degerler) üretir; tamponun ötesi
+      tamponlanmadan akıtılır, bu yüzden akış sadece bir kez tüketilebilir.
+    - materialize(): küçük sheet'ler (GELIR/BILANCO) için tüm satırları tampona alır;
+      sonrasında rows_from istenildiği kadar çağrılabilir.
+    """
+
+    def __init__(self, ws):
+        # Bazı exporter'lar <dimension> etiketini yanlış yazar; read-only'de kolon kırpılmasın.
+        if hasattr(ws, "reset_dimensions"):
+            ws.reset_dimensions()
+        self.title = ws.title
+        self._it = ws.iter_rows(values_only=True)
+        self._head: List[Tuple[Any, ...]] = []
+        self._exhausted = False
+        self._streamed = False
+
+    def _pull(self) -> bool:
+        if self._exhausted:
+            return False
+        try:
+            self._head.append(tuple(next(self._it)))
+            return True
+        except StopIteration:
+            self._exhausted = True
+            return False
+
+    def head(self, n: int) -> List[Tuple[Any, ...]]:
+        while len(self._head) < n and self._pull():
+            pass
+        return self._head[:n]
+
+    def materialize(self) -> List[Tuple[Any, ...]]:
+        if self._streamed:
+            raise RuntimeError(f"'{self.title}' sheet'i zaten akıtıldı; materialize edilemez.")
+        while self._pull():
+            pass
+        return self._head
+
+    def rows_from(self, start: int) -> Iterator[Tuple[int, Tuple[Any, ...]]]:
+        r = max(1, start)
+        while r <= len(self._head):
+            yield r, self._head[r - 1]
+            r += 1
+        if self._exhausted:
+            return
+
+        if self._streamed:
+            raise RuntimeError(f"'{self.title}' sheet'i ikinci kez akıtılamaz.")
+        self._streamed = True
+
+        pos = len(self._head)
+        for vals in self._it:
+            pos += 1
+            if pos >= r:
+                yield pos, vals
+        self._exhausted = True
+
+
 # ============================================================
 # 1) MİZAN / TRIAL BALANCE PARSER (KODA DAYALI, TASARIM-BAĞIMSIZ)
 #    ✅ 3-haneli ana hesap konsolidasyonu + kontra (-) düzeltmesi
@@ -69,25 +146,24 @@ class TBRow:
     digits_len: int
 
 
-def _looks_like_trial_balance(ws) -> bool:
-    for r in range(1, min(ws.max_row, 30) + 1):
-        row = [ws.cell(r, c).value for c in range(1, min(ws.max_column, 15) + 1)]
+def _looks_like_trial_balance(sheet: _SheetRows) -> bool:
+    for row in sheet.head(30):
+        row = row[:15]
         norm = " ".join(normalize_text(x) for x in row if x is not None)
         if "hesap kodu" in norm and ("bakiye" in norm or "borc" in norm or "alacak" in norm):
             return True
     return False
 
 
-def _find_tb_header(ws) -> Tuple[int, Dict[str, int]]:
+def _find_tb_header(sheet: _SheetRows) -> Tuple[int, Dict[str, int]]:
     header_row = None
     headers: Dict[str, int] = {}
 
     def norm_cell(x: Any) -> str:
         return normalize_text(x)
 
-    for r in range(1, min(ws.max_row, 40) + 1):
-        row = [ws.cell(r, c).value for c in range(1, min(ws.max_column, 25) + 1)]
-        normed = [norm_cell(x) for x in row]
+    for r, row in enumerate(sheet.head(40), start=1):
+        normed = [norm_cell(x) for x in row[:25]]
 
         if any(x == "hesap kodu" for x in normed) and any(
             x in {"hesap adi", "hesap adı"} or "hesap ad" in x for x in normed
@@ -118,12 +194,12 @@ def _find_tb_header(ws) -> Tuple[int, Dict[str, int]]:
     return header_row, headers
 
 
-def _parse_trial_balance_sheet(ws) -> List[TBRow]:
-    header_row, col = _find_tb_header(ws)
+def _parse_trial_balance_sheet(sheet: _SheetRows) -> List[TBRow]:
+    header_row, col = _find_tb_header(sheet)
     out: List[TBRow] = []
 
-    for r in range(header_row + 1, ws.max_row + 1):
-        raw_code = ws.cell(r, col["code"]).value
+    for _r, row in sheet.rows_from(header_row + 1):
+        raw_code = _at(row, col["code"])
         if raw_code is None:
             continue
         code_txt = str(raw_code).strip()
@@ -138,13 +214,13 @@ def _parse_trial_balance_sheet(ws) -> List[TBRow]:
         if c3 is None:
             continue
 
-        name = str(ws.cell(r, col["name"]).value or "").strip()
+        name = str(_at(row, col["name"]) or "").strip()
 
         if "balance" in col:
-            bal = _as_float(ws.cell(r, col["balance"]).value)
+            bal = _as_float(_at(row, col["balance"]))
         else:
-            bal_deb = _as_float(ws.cell(r, col["bal_debit"]).value)
-            bal_cred = _as_float(ws.cell(r, col["bal_credit"]).value)
+            bal_deb = _as_float(_at(row, col["bal_debit"]))
+            bal_cred = _as_float(_at(row, col["bal_credit"]))
             bal = bal_deb - bal_cred
 
         if abs(bal) < 1e-6:
@@ -163,17 +239,15 @@ def _parse_trial_balance_sheet(ws) -> List[TBRow]:
     return out
 
 
-def _pick_trial_balance_ws(wb) -> Optional[Any]:
-    for nm in wb.sheetnames:
+def _pick_trial_balance_ws(sheets: Dict[str, _SheetRows]) -> Optional[_SheetRows]:
+    for nm, sheet in sheets.items():
         n = normalize_text(nm)
         if "mizan" in n:
-            ws = wb[nm]
-            if _looks_like_trial_balance(ws):
-                return ws
-    for nm in wb.sheetnames:
-        ws = wb[nm]
-        if _looks_like_trial_balance(ws):
-            return ws
+            if _looks_like_trial_balance(sheet):
+                return sheet
+    for sheet in sheets.values():
+        if _looks_like_trial_balance(sheet):
+            return sheet
     return None
 
 
@@ -200,24 +274,55 @@ def _consolidate_to_3digit(rows: List[TBRow]) -> Dict[int, float]:
     return out
 
 
-def _sum_3range(b3: Dict[int, float], lo: int, hi: int) -> float:
-    return sum(v for k, v in b3.items() if lo <= k <= hi)
+class _Ledger3:
+    """
+    Parse başına bir kez kurulan 3-haneli konsolide mizan.
+
+    Bilanço ve P&L üreticileri aynı nesneyi paylaşır; 000-999 kod uzayı üzerinde
+    önceden hesaplanmış prefix-sum dizisi sayesinde her aralık sorgusu O(1).
+    """
 
+    __slots__ = ("b3", "_cum")
+
+    def __init__(self, b3: Dict[int, float]):
+        self.b3 = b3
+        dense = [0.0] * 1000
+        for k, v in b3.items():
+            if 0 <= k <= 999:
+                dense[k] += v
+        cum = [0.0] * 1001  # cum[i] = kod < i toplamı
+        acc = 0.0
+        for i, v in enumerate(dense):
+            acc += v
+            cum[i + 1] = acc
+        self._cum = cum
+
+    @classmethod
+    def from_rows(cls, rows: List[TBRow]) -> "_Ledger3":
+        return cls(_consolidate_to_3digit(rows))
+
+    def get(self, code: int) -> float:
+        return float(self.b3.get(code, 0.0) or 0.0)
+
+    def range(self, lo: int, hi: int) -> float:
+        lo = max(lo, 0)
+        hi = min(hi, 999)
+        if lo > hi:
+            return 0.0
+        return self._cum[hi + 1] - self._cum[lo]
 
-def _sum_3set(b3: Dict[int, float], codes: List[int]) -> float:
-    return sum(float(b3.get(c, 0.0) or 0.0) for c in codes)
+    def sum_set(self, codes: List[int]) -> float:
+        return sum(self.get(c) for c in codes)
 
 
-def _sum_prefix(rows: List[TBRow], prefixes: List[str]) -> float:
+def _sum_prefix(ledger: _Ledger3, prefixes: List[str]) -> float:
     """
     ✅ NameError fix + Çifte saymayı engeller:
-    - Önce 3-haneli konsolidasyon (b3) üzerinden toplar.
+    - 3-haneli konsolidasyon (ledger) üzerinden toplar; aralıklar O(1).
     - Prefix "60" gibi 2 haneliyse 600-699 aralığına eşler
     - Prefix "6" gibi 1 haneliyse 600-699 değil; 600-699 için "60" verin.
     - Prefix "780" gibi 3 haneliyse doğrudan b3[780] gibi.
     """
-    b3 = _consolidate_to_3digit(rows)
-
     total = 0.0
     for p in prefixes:
         pd = "".join(ch for ch in str(p) if ch.isdigit())
@@ -227,51 +332,49 @@ def _sum_prefix(rows: List[TBRow], prefixes: List[str]) -> float:
         if len(pd) == 1:
             lo = int(pd) * 100
             hi = lo + 99
-            total += _sum_3range(b3, lo, hi)
+            total += ledger.range(lo, hi)
 
         elif len(pd) == 2:
             # 60 -> 600-699
             lo = int(pd) * 10
             lo = lo * 10
             hi = lo + 99
-            total += _sum_3range(b3, lo, hi)
+            total += ledger.range(lo, hi)
 
         else:
             k = int(pd[:3])
-            total += float(b3.get(k, 0.0) or 0.0)
+            total += ledger.get(k)
 
     return total
 
 
-def _trial_balance_to_canonical(rows: List[TBRow]) -> Dict[str, float]:
+def _trial_balance_to_canonical(ledger: _Ledger3) -> Dict[str, float]:
     bs: Dict[str, float] = {}
 
-    b3 = _consolidate_to_3digit(rows)
-
-    current_assets = _sum_3range(b3, 100, 199)
-    non_current_assets = _sum_3range(b3, 200, 299)
+    current_assets = ledger.range(100, 199)
+    non_current_assets = ledger.range(200, 299)
     total_assets = current_assets + non_current_assets
 
-    cash = _sum_3set(b3, [100, 101, 102, 108, 103])
-    trade_ar = _sum_3range(b3, 120, 129)
-    other_ar = _sum_3range(b3, 131, 139)
-    inv = _sum_3set(b3, [150, 151, 152, 153, 157, 158, 159, 170, 171, 172, 173, 178, 179])
-    prepaid = float(b3.get(180, 0.0) or 0.0)
-    other_ca = _sum_3set(b3, [190, 191, 192, 193, 195, 196, 197, 198, 199])
+    cash = ledger.sum_set([100, 101, 102, 108, 103])
+    trade_ar = ledger.range(120, 129)
+    other_ar = ledger.range(131, 139)
+    inv = ledger.sum_set([150, 151, 152, 153, 157, 158, 159, 170, 171, 172, 173, 178, 179])
+    prepaid = ledger.get(180)
+    other_ca = ledger.sum_set([190, 191, 192, 193, 195, 196, 197, 198, 199])
 
-    cl_signed = _sum_3range(b3, 300, 399)
+    cl_signed = ledger.range(300, 399)
     current_liabilities = abs(cl_signed)
 
-    ll_signed = _sum_3range(b3, 400, 499)
+    ll_signed = ledger.range(400, 499)
     long_liabilities = abs(ll_signed)
 
-    st_fin_debt = abs(_sum_3set(b3, [300, 301, 303, 304, 305, 306, 309, 302, 308]))
-    lt_fin_debt = abs(_sum_3set(b3, [400, 401, 405, 407, 409, 402, 408]))
+    st_fin_debt = abs(ledger.sum_set([300, 301, 303, 304, 305, 306, 309, 302, 308]))
+    lt_fin_debt = abs(ledger.sum_set([400, 401, 405, 407, 409, 402, 408]))
 
-    trade_payables = abs(_sum_3range(b3, 320, 329))
-    tax_liab = abs(_sum_3set(b3, [360, 361, 368, 369, 391, 392]))
+    trade_payables = abs(ledger.range(320, 329))
+    tax_liab = abs(ledger.sum_set([360, 361, 368, 369, 391, 392]))
 
-    eq_signed = _sum_3range(b3, 500, 599)
+    eq_signed = ledger.range(500, 599)
     equity = abs(eq_signed)
 
     bs["cash_and_equivalents"] = cash
@@ -299,7 +402,7 @@ def _trial_balance_to_canonical(rows: List[TBRow]) -> Dict[str, float]:
     return bs
 
 
-def _trial_balance_to_income_statement(rows: List[TBRow]) -> Dict[str, float]:
+def _trial_balance_to_income_statement(ledger: _Ledger3) -> Dict[str, float]:
     """
     Mizan’dan P&L üretimi (fallback).
 
@@ -314,19 +417,19 @@ def _trial_balance_to_income_statement(rows: List[TBRow]) -> Dict[str, float]:
     """
     inc: Dict[str, float] = {}
 
-    gross_sales = -_sum_prefix(rows, ["60"])
-    discounts = _sum_prefix(rows, ["61"])
+    gross_sales = -_sum_prefix(ledger, ["60"])
+    discounts = _sum_prefix(ledger, ["61"])
     revenue_net = gross_sales - discounts
 
-    cogs = _sum_prefix(rows, ["62"])
-    opex = _sum_prefix(rows, ["63"])
+    cogs = _sum_prefix(ledger, ["62"])
+    opex = _sum_prefix(ledger, ["63"])
 
-    other_op_income = -_sum_prefix(rows, ["64"])
-    other_op_exp = _sum_prefix(rows, ["65"])
+    other_op_income = -_sum_prefix(ledger, ["64"])
+    other_op_exp = _sum_prefix(ledger, ["65"])
 
-    fin_exp_66 = _sum_prefix(rows, ["66"])
-    fin_exp_7a = _sum_prefix(rows, ["780", "781", "782"])
-    fin_exp_7b = _sum_prefix(rows, ["797"])
+    fin_exp_66 = _sum_prefix(ledger, ["66"])
+    fin_exp_7a = _sum_prefix(ledger, ["780", "781", "782"])
+    fin_exp_7b = _sum_prefix(ledger, ["797"])
 
     finance_expense = fin_exp_66 + fin_exp_7a + fin_exp_7b
 
@@ -353,18 +456,17 @@ def _trial_balance_to_income_statement(rows: List[TBRow]) -> Dict[str, float]:
 # 1.5) GELİR SHEET ESNEK PARSER (KOD YOK, KALEM ŞARTI YOK)
 # ============================================================
 
-def _looks_like_income_sheet(ws) -> bool:
+def _looks_like_income_sheet(sheet: _SheetRows) -> bool:
     needles = ["gelir tablosu", "net satis", "satıs", "satis", "hasilat", "satışların maliyeti",
                "satislarin maliyeti", "brut kar", "faiz", "finansman", "favok", "ebit"]
-    for r in range(1, min(ws.max_row, 40) + 1):
-        row = [ws.cell(r, c).value for c in range(1, min(ws.max_column, 20) + 1)]
-        text = " ".join(normalize_text(x) for x in row if x is not None)
+    for row in sheet.head(40):
+        text = " ".join(normalize_text(x) for x in row[:20] if x is not None)
         if any(n in text for n in needles):
             return True
     return False
 
 
-def _find_income_header(ws) -> Optional[Tuple[int, int, int]]:
+def _find_income_header(sheet: _SheetRows) -> Optional[Tuple[int, int, int]]:
     """
     returns: (header_row, desc_col, value_col)
     """
@@ -379,8 +481,8 @@ def _find_income_header(ws) -> Optional[Tuple[int, int, int]]:
     def norm(x: Any) -> str:
         return normalize_text(x)
 
-    for r in range(1, min(ws.max_row, 80) + 1):
-        row_vals = [ws.cell(r, c).value for c in range(1, min(ws.max_column, 40) + 1)]
+    for r, row in enumerate(sheet.head(80), start=1):
+        row_vals = row[:40]
         normed = [norm(x) for x in row_vals]
 
         desc_col = None
@@ -422,11 +524,11 @@ def _find_income_header(ws) -> Optional[Tuple[int, int, int]]:
     return None
 
 
-def _parse_income_sheet_flexible(ws) -> Tuple[Dict[str, float], List[Dict[str, Any]]]:
+def _parse_income_sheet_flexible(sheet: _SheetRows) -> Tuple[Dict[str, float], List[Dict[str, Any]]]:
     """
     KALEM şartı olmadan gelir tablosu okur.
     """
-    hdr = _find_income_header(ws)
+    hdr = _find_income_header(sheet)
     if not hdr:
         raise ValueError("Gelir sheet'inde açıklama+tutar header'ı bulunamadı (esnek parser).")
 
@@ -446,9 +548,9 @@ def _parse_income_sheet_flexible(ws) -> Tuple[Dict[str, float], List[Dict[str, A
         return False
 
     empty_streak = 0
-    for r in range(header_row + 1, ws.max_row + 1):
-        raw_name = ws.cell(r, desc_col).value
-        raw_val = ws.cell(r, value_col).value
+    for _r, row in sheet.rows_from(header_row + 1):
+        raw_name = _at(row, desc_col)
+        raw_val = _at(row, value_col)
 
         if raw_name is None and raw_val is None:
             empty_streak += 1
@@ -503,23 +605,25 @@ def _merge_income(preferred: Dict[str, float], fallback: Dict[str, float]) -> Di
 # 2) ESKİ PARSER (BILANCO/GELIR) - GERİYE UYUMLU KALSIN
 # ============================================================
 
-def _find_kalem_headers(ws, max_scan_rows: int = 25) -> List[Tuple[int, int]]:
+def _find_kalem_headers(rows: List[Tuple[Any, ...]], max_scan_rows: int = 25) -> List[Tuple[int, int]]:
     headers: List[Tuple[int, int]] = []
-    for r in range(1, min(ws.max_row, max_scan_rows) + 1):
-        for c in range(1, ws.max_column + 1):
-            v = ws.cell(r, c).value
+    for r, row in enumerate(rows[:max_scan_rows], start=1):
+        for c, v in enumerate(row, start=1):
             if isinstance(v, str) and v.strip().upper() == "KALEM":
                 headers.append((r, c))
     headers.sort(key=lambda x: (x[0], x[1]))
     return headers
 
 
-def _year_cols_from_header(ws, header_row: int, kalem_col: int, max_years: int = 10) -> List[Tuple[int, int]]:
+def _year_cols_from_header(
+    rows: List[Tuple[Any, ...]], header_row: int, kalem_col: int, max_years: int = 10
+) -> List[Tuple[int, int]]:
     out: List[Tuple[int, int]] = []
+    row = rows[header_row - 1]
     scanned = 0
     c = kalem_col + 1
-    while c <= ws.max_column and scanned < 25 and len(out) < max_years:
-        v = ws.cell(header_row, c).value
+    while c <= len(row) and scanned < 25 and len(out) < max_years:
+        v = row[c - 1]
         yr: Optional[int] = None
         if isinstance(v, int) and 1900 <= v <= 2200:
             yr = v
@@ -550,10 +654,12 @@ def _is_noise_row(name: str) -> bool:
     return False
 
 
-def _block_rows(ws, start_row: int, end_row: int, kalem_col: int, value_col: int) -> List[Tuple[str, float]]:
+def _block_rows(
+    rows: List[Tuple[Any, ...]], start_row: int, end_row: int, kalem_col: int, value_col: int
+) -> List[Tuple[str, float]]:
     items: List[Tuple[str, float]] = []
-    for r in range(start_row, min(end_row, ws.max_row) + 1):
-        k = ws.cell(r, kalem_col).value
+    for row in rows[start_row - 1:min(end_row, len(rows))]:
+        k = _at(row, kalem_col)
         if k is None:
             continue
         name = str(k).strip()
@@ -561,7 +667,7 @@ def _block_rows(ws, start_row: int, end_row: int, kalem_col: int, value_col: int
             continue
         if _is_noise_row(name):
             continue
-        v = ws.cell(r, value_col).value
+        v = _at(row, value_col)
         items.append((name, _as_float(v)))
     return items
 
@@ -588,16 +694,35 @@ def _items_to_canonical(items: List[Tuple[str, float]]) -> Tuple[Dict[str, float
 # 3) TEK GİRİŞ NOKTASI: parse_financials_xlsx
 # ============================================================
 
-def parse_financials_xlsx(xlsx_path: str) -> dict:
-    wb = load_workbook(xlsx_path, data_only=True)
+def parse_financials_xlsx(xlsx_path: str, read_only: bool = True) -> dict:
+    """
+    read_only=True (varsayılan): workbook read-only açılır ve her sheet tek ileri geçişte
+    (iter_rows(values_only=True)) okunur; büyük mizanlarda bellek sabit kalır.
+    read_only=False: eski tam yükleme (kıyas/benchmark için).
+    """
+    wb = load_workbook(xlsx_path, data_only=True, read_only=read_only)
+    try:
+        sheets = {nm: _SheetRows(wb[nm]) for nm in wb.sheetnames}
+        return _parse_sheets(sheets)
+    finally:
+        # read-only modda dosya handle'ı açık kalır
+        wb.close()
+
+
+def _parse_sheets(sheets: Dict[str, _SheetRows]) -> dict:
+    # GELIR küçük bir sheet: tamponla ki esnek + legacy parser aynı satırları okuyabilsin
+    is_rows: Optional[List[Tuple[Any, ...]]] = None
+    if SHEET_IS in sheets:
+        is_rows = sheets[SHEET_IS].materialize()
 
-    tb_ws = _pick_trial_balance_ws(wb)
-    if tb_ws is not None:
-        tb_rows = _parse_trial_balance_sheet(tb_ws)
-        bs_canon = _trial_balance_to_canonical(tb_rows)
+    tb_sheet = _pick_trial_balance_ws(sheets)
+    if tb_sheet is not None:
+        tb_rows = _parse_trial_balance_sheet(tb_sheet)
+        ledger = _Ledger3.from_rows(tb_rows)
+        bs_canon = _trial_balance_to_canonical(ledger)
 
         # ✅ Mizan'dan fallback P&L
-        inc_fallback = _trial_balance_to_income_statement(tb_rows)
+        inc_fallback = _trial_balance_to_income_statement(ledger)
 
         # ✅ Gelir sheet varsa: önce esnek parser dene, olmadı legacy KALEM dene
         inc_preferred: Dict[str, float] = {}
@@ -606,13 +731,13 @@ def parse_financials_xlsx(xlsx_path: str) -> dict:
         is_year = None
         income_mode = "trial_balance_only"
 
-        if SHEET_IS in wb.sheetnames:
-            ws_is = wb[SHEET_IS]
+        if is_rows is not None:
+            sh_is = sheets[SHEET_IS]
 
             # 1) Esnek parser (KALEM şartı yok)
             try:
-                if _looks_like_income_sheet(ws_is):
-                    inc_preferred, is_log = _parse_income_sheet_flexible(ws_is)
+                if _looks_like_income_sheet(sh_is):
+                    inc_preferred, is_log = _parse_income_sheet_flexible(sh_is)
                     if inc_preferred:
                         income_mode = "income_sheet_flexible"
             except Exception:
@@ -620,13 +745,13 @@ def parse_financials_xlsx(xlsx_path: str) -> dict:
 
             # 2) Esnek boşsa legacy KALEM parser dene
             if not inc_preferred:
-                is_headers = _find_kalem_headers(ws_is)
+                is_headers = _find_kalem_headers(is_rows)
                 if is_headers:
                     hr, kc = is_headers[0]
-                    years = _year_cols_from_header(ws_is, hr, kc)
+                    years = _year_cols_from_header(is_rows, hr, kc)
                     is_year, vc = years[-1] if years else (None, kc + 1)
-                    next_hr = is_headers[1][0] if len(is_headers) > 1 else ws_is.max_row + 1
-                    is_items = _block_rows(ws_is, start_row=hr + 1, end_row=next_hr - 1, kalem_col=kc, value_col=vc)
+                    next_hr = is_headers[1][0] if len(is_headers) > 1 else len(is_rows) + 1
+                    is_items = _block_rows(is_rows, start_row=hr + 1, end_row=next_hr - 1, kalem_col=kc, value_col=vc)
                     inc_preferred, is_log = _items_to_canonical(is_items)
                     if inc_preferred:
                         income_mode = "income_sheet_legacy_kalem"
@@ -650,13 +775,12 @@ def parse_financials_xlsx(xlsx_path: str) -> dict:
         }
 
     # Legacy: BILANCO/GELIR
-    if SHEET_BS not in wb.sheetnames or SHEET_IS not in wb.sheetnames:
+    if SHEET_BS not in sheets or is_rows is None:
         raise ValueError("Bu Excel’de mizan bulunamadı; ayrıca BILANCO/GELIR sheet’leri de yok.")
 
-    ws_bs = wb[SHEET_BS]
-    ws_is = wb[SHEET_IS]
+    bs_rows = sheets[SHEET_BS].materialize()
 
-    bs_headers = _find_kalem_headers(ws_bs)
+    bs_headers = _find_kalem_headers(bs_rows)
     if not bs_headers:
         raise ValueError("BILANCO sheet içinde 'KALEM' başlığı bulunamadı.")
 
@@ -664,14 +788,14 @@ def parse_financials_xlsx(xlsx_path: str) -> dict:
     bs_items_all: List[Tuple[str, float]] = []
 
     for idx, (hr, kc) in enumerate(bs_headers):
-        next_hr = bs_headers[idx + 1][0] if idx + 1 < len(bs_headers) else ws_bs.max_row + 1
+        next_hr = bs_headers[idx + 1][0] if idx + 1 < len(bs_headers) else len(bs_rows) + 1
         end_row = next_hr - 1
-        years = _year_cols_from_header(ws_bs, hr, kc)
+        years = _year_cols_from_header(bs_rows, hr, kc)
         if not years:
             continue
         year, vc = years[-1]
         bs_years_found.append(year)
-        items = _block_rows(ws_bs, start_row=hr + 1, end_row=end_row, kalem_col=kc, value_col=vc)
+        items = _block_rows(bs_rows, start_row=hr + 1, end_row=end_row, kalem_col=kc, value_col=vc)
         bs_items_all.extend(items)
 
     if not bs_items_all:
@@ -680,17 +804,17 @@ def parse_financials_xlsx(xlsx_path: str) -> dict:
     bs_year = max(bs_years_found) if bs_years_found else None
 
     # GELIR legacy
-    is_headers = _find_kalem_headers(ws_is)
+    is_headers = _find_kalem_headers(is_rows)
     if not is_headers:
         raise ValueError("GELIR sheet içinde 'KALEM' başlığı bulunamadı.")
 
     hr, kc = is_headers[0]
-    years = _year_cols_from_header(ws_is, hr, kc)
+    years = _year_cols_from_header(is_rows, hr, kc)
     if not years:
         raise ValueError("GELIR sheet'inde yıl kolonları bulunamadı.")
     is_year, vc = years[-1]
-    next_hr = is_headers[1][0] if len(is_headers) > 1 else ws_is.max_row + 1
-    is_items = _block_rows(ws_is, start_row=hr + 1, end_row=next_hr - 1, kalem_col=kc, value_col=vc)
+    next_hr = is_headers[1][0] if len(is_headers) > 1 else len(is_rows) + 1
+    is_items = _block_rows(is_rows, start_row=hr + 1, end_row=next_hr - 1, kalem_col=kc, value_col=vc)
 
     bs_canon, bs_log = _items_to_canonical(bs_items_all)
     is_canon, is_log = _items_to_canonical(is_items)
@@ -0,0 +1,169 @@
+# app/analysis_store.py
+"""
+Analiz sonucunun normalize saklanması.
+
+analyze_financials() çıktısı üç parçaya ayrılır:
+- analyses.result_json        : sadece meta + bullets (küçük; liste/PDF için yeterli)
+- analysis_metrics            : metrikler tipli Float kolonlarda (analiz başına tek satır)
+- analysis_mapping_logs       : mapping_log (tüm mizan satırları) gzip'li JSON; yalnızca
+                                mapping-debug sayfası load_mapping_log() ile açar
+
+Eski (tek blob) satırlar migrate_legacy() ile partiler halinde dönüştürülür; okuyucular
+dönüşmemiş satırlarda da çalışır (blob'a geri düşer).
+
+CLI:
+    python -m app.analysis_store migrate
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models import Analysis, AnalysisMappingLog, AnalysisMetrics
+
+MIGRATE_BATCH = int(os.getenv("ANALYSIS_MIGRATE_BATCH", "200"))
+MAPPING_LOG_GZIP_LEVEL = int(os.getenv("MAPPING_LOG_GZIP_LEVEL", "6"))
+
+METRIC_KEYS = tuple(c.name for c in AnalysisMetrics.__table__.columns if c.name not in ("analysis_id", "year_bs", "year_is"))
+
+log = logging.getLogger(__name__)
+
+
+# =========================
+# Dönüşümler
+# =========================
+def _float(v: Any) -> Optional[float]:
+    try:
+        return float(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _int(v: Any) -> Optional[int]:
+    try:
+        return int(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def pack_mapping_log(mlog: dict) -> Tuple[bytes, int]:
+    """(gzip'li JSON, ham boyut)"""
+    raw = json.dumps(mlog, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return gzip.compress(raw, compresslevel=MAPPING_LOG_GZIP_LEVEL, mtime=0), len(raw)
+
+
+def unpack_mapping_log(row: AnalysisMappingLog) -> dict:
+    return decode_mapping_log(row.data)
+
+
+def decode_mapping_log(data: bytes) -> dict:
+    return json.loads(gzip.decompress(data))
+
+
+def _split(result: dict) -> Tuple[dict, dict, dict]:
+    meta = result.get("meta") or {}
+    summary = {"meta": meta, "bullets": list(result.get("bullets") or [])}
+    m = result.get("metrics") or {}
+    metrics = {k: _float(m.get(k)) for k in METRIC_KEYS}
+    metrics.update(year_bs=_int(meta.get("year_bs")), year_is=_int(meta.get("year_is")))
+    return summary, metrics, result.get("mapping_log") or {}
+
+
+def _attach(analysis: Analysis, result: dict) -> None:
+    summary, metrics, mlog = _split(result)
+    analysis.result_json = json.dumps(summary, ensure_ascii=False)
+    analysis.metrics = AnalysisMetrics(**metrics)
+    packed, raw_size = pack_mapping_log(mlog)
+    analysis.mapping_log = AnalysisMappingLog(data=packed, raw_size=raw_size)
+
+
+# =========================
+# Yazma / okuma
+# =========================
+def save_analysis(db: Session, company_id: int, result: dict) -> Analysis:
+    """analyze_financials() sonucunu üç tabloya yazar (commit eder)."""
+    analysis = Analysis(company_id=company_id)
+    _attach(analysis, result)
+    db.add(analysis)
+    db.commit()
+    return analysis
+
+
+def load_summary(analysis: Analysis) -> dict:
+    """meta + bullets; mapping log'a dokunmaz."""
+    return json.loads(analysis.result_json)
+
+
+def metrics_dict(m: Optional[AnalysisMetrics]) -> Dict[str, Optional[float]]:
+    if m is None:
+        return {}
+    return {k: getattr(m, k) for k in METRIC_KEYS}
+
+
+def load_mapping_log(db: Session, analysis: Analysis) -> dict:
+    row = db.get(AnalysisMappingLog, analysis.id)
+    if row is not None:
+        return unpack_mapping_log(row)
+    # dönüştürülmemiş eski satır
+    return json.loads(analysis.result_json).get("mapping_log") or {}
+
+
+# =========================
+# Migration (tek blob -> normalize)
+# =========================
+def migrate_legacy(batch_size: int = MIGRATE_BATCH) -> int:
+    """analysis_metrics satırı olmayan analizleri dönüştürür; dönüştürülen satır sayısını döner."""
+    done = 0
+    last_id = 0
+    while True:
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(Analysis)
+                .outerjoin(AnalysisMetrics, AnalysisMetrics.analysis_id == Analysis.id)
+                .where(AnalysisMetrics.analysis_id.is_(None), Analysis.id > last_id)
+                .order_by(Analysis.id)
+                .limit(batch_size)
+            ).scalars().all()
+            if not rows:
+                break
+            for a in rows:
+                try:
+                    result = json.loads(a.result_json)
+                except (TypeError, ValueError):
+                    log.warning("analysis %s: result_json okunamadı, atlandı", a.id)
+                    continue
+                _attach(a, result)
+                done += 1
+            last_id = rows[-1].id
+            db.commit()
+        finally:
+            db.close()
+    if done:
+        log.info("analysis_store: %d analiz normalize edildi", done)
+    return done
+
+
+def main(argv: Optional[list] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] != ["migrate"]:
+        print("Kullanım: python -m app.analysis_store migrate", file=sys.stderr)
+        return 2
+    from app.db import engine
+    from app.migrations import ensure_schema
+
+    ensure_schema(engine)
+    print(f"{migrate_legacy()} analiz dönüştürüldü")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
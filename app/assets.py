@@ -0,0 +1,384 @@
+# app/assets.py
+"""
+CSS/JS asset pipeline + statik dosya servisi.
+
+Build (deploy öncesi ya da style.css / *.js değişince):
+    python -m app.assets build
+
+- app/static kökündeki .css/.js dosyaları küçültülür (yorumlar + gereksiz boşluklar) ve
+  static/dist/<ad>.<içerik hash>.<ext> olarak yazılır; yanına .gz ve .br (`brotli`,
+  requirements.txt) hazır sıkıştırılmış kopyalar konur. Eşleme static/dist/manifest.json'da.
+- static_url("style.css") şablonlarda elle yazılan ?v=... yerine geçer: manifestte güncel bir
+  hash'li kopya varsa onu, yoksa (build çalışmamış / kaynak build'den sonra değişmiş) kaynağı
+  içerik hash'li ?v= ile döner. Site build'siz de doğru dosyayı sunar.
+- AssetStaticFiles: Accept-Encoding'e göre .br / .gz kardeş dosyayı sunar (Vary: Accept-Encoding);
+  hash'li yollar (dist/, img/) "immutable" ve 1 yıl, diğerleri kısa süre cache'lenir.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.config import BASE_DIR
+
+STATIC_DIR = BASE_DIR / "static"
+DIST_DIR = STATIC_DIR / "dist"
+MANIFEST_PATH = DIST_DIR / "manifest.json"
+
+ASSET_EXTS = (".css", ".js")
+GZIP_LEVEL = 9
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "3600"))  # hash'siz dosyalar
+IMMUTABLE = "public, max-age=31536000, immutable"
+# dist/<ad>.<hash>.<ext> ve img/<ad>.<genişlik>.<hash>.<ext>
+HASHED_RE = re.compile(r"^(dist|img)/.+\.[0-9a-f]{10}\.[a-z0-9]+$")
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # requirements'ta var; kurulu değilse yalnızca gzip üretilir
+    brotli = None
+
+log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_urls: Dict[str, str] = {}
+
+
+# =========================
+# Küçültme
+# =========================
+# Küçültücüler string / template literal / regex içeriğine dokunmaz; yalnızca yorumları ve
+# anlamı değiştirmeyen boşlukları atar.
+_CSS_TOKEN = re.compile(r"""/\*.*?\*/|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'""", re.S)
+_CSS_SPACE = re.compile(r"\s+")
+# ":" öncesi boşluk atılmaz: ".card :first-child" ile ".card:first-child" farklı seçicilerdir
+_CSS_PUNCT = re.compile(r"\s*([{};,>])\s*")
+_CSS_COLON = re.compile(r":\s+")
+
+
+def _css_code(chunk: str) -> str:
+    chunk = _CSS_SPACE.sub(" ", chunk)
+    chunk = _CSS_PUNCT.sub(r"\1", chunk)
+    chunk = _CSS_COLON.sub(":", chunk)
+    return chunk.replace(";}", "}")
+
+
+def minify_css(text: str) -> str:
+    parts: List[str] = []
+    code: List[str] = []
+    pos = 0
+    for m in _CSS_TOKEN.finditer(text):
+        code.append(text[pos:m.start()])
+        tok = m.group(0)
+        if tok.startswith("/*"):
+            code.append(" ")
+        else:
+            parts.append(_css_code("".join(code)))
+            parts.append(tok)
+            code = []
+        pos = m.end()
+    code.append(text[pos:])
+    parts.append(_css_code("".join(code)))
+    return "".join(parts).strip() + "\n"
+
+
+# "/" bu karakterlerden / anahtar kelimelerden sonra geliyorsa regex literal başlar, yoksa bölme
+_JS_REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+_JS_REGEX_KEYWORDS = {
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw", "case", "do", "else",
+    "yield", "await",
+}
+_JS_WORD = re.compile(r"[A-Za-z_$][\w$]*$")
+
+
+def _js_string(text: str, i: int) -> int:
+    """text[i] tırnak; kapanan tırnağın sonrasını döner."""
+    quote, n = text[i], len(text)
+    i += 1
+    while i < n and text[i] != quote:
+        i += 2 if text[i] == "\\" else 1
+    return i + 1
+
+
+def _js_template(text: str, i: int) -> int:
+    """text[i] == '`'; ${...} içindeki iç içe string/template/yorumlar atlanır."""
+    n = len(text)
+    i += 1
+    while i < n:
+        c = text[i]
+        if c == "\\":
+            i += 2
+        elif c == "`":
+            return i + 1
+        elif text.startswith("${", i):
+            i, depth = i + 2, 1
+            while i < n and depth:
+                c = text[i]
+                if c in "'\"":
+                    i = _js_string(text, i)
+                elif c == "`":
+                    i = _js_template(text, i)
+                elif text.startswith("//", i):
+                    i = text.find("\n", i) if "\n" in text[i:] else n
+                elif text.startswith("/*", i):
+                    i = text.find("*/", i + 2) + 2 if "*/" in text[i + 2:] else n
+                else:
+                    depth += c == "{"
+                    depth -= c == "}"
+                    i += 1
+        else:
+            i += 1
+    return n
+
+
+def _js_regex(text: str, i: int) -> int:
+    n, in_class = len(text), False
+    i += 1
+    while i < n and text[i] != "\n":
+        c = text[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            i += 1
+            while i < n and (text[i].isalnum() or text[i] in "_$"):
+                i += 1  # bayraklar
+            return i
+        i += 1
+    return i
+
+
+def minify_js(text: str) -> str:
+    """
+    Muhafazakâr ve token-farkında: yorumlar, satır başı/sonu boşlukları, boş satırlar atılır ve
+    satır içi boşluk dizileri teke iner. Satır sonları korunur (ASI'ye güvenen kod bozulmaz);
+    string, template literal ve regex içerikleri olduğu gibi kalır.
+    """
+    out: List[str] = []
+    pending_space = False
+    i, n = 0, len(text)
+
+    def last() -> str:
+        return out[-1][-1] if out else "\n"
+
+    def emit(tok: str) -> None:
+        nonlocal pending_space
+        if pending_space and last() != "\n":
+            out.append(" ")
+        pending_space = False
+        out.append(tok)
+
+    def newline() -> None:
+        nonlocal pending_space
+        pending_space = False
+        if last() != "\n":
+            out.append("\n")
+
+    while i < n:
+        c = text[i]
+        if c == "\n":
+            newline()
+            i += 1
+        elif c in " \t\r\f\v":
+            pending_space = True
+            i += 1
+        elif text.startswith("//", i):
+            j = text.find("\n", i)
+            i = n if j < 0 else j
+        elif text.startswith("/*", i):
+            j = text.find("*/", i + 2)
+            j = n if j < 0 else j + 2
+            if "\n" in text[i:j]:
+                newline()
+            else:
+                pending_space = True
+            i = j
+        elif c in "'\"":
+            j = _js_string(text, i)
+            emit(text[i:j])
+            i = j
+        elif c == "`":
+            j = _js_template(text, i)
+            emit(text[i:j])
+            i = j
+        elif c == "/":
+            prev = "".join(out[-3:]).rstrip()
+            word = _JS_WORD.search(prev)
+            if not prev or prev[-1] in _JS_REGEX_AFTER or (word and word.group(0) in _JS_REGEX_KEYWORDS):
+                j = _js_regex(text, i)
+                emit(text[i:j])
+                i = j
+            else:
+                emit(c)
+                i += 1
+        else:
+            j = i + 1
+            while j < n and text[j] not in " \t\r\f\v\n'\"`/":
+                j += 1
+            emit(text[i:j])
+            i = j
+    return "".join(out).strip() + "\n"
+
+
+# =========================
+# Build
+# =========================
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def build(src_dir: Path = STATIC_DIR, out_dir: Path = DIST_DIR) -> dict:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest: Dict[str, dict] = {}
+    keep = {"manifest.json"}
+    for src in sorted(p for p in src_dir.iterdir() if p.is_file() and p.suffix in ASSET_EXTS):
+        raw = src.read_bytes()
+        text = raw.decode("utf-8")
+        data = (minify_css(text) if src.suffix == ".css" else minify_js(text)).encode("utf-8")
+        name = f"{src.stem}.{_digest(data)}{src.suffix}"
+        path = out_dir / name
+        path.write_bytes(data)
+        (out_dir / f"{name}.gz").write_bytes(gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0))
+        keep.update({name, f"{name}.gz"})
+        sizes = {"source": len(raw), "min": len(data), "gz": (out_dir / f"{name}.gz").stat().st_size}
+        if brotli is not None:
+            (out_dir / f"{name}.br").write_bytes(brotli.compress(data, quality=11))
+            keep.add(f"{name}.br")
+            sizes["br"] = (out_dir / f"{name}.br").stat().st_size
+        manifest[src.name] = {"file": f"{out_dir.name}/{name}", "source_hash": _digest(raw), "bytes": sizes}
+
+    for p in out_dir.iterdir():
+        if p.is_file() and p.name not in keep:
+            p.unlink()
+
+    tmp = out_dir / ".manifest.json.tmp"
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, out_dir / "manifest.json")
+    with _lock:
+        _urls.clear()
+    return manifest
+
+
+# =========================
+# static_url()
+# =========================
+def _resolve(path: str) -> str:
+    src = STATIC_DIR / path
+    try:
+        raw = src.read_bytes()
+    except OSError:
+        return f"/static/{path}"
+    try:
+        manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        manifest = {}
+    entry = manifest.get(path)
+    if entry and entry.get("source_hash") == _digest(raw) and (STATIC_DIR / entry["file"]).is_file():
+        return f"/static/{entry['file']}"
+    if entry:
+        log.warning("assets: %s build'den sonra değişmiş; `python -m app.assets build` çalıştırın", path)
+    return f"/static/{path}?v={_digest(raw)}"
+
+
+def static_url(path: str) -> str:
+    """Şablon yardımcısı: process başına bir kez çözülür (build sonrası restart ile yenilenir)."""
+    path = path.lstrip("/")
+    with _lock:
+        url = _urls.get(path)
+    if url is None:
+        url = _resolve(path)
+        with _lock:
+            _urls[path] = url
+    return url
+
+
+# =========================
+# Statik dosya servisi
+# =========================
+def _accepted(headers: Headers) -> List[str]:
+    accept = headers.get("accept-encoding", "")
+    tokens = {t.split(";")[0].strip().lower(): t for t in accept.split(",") if t.strip()}
+    out = []
+    for enc in ("br", "gzip"):
+        t = tokens.get(enc)
+        if t is not None and not re.search(r";\s*q=0(\.0*)?\s*$", t):
+            out.append(enc)
+    return out
+
+
+class AssetStaticFiles(StaticFiles):
+    """StaticFiles + hazır sıkıştırılmış kardeş dosyalar + cache başlıkları."""
+
+    SUFFIX = {"br": ".br", "gzip": ".gz"}
+
+    def _encoded(self, full_path: str, headers: Headers) -> Tuple[Optional[str], Optional[os.stat_result], str]:
+        for enc in _accepted(headers):
+            candidate = full_path + self.SUFFIX[enc]
+            try:
+                st = os.stat(candidate)
+            except OSError:
+                continue
+            return candidate, st, enc
+        return None, None, ""
+
+    def file_response(self, full_path, stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        rel = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        cache_control = IMMUTABLE if HASHED_RE.match(rel) else f"public, max-age={STATIC_MAX_AGE}"
+
+        headers = {"Cache-Control": cache_control}
+        path, st = full_path, stat_result
+        encoded, enc_st, enc = self._encoded(str(full_path), request_headers)
+        media_type = None
+        if encoded is not None:
+            path, st = encoded, enc_st
+            media_type = mimetypes.guess_type(str(full_path))[0] or "application/octet-stream"
+            headers.update({"Content-Encoding": enc, "Vary": "Accept-Encoding"})
+        elif os.path.exists(str(full_path) + ".gz"):
+            headers["Vary"] = "Accept-Encoding"
+
+        # ETag kardeş dosyanın stat'ından üretilir: her kodlamanın kendi ETag'i olur
+        response = FileResponse(path, status_code=status_code, stat_result=st, headers=headers, media_type=media_type)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+# =========================
+# CLI
+# =========================
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="CSS/JS küçültme + hash'li, sıkıştırılmış kopyalar")
+    ap.add_argument("command", choices=["build"])
+    ap.parse_args(argv)
+
+    for name, entry in build().items():
+        b = entry["bytes"]
+        extra = f", br {b['br'] / 1024:.1f} KB" if "br" in b else ""
+        print(f"{name:12s} {b['source'] / 1024:6.1f} KB -> min {b['min'] / 1024:.1f} KB, gz {b['gz'] / 1024:.1f} KB{extra}"
+              f"  ({entry['file']})")
+    if brotli is None:
+        print("not: `brotli` paketi kurulu değil, .br kopyaları üretilmedi", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,30 @@
 import os
+import threading
+import time
+from collections import OrderedDict
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
-import hashlib
-import hmac
 
-# MVP: basit şifre hash (bcrypt de yaparız ama hızlı olsun diye)
-# İstersen sonra bcrypt'e geçiririz.
+from sqlalchemy.orm import Session
+
+from app.models import User
+# şifre hash'leme app.passwords'te (scrypt / PBKDF2); eski import yolu için yeniden dışa aktarılır
+from app.passwords import hash_password, verify_password  # noqa: F401
 
 SECRET_KEY = os.getenv("SECRET_KEY", "CHANGE_ME_SECRET_KEY")
 SER = URLSafeTimedSerializer(SECRET_KEY, salt="cashguard-admin")
 
 SESSION_MAX_AGE = 60 * 60 * 12  # 12 saat
 
-
-def hash_password(password: str) -> str:
-    # SHA256 + secret pepper (MVP)
-    pepper = os.getenv("PASSWORD_PEPPER", "CHANGE_ME_PEPPER")
-    return hashlib.sha256((pepper + password).encode("utf-8")).hexdigest()
-
-
-def verify_password(password: str, password_hash: str) -> bool:
-    return hmac.compare_digest(hash_password(password), password_hash)
+# Çözülmüş admin kimliği bu süre boyunca DB'ye gidilmeden kabul edilir. Aynı process'teki
+# logout / şifre değişikliği cache'i anında temizler; diğer worker process'lerde en geç TTL sonra
+# etkili olur (session_version DB'den tekrar okununca eski cookie reddedilir).
+AUTH_CACHE_TTL_S = float(os.getenv("AUTH_CACHE_TTL_S", "60"))
+AUTH_CACHE_MAX_ITEMS = int(os.getenv("AUTH_CACHE_MAX_ITEMS", "1024"))
 
 
-def make_session(email: str) -> str:
-    return SER.dumps({"email": email})
+def make_session(user: User) -> str:
+    # uid + sürüm: kimlik cache'ten doğrulanır, sürüm değişince (logout / şifre) eski cookie geçersiz
+    return SER.dumps({"uid": user.id, "email": user.email, "role": user.role, "v": user.session_version})
 
 
 def read_session(token: str):
@@ -32,3 +33,92 @@ def read_session(token: str):
         return data
     except (BadSignature, SignatureExpired):
         return None
+
+
+# =========================
+# Kimlik cache'i
+# =========================
+class AuthError(PermissionError):
+    pass
+
+
+_lock = threading.Lock()
+# uid -> (son geçerlilik, email, role, session_version)
+_identities: "OrderedDict[int, tuple]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "rejected": 0, "invalidations": 0}
+# require_admin süreleri: kaynak ("cache" / "db" / "rejected") -> [adet, toplam ms]
+_timing: dict = {}
+
+
+def _cached(uid: int, version: int):
+    with _lock:
+        item = _identities.get(uid)
+        if item is None or item[0] < time.monotonic() or item[3] != version:
+            return None
+        _identities.move_to_end(uid)
+        _stats["hits"] += 1
+        return item
+
+
+def _remember(user: User) -> None:
+    with _lock:
+        _identities[user.id] = (time.monotonic() + AUTH_CACHE_TTL_S, user.email, user.role, user.session_version)
+        _identities.move_to_end(user.id)
+        while len(_identities) > AUTH_CACHE_MAX_ITEMS:
+            _identities.popitem(last=False)
+
+
+def invalidate(uid: int) -> None:
+    with _lock:
+        if _identities.pop(uid, None) is not None:
+            _stats["invalidations"] += 1
+
+
+def resolve_admin(token: str | None, db: Session) -> tuple[str, bool]:
+    """
+    Cookie'den admin e-postasını çözer: (email, db_kullanıldı_mı).
+    Cache'te geçerli kayıt varsa DB'ye gidilmez; yoksa kullanıcı id ile okunur ve cache'lenir.
+    """
+    data = read_session(token) if token else None
+    if not data:
+        raise AuthError("Not logged in")
+
+    uid, version = data.get("uid"), data.get("v")
+    if uid is None or version is None:
+        # uid/sürüm taşımayan eski cookie geri alınamaz (revoke_sessions etkilemez): yeniden giriş
+        with _lock:
+            _stats["rejected"] += 1
+        raise AuthError("Session format outdated; please log in again")
+
+    item = _cached(uid, version)
+    if item is not None:
+        return item[1], False
+    user = db.get(User, uid)
+
+    with _lock:
+        _stats["misses"] += 1
+    if user is None or user.role != "admin" or user.session_version != version:
+        with _lock:
+            _stats["rejected"] += 1
+        raise AuthError("Unknown user or revoked session")
+    _remember(user)
+    return user.email, True
+
+
+def revoke_sessions(user: User) -> None:
+    """Kullanıcının tüm oturumlarını geçersiz kılar (logout / şifre değişikliği; commit çağırana ait)."""
+    user.session_version = (user.session_version or 0) + 1
+    invalidate(user.id)
+
+
+def note_timing(source: str, ms: float) -> None:
+    with _lock:
+        t = _timing.setdefault(source, [0, 0.0])
+        t[0] += 1
+        t[1] += ms
+
+
+def auth_cache_stats() -> dict:
+    with _lock:
+        timing = {k: {"count": n, "avg_ms": round(total / n, 4)} for k, (n, total) in _timing.items()}
+        return {**_stats, "items": len(_identities), "ttl_s": AUTH_CACHE_TTL_S, "timing": timing}
@@ -0,0 +1,361 @@
+# app/batch_scoring.py
+"""
+Portföy ölçeğinde (binlerce firma) calculate_risk.
+
+score_batch() kolon bazlı girdi (NumPy dizileri / listeler) ya da kayıt listesi alır ve
+scoring.PROFILES ile aynı ağırlık + eşikleri vektörel uygular. Satır başına skor, seviye ve
+ilk 3 mesaj calculate_risk ile birebir aynıdır (bench/batch_scoring.py bunu doğrular).
+
+Kural tablosu (_RULES) calculate_risk'teki sırayı izler; mesaj sırası = kural sırası.
+Kural/mesaj değişirse iki yer birlikte güncellenmeli.
+
+CLI:
+    python -m app.batch_scoring portfoy.xlsx -o skorlar.csv
+    python -m app.batch_scoring portfoy.csv            # stdout'a CSV
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.scoring import PROFILES
+
+FIELDS = (
+    "sector",
+    "collection_days",
+    "payable_days",
+    "fx_debt_ratio",
+    "fx_revenue_ratio",
+    "cash_buffer_months",
+    "top_customer_share",
+    "top_customer_2m_gap_month",
+    "unplanned_deferral_12m",
+    "delay_issue",
+    "short_debt_ratio",
+    "limit_pressure",
+    "hedging",
+)
+NUMERIC_FIELDS = (
+    "collection_days",
+    "payable_days",
+    "fx_debt_ratio",
+    "fx_revenue_ratio",
+    "cash_buffer_months",
+    "top_customer_share",
+    "top_customer_2m_gap_month",
+    "short_debt_ratio",
+)
+# /result ile aynı fallback'ler: bu kolonlar boşsa akış kırılmasın
+DEFAULTS: Dict[str, Any] = {
+    "sector": "defense",
+    "fx_debt_ratio": 0,
+    "fx_revenue_ratio": 0,
+    "top_customer_share": 0,
+    "top_customer_2m_gap_month": 99,
+    "unplanned_deferral_12m": "",
+    "delay_issue": "",
+    "limit_pressure": "",
+    "hedging": "",
+}
+
+DEFAULT_MESSAGE = "Risk göstergeleri şu an kontrollü görünüyor."
+
+# (kural, [(koşul adı, puan, ağırlık anahtarı, mesaj | None), ...]) — if/elif sırasıyla
+_RULES: List[Tuple[str, List[Tuple[str, int, str, Union[str, None]]]]] = [
+    ("gap", [
+        ("gap_gt_90", 25, "gap", "Vade makası çok yüksek (tahsilat-ödeme farkı 90+ gün)."),
+        ("gap_gt_45", 12, "gap", "Vade makası yüksek (45+ gün)."),
+    ]),
+    ("fx", [
+        ("fx_gt_30", 25, "fx", "Döviz uyumsuzluğu yüksek (döviz borcu gelirden belirgin fazla)."),
+        ("fx_gt_10", 12, "fx", "Döviz uyumsuzluğu var (borç gelirden fazla)."),
+    ]),
+    ("cash", [
+        ("cash_lt_3", 25, "cash", "Nakit tamponu yetersiz (3 aydan az)."),
+        ("cash_lt_6", 12, "cash", "Nakit tamponu sınırlı (6 aydan az)."),
+    ]),
+    ("conc", [
+        ("conc_ge_70", 18, "conc", "Müşteri yoğunlaşması çok yüksek (en büyük müşteri %70+)."),
+        ("conc_ge_50", 10, "conc", "Müşteri yoğunlaşması yüksek (en büyük müşteri %50+)."),
+    ]),
+    ("top2m", [
+        ("top2m_1_2", 14, "top2m",
+         "En büyük müşteri 2 ay ödeme yapmazsa çok erken nakit açığı oluşuyor (1-2 ay)."),
+        ("top2m_3_4", 8, "top2m",
+         "En büyük müşteri 2 ay ödeme yapmazsa orta vadede nakit açığı oluşuyor (3-4 ay)."),
+        ("top2m_5_6", 4, "top2m", None),
+    ]),
+    ("deferral", [
+        ("deferral_yes", 10, "deferral",
+         "Son 12 ayda plan dışı ödeme ertelemesi yapılmış (likidite stresi sinyali)."),
+    ]),
+    ("delay", [
+        ("delay_yes", 10, "delay", "Son 12 ayda gecikme / vade uzaması yaşanmış."),
+    ]),
+    ("shortdebt", [
+        ("shortdebt_ge_60", 15, "shortdebt", "12 ay içinde vadesi dolacak borç oranı çok yüksek (%60+)."),
+        ("shortdebt_ge_35", 8, "shortdebt", "12 ay içinde vadesi dolacak borç oranı yüksek (%35+)."),
+    ]),
+    ("limit", [
+        ("limit_yes", 12, "limit", "Son 6 ayda limit daralması/teminat baskısı sinyali var."),
+    ]),
+    ("hedge", [
+        ("hedge_none", 8, "hedge_penalty", "Kur riski için hedge mekanizması yok."),
+        ("hedge_strong", -4, "hedge_bonus", None),  # bonus
+    ]),
+]
+
+SECTORS = tuple(PROFILES)
+_SECTOR_INDEX = {s: i for i, s in enumerate(SECTORS)}
+
+# Mesaj üreten tier'lar, çıktı sırasıyla
+MESSAGES: Tuple[str, ...] = tuple(msg for _r, tiers in _RULES for (_c, _p, _k, msg) in tiers if msg)
+
+
+def _penalty_table(points: int, key: str) -> np.ndarray:
+    # calculate_risk: int(round(points * W[key])); bonus için skor += int(round(4 * W))
+    sign = -1 if points < 0 else 1
+    return np.array([sign * int(round(abs(points) * PROFILES[s][key])) for s in SECTORS], dtype=np.int64)
+
+
+_PENALTIES = {cond: _penalty_table(p, k) for _r, tiers in _RULES for (cond, p, k, _m) in tiers}
+
+
+# =========================
+# Girdi normalizasyonu
+# =========================
+def _as_columns(data: Union[Mapping[str, Any], Sequence[Mapping[str, Any]]]) -> Tuple[Dict[str, Any], int]:
+    if isinstance(data, Mapping):
+        cols = {k: data[k] for k in FIELDS if k in data}
+        lengths = {len(v) for v in cols.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Kolon uzunlukları farklı: {sorted(lengths)}")
+        n = lengths.pop() if lengths else 0
+    else:
+        n = len(data)
+        cols = {k: [r.get(k) for r in data] for k in FIELDS}
+    return cols, n
+
+
+def _is_blank(v: Any) -> bool:
+    return v is None or (isinstance(v, str) and not v.strip()) or (isinstance(v, float) and v != v)
+
+
+def _numeric(cols: Dict[str, Any], name: str, n: int) -> np.ndarray:
+    col = cols.get(name)
+    default = DEFAULTS.get(name)
+    if col is None:
+        if default is None:
+            raise ValueError(f"Eksik kolon: {name}")
+        return np.full(n, float(default))
+
+    try:
+        out = np.asarray(col, dtype=np.float64)  # None -> nan
+    except (TypeError, ValueError):
+        out = None
+    if out is not None and not np.isnan(out).any():
+        return out
+
+    # yavaş yol: boş hücreye default, hatalı hücreye satır numaralı hata
+    out = np.empty(n, dtype=np.float64)
+    for i, v in enumerate(col):
+        if _is_blank(v):
+            if default is None:
+                raise ValueError(f"{i + 1}. satır: '{name}' boş")
+            v = default
+        try:
+            out[i] = float(v)
+        except (TypeError, ValueError):
+            raise ValueError(f"{i + 1}. satır: '{name}' sayı değil ({v!r})") from None
+    return out
+
+
+def _factorize(cols: Dict[str, Any], name: str, n: int) -> Tuple[List[Any], np.ndarray]:
+    """Kategorik kolon -> (benzersiz değerler, satır kodları). Koşullar benzersiz değerlerde bir kez hesaplanır."""
+    col = cols.get(name)
+    if col is None:
+        return [DEFAULTS.get(name, "")], np.zeros(n, dtype=np.int64)
+    if isinstance(col, np.ndarray) and col.dtype.kind == "U":
+        uniq, codes = np.unique(col, return_inverse=True)
+        return uniq.tolist(), codes.reshape(-1)
+    index: Dict[Any, int] = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in col), dtype=np.int64, count=n)
+    return list(index), codes
+
+
+def _lookup(values: List[Any], codes: np.ndarray, fn, dtype=bool) -> np.ndarray:
+    return np.array([fn(v) for v in values], dtype=dtype)[codes] if values else np.zeros(0, dtype=dtype)
+
+
+def _sector_idx(cols: Dict[str, Any], n: int) -> np.ndarray:
+    values, codes = _factorize(cols, "sector", n)
+
+    def idx(s):
+        s = (s or "defense").strip().lower() if isinstance(s, str) else "defense"
+        return _SECTOR_INDEX.get(s, _SECTOR_INDEX["defense"])
+
+    return _lookup(values, codes, idx, dtype=np.int64)
+
+
+def _text_flags(cols: Dict[str, Any], n: int) -> Dict[str, np.ndarray]:
+    # calculate_risk karşılaştırmaları birebir (strip yok; sadece deferral büyük/küçük harf duyarsız)
+    checks = {
+        "deferral_yes": ("unplanned_deferral_12m", lambda v: str(v or "").upper() == "YES"),
+        "delay_yes": ("delay_issue", lambda v: v == "yes"),
+        "limit_yes": ("limit_pressure", lambda v: v == "yes"),
+        "hedge_none": ("hedging", lambda v: v == "none"),
+        "hedge_strong": ("hedging", lambda v: v == "strong"),
+    }
+    factorized: Dict[str, Tuple[List[Any], np.ndarray]] = {}
+    out = {}
+    for cond, (name, fn) in checks.items():
+        if name not in factorized:
+            factorized[name] = _factorize(cols, name, n)
+        out[cond] = _lookup(*factorized[name], fn)
+    return out
+
+
+# =========================
+# Skorlama
+# =========================
+def _conditions(c: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    gap = c["collection_days"] - c["payable_days"]
+    fx = c["fx_debt_ratio"] - c["fx_revenue_ratio"]
+    cash = c["cash_buffer_months"]
+    conc = c["top_customer_share"]
+    top2m = c["top_customer_2m_gap_month"]
+    short = c["short_debt_ratio"]
+    return {
+        "gap_gt_90": gap > 90,
+        "gap_gt_45": gap > 45,
+        "fx_gt_30": fx > 30,
+        "fx_gt_10": fx > 10,
+        "cash_lt_3": cash < 3,
+        "cash_lt_6": cash < 6,
+        "conc_ge_70": conc >= 70,
+        "conc_ge_50": conc >= 50,
+        "top2m_1_2": np.isin(top2m, (1, 2)),
+        "top2m_3_4": np.isin(top2m, (3, 4)),
+        "top2m_5_6": np.isin(top2m, (5, 6)),
+        "shortdebt_ge_60": short >= 60,
+        "shortdebt_ge_35": short >= 35,
+    }
+
+
+def score_batch(data: Union[Mapping[str, Any], Sequence[Mapping[str, Any]]]) -> Dict[str, Any]:
+    """
+    data: {alan: dizi} ya da [{alan: değer}, ...] (alanlar calculate_risk parametreleri).
+    Dönüş: {"score": int64[n], "level": object[n], "message_idx": int64[n], "message_sets": List[Tuple[str, ...]]}
+    Satır i'nin mesajları message_sets[message_idx[i]]; satır başına liste için iter_results().
+    """
+    cols, n = _as_columns(data)
+    c = {name: _numeric(cols, name, n) for name in NUMERIC_FIELDS}
+    sector = _sector_idx(cols, n)
+    cond = {**_conditions(c), **_text_flags(cols, n)}
+    score = np.full(n, 100, dtype=np.int64)
+    msg_mask = np.zeros((n, len(MESSAGES)), dtype=bool)
+    m = 0
+    for _rule, tiers in _RULES:
+        taken = np.zeros(n, dtype=bool)
+        for name, _p, _k, msg in tiers:
+            hit = cond[name] & ~taken
+            taken |= hit
+            score -= np.where(hit, _PENALTIES[name][sector], 0)
+            if msg:
+                msg_mask[:, m] = hit
+                m += 1
+
+    score = np.clip(score, 0, 100)
+    level = np.where(score >= 75, "GREEN", np.where(score >= 50, "YELLOW", "RED")).astype(object)
+
+    message_idx, message_sets = _top_messages(msg_mask)
+    return {"score": score, "level": level, "message_idx": message_idx, "message_sets": message_sets}
+
+
+def _top_messages(mask: np.ndarray, k: int = 3) -> Tuple[np.ndarray, List[Tuple[str, ...]]]:
+    # ilk k mesaj; aynı kombinasyonlar bir kez çözülür (portföyde kombinasyon sayısı küçük)
+    keep = mask & (np.cumsum(mask, axis=1) <= k)
+    codes = keep.astype(np.int64) @ (np.int64(1) << np.arange(mask.shape[1], dtype=np.int64))
+    uniq, inv = np.unique(codes, return_inverse=True)
+    sets = []
+    for code in uniq.tolist():
+        msgs = tuple(MESSAGES[j] for j in range(len(MESSAGES)) if code >> j & 1)
+        sets.append(msgs or (DEFAULT_MESSAGE,))
+    return inv.reshape(-1), sets
+
+
+def iter_results(result: Dict[str, Any]) -> Iterable[Tuple[int, str, List[str]]]:
+    """calculate_risk ile aynı biçimde (score, level, messages) demetleri."""
+    sets = result["message_sets"]
+    for score, level, i in zip(result["score"].tolist(), result["level"].tolist(), result["message_idx"].tolist()):
+        yield score, level, list(sets[i])
+
+
+# =========================
+# CSV / Excel okuma-yazma
+# =========================
+def read_records(path_or_file: Union[str, Path, io.BytesIO], filename: str | None = None) -> List[Dict[str, Any]]:
+    """İlk satır başlık; kolon adları calculate_risk parametreleri (+ 'company' vb. serbest kolonlar)."""
+    name = (filename or str(path_or_file)).lower()
+    if name.endswith(".xlsx"):
+        from openpyxl import load_workbook
+
+        wb = load_workbook(path_or_file, read_only=True, data_only=True)
+        try:
+            rows = wb.worksheets[0].iter_rows(values_only=True)
+            header = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+            return [
+                dict(zip(header, r))
+                for r in rows
+                if any(v is not None and str(v).strip() for v in r)
+            ]
+        finally:
+            wb.close()
+
+    if name.endswith(".csv"):
+        if isinstance(path_or_file, (str, Path)):
+            text = Path(path_or_file).read_text(encoding="utf-8-sig")
+        else:
+            text = path_or_file.read().decode("utf-8-sig")
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=",;\t")
+        return [
+            {k.strip(): v for k, v in r.items() if k}
+            for r in csv.DictReader(io.StringIO(text), dialect=dialect)
+        ]
+
+    raise ValueError("Desteklenen formatlar: .xlsx, .csv")
+
+
+def write_csv(out, records: Sequence[Mapping[str, Any]], result: Dict[str, Any]) -> None:
+    extra = [k for k in (records[0].keys() if records else ()) if k and k not in FIELDS]
+    w = csv.writer(out)
+    w.writerow([*extra, "score", "level", "message_1", "message_2", "message_3"])
+    for rec, (score, level, msgs) in zip(records, iter_results(result)):
+        w.writerow([*(rec.get(k, "") for k in extra), score, level, *(msgs + ["", "", ""])[:3]])
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Portföy risk skorlaması (calculate_risk, vektörel)")
+    ap.add_argument("input", help=".xlsx veya .csv (ilk satır başlık)")
+    ap.add_argument("-o", "--output", default="-", help="Çıktı CSV (varsayılan: stdout)")
+    args = ap.parse_args(argv)
+
+    records = read_records(args.input)
+    result = score_batch(records)
+
+    if args.output == "-":
+        write_csv(sys.stdout, records, result)
+    else:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            write_csv(f, records, result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
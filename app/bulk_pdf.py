@@ -0,0 +1,298 @@
+# app/bulk_pdf.py
+"""
+Admin analiz PDF'lerini toplu yeniden üretir (şablon / mapping değişikliği sonrası).
+
+- Analysis satırları id üzerinden keyset sayfalama ile BULK_PDF_BATCH'lik partiler halinde okunur;
+  tüm tablo belleğe alınmaz.
+- Render process havuzunda yapılır (JSON parse + PDF + dosya yazımı worker'da); havuzda aynı anda
+  en fazla max_inflight iş bulunur, sonuçlar tutulmaz => bellek analiz sayısından bağımsız.
+  Admin endpoint'inden başlatılan iş paylaşılan havuzda worker sayısı kadar slot kullanır
+  (BULK_PDF_WEB_INFLIGHT); kalan kuyruk analiz işlerine ve PDF indirmelerine açık kalır.
+- Dosyalar atomik yazılır (tmp + os.replace): yarım PDF hiç görünmez.
+- Analysis.pdf_path yalnızca kanonik UPLOAD_DIR'e yazılırken güncellenir; --out-dir ile alınan
+  kopyalar (export, önizleme) uygulamanın sunduğu yolu değiştirmez.
+- İlerleme (done/failed/total, rapor/dk, ETA) progress() ile okunur.
+
+CLI:
+    python -m app.bulk_pdf                  # tüm analizler
+    python -m app.bulk_pdf --company 12 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+
+from app.config import SECTOR_LABELS, UPLOAD_DIR
+from app.db import SessionLocal
+from app.models import Analysis, Company
+from app.workers import ParsePool, PoolBusy
+
+BULK_PDF_BATCH = int(os.getenv("BULK_PDF_BATCH", "200"))
+# admin endpoint'inden başlatılan iş paylaşılan parse havuzunu kullanır; kuyruğu doldurmasın diye
+# aynı anda en fazla bu kadar PDF (0 => havuzdaki worker sayısı)
+BULK_PDF_WEB_INFLIGHT = int(os.getenv("BULK_PDF_WEB_INFLIGHT", "0"))
+
+Row = Tuple[int, str, str, str]  # (analysis_id, company_name, sector, result_json)
+
+_lock = threading.Lock()
+_state: Dict[str, object] = {"status": "idle"}
+_thread: Optional[threading.Thread] = None
+
+
+# =========================
+# Worker tarafı
+# =========================
+def write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def analysis_pdf_path(analysis_id: int, out_dir: Optional[Path] = None) -> Path:
+    return (out_dir or UPLOAD_DIR) / f"analysis_{analysis_id}.pdf"
+
+
+def render_analysis_pdf(
+    analysis_id: int, company_name: str, sector: str, result_json: str, out_dir: Optional[str] = None
+) -> Tuple[int, str, int]:
+    # worker process'te çalışır
+    from app.admin_pdf import build_admin_analysis_pdf
+
+    data = json.loads(result_json)
+    sector_label = SECTOR_LABELS.get(sector, sector)
+    pdf_bytes = build_admin_analysis_pdf(company_name, sector_label, data.get("bullets", [])[:10])
+    path = analysis_pdf_path(analysis_id, Path(out_dir) if out_dir else None)
+    write_atomic(path, pdf_bytes)
+    return analysis_id, str(path), len(pdf_bytes)
+
+
+# =========================
+# Okuma (keyset)
+# =========================
+def _filters(company_id: Optional[int]) -> list:
+    return [Analysis.company_id == company_id] if company_id is not None else []
+
+
+def count_analyses(company_id: Optional[int] = None) -> int:
+    db = SessionLocal()
+    try:
+        return db.execute(select(func.count(Analysis.id)).where(*_filters(company_id))).scalar_one()
+    finally:
+        db.close()
+
+
+def iter_analysis_rows(company_id: Optional[int] = None, batch_size: int = BULK_PDF_BATCH) -> Iterator[Row]:
+    """id sırasıyla (analysis_id, firma, sektör, result_json); her parti ayrı kısa sorgu."""
+    last_id = 0
+    while True:
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(Analysis.id, Company.name, Company.sector, Analysis.result_json)
+                .join(Company, Company.id == Analysis.company_id)
+                .where(Analysis.id > last_id, *_filters(company_id))
+                .order_by(Analysis.id)
+                .limit(batch_size)
+            ).all()
+        finally:
+            db.close()
+        if not rows:
+            return
+        for r in rows:
+            yield tuple(r)
+        last_id = rows[-1][0]
+
+
+def _update_paths(updates: List[Tuple[int, str]]) -> None:
+    if not updates:
+        return
+    db = SessionLocal()
+    try:
+        for analysis_id, path in updates:
+            db.query(Analysis).filter(Analysis.id == analysis_id, Analysis.pdf_path.is_distinct_from(path)).update(
+                {Analysis.pdf_path: path}, synchronize_session=False
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+# =========================
+# Çalıştırma
+# =========================
+def _progress_snapshot(state: Dict[str, object]) -> Dict[str, object]:
+    snap = dict(state)
+    started = snap.get("started_ts")
+    if isinstance(started, float):
+        end = snap.get("finished_ts") or time.time()
+        elapsed = max(float(end) - started, 1e-9)
+        processed = int(snap.get("done", 0)) + int(snap.get("failed", 0))
+        rate = processed / elapsed * 60.0
+        snap["elapsed_s"] = round(elapsed, 1)
+        snap["reports_per_min"] = round(rate, 1)
+        remaining = int(snap.get("total", 0)) - processed
+        snap["eta_s"] = round(remaining / rate * 60.0, 1) if rate > 0 and remaining > 0 else 0.0
+    snap.pop("started_ts", None)
+    snap.pop("finished_ts", None)
+    return snap
+
+
+def regenerate_all(
+    pool: ParsePool,
+    *,
+    company_id: Optional[int] = None,
+    max_inflight: Optional[int] = None,
+    batch_size: int = BULK_PDF_BATCH,
+    out_dir: Optional[Path] = None,
+    state: Optional[Dict[str, object]] = None,
+    on_progress: Optional[Callable[[Dict[str, object]], None]] = None,
+) -> Dict[str, object]:
+    """Tüm (ya da bir firmanın) analiz PDF'lerini yeniden üretir; son durum sözlüğünü döner."""
+    state = state if state is not None else {}
+    max_inflight = max(1, min(max_inflight or pool.queue_depth, pool.queue_depth))
+    state.update(
+        status="running",
+        total=count_analyses(company_id),
+        done=0,
+        failed=0,
+        bytes=0,
+        errors=[],
+        started_at=datetime.utcnow().isoformat(),
+        started_ts=time.time(),
+        finished_ts=None,
+    )
+    inflight: Set[Future] = set()
+    pending_paths: List[Tuple[int, str]] = []
+    canonical = out_dir is None or Path(out_dir).resolve() == UPLOAD_DIR.resolve()
+
+    def collect(done_futures) -> None:
+        for fut in done_futures:
+            inflight.discard(fut)
+            try:
+                analysis_id, path, size = fut.result()
+            except Exception as e:
+                state["failed"] = int(state["failed"]) + 1
+                errors = state["errors"]
+                if isinstance(errors, list) and len(errors) < 20:
+                    errors.append(f"{getattr(fut, 'analysis_id', '?')}: {e}")
+                continue
+            state["done"] = int(state["done"]) + 1
+            state["bytes"] = int(state["bytes"]) + size
+            if canonical:
+                pending_paths.append((analysis_id, path))
+        if len(pending_paths) >= batch_size:
+            _update_paths(pending_paths)
+            pending_paths.clear()
+        if on_progress:
+            on_progress(_progress_snapshot(state))
+
+    try:
+        for row in iter_analysis_rows(company_id, batch_size):
+            while True:
+                if len(inflight) >= max_inflight:
+                    collect(wait(inflight, return_when=FIRST_COMPLETED)[0])
+                try:
+                    fut = pool.submit(render_analysis_pdf, *row, str(out_dir) if out_dir else None)
+                    break
+                except PoolBusy:
+                    # paylaşılan havuz analiz işleriyle dolu: bizimkilerden biri bitsin ya da kısa bekle
+                    if inflight:
+                        collect(wait(inflight, return_when=FIRST_COMPLETED)[0])
+                    else:
+                        time.sleep(0.2)
+            fut.analysis_id = row[0]  # hata mesajı için
+            inflight.add(fut)
+
+        while inflight:
+            collect(wait(inflight, return_when=FIRST_COMPLETED)[0])
+        _update_paths(pending_paths)
+        state["status"] = "done"
+    except Exception as e:
+        state["status"] = "failed"
+        state["error"] = str(e)
+        raise
+    finally:
+        state["finished_at"] = datetime.utcnow().isoformat()
+        state["finished_ts"] = time.time()
+    return _progress_snapshot(state)
+
+
+def start_background(pool: ParsePool, company_id: Optional[int] = None) -> bool:
+    """Admin endpoint'i için: arka planda başlatır. Zaten çalışan bir iş varsa False."""
+    global _thread, _state
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return False
+        _state = {"status": "queued", "company_id": company_id}
+        max_inflight = BULK_PDF_WEB_INFLIGHT or max(1, pool.workers)
+
+        def run() -> None:
+            try:
+                regenerate_all(pool, company_id=company_id, max_inflight=max_inflight, state=_state)
+            except Exception:
+                pass  # durum _state içinde
+
+        _thread = threading.Thread(target=run, name="bulk-pdf", daemon=True)
+        _thread.start()
+        return True
+
+
+def progress() -> Dict[str, object]:
+    return _progress_snapshot(_state)
+
+
+# =========================
+# CLI
+# =========================
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Admin analiz PDF'lerini toplu yeniden üret")
+    ap.add_argument("--company", type=int, default=None, help="Sadece bu firma")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--inflight", type=int, default=None, help="Havuzdaki en fazla iş (varsayılan 2x worker)")
+    ap.add_argument("--batch", type=int, default=BULK_PDF_BATCH)
+    ap.add_argument("--out-dir", type=Path, default=None, help="PDF klasörü (varsayılan UPLOAD_DIR; başka klasörde pdf_path değişmez)")
+    args = ap.parse_args(argv)
+
+    inflight = args.inflight or max(2, args.workers * 2)
+    pool = ParsePool(args.workers, queue_depth=inflight, max_mb=0)
+    pool.warm_up()
+
+    last = [0.0]
+
+    def report(p: Dict[str, object]) -> None:
+        now = time.time()
+        if now - last[0] >= 1.0:
+            last[0] = now
+            print(f"  {p['done']}/{p['total']} (hata {p['failed']})  {p['reports_per_min']} rapor/dk  ETA {p['eta_s']} sn",
+                  file=sys.stderr)
+
+    try:
+        result = regenerate_all(pool, company_id=args.company, max_inflight=inflight,
+                                batch_size=args.batch, out_dir=args.out_dir, on_progress=report)
+    finally:
+        pool.shutdown(wait=True)
+
+    try:
+        import resource
+
+        result["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1)
+    except ImportError:
+        pass
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0 if not result.get("failed") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
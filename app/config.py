@@ -0,0 +1,13 @@
+# app/config.py
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = (BASE_DIR / ".." / "data").resolve()
+UPLOAD_DIR = (DATA_DIR / "uploads").resolve()
+
+SECTOR_LABELS = {
+    "defense": "Savunma Sanayi",
+    "construction": "İnşaat",
+    "electrical": "Elektrik Taahhüt",
+    "energy": "Enerji",
+}
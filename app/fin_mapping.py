@@ -1,37 +1,49 @@
 from __future__ import annotations
 
+import os
 import re
+import time
 import unicodedata
+from collections import Counter
 from difflib import SequenceMatcher
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 
 
 # -------------------------------------------------
 # 1) Normalizasyon
 # -------------------------------------------------
-def normalize_text(s: str) -> str:
-    if s is None:
-        return ""
-    s = str(s).strip().lower()
+# Türkçe karakterleri sadeleştir (lower() sonrası)
+_TR_TABLE = str.maketrans({"ı": "i", "İ": "i", "ş": "s", "ğ": "g", "ç": "c", "ö": "o", "ü": "u"})
+_RE_NON_ALNUM = re.compile(r"[^a-z0-9\s]")
+_RE_SPACES = re.compile(r"\s+")
+_ROMAN = frozenset({"i", "ii", "iii", "iv", "v", "vi", "vii", "viii", "ix", "x"})
+
+NORMALIZE_CACHE_SIZE = int(os.getenv("NORMALIZE_CACHE_SIZE", "16384"))
+
+_norm_stats = {"miss_time": 0.0}
 
-    # Türkçe karakterleri sadeleştir
-    s = s.replace("ı", "i").replace("İ", "i")
-    s = s.replace("ş", "s").replace("ğ", "g").replace("ç", "c").replace("ö", "o").replace("ü", "u")
 
-    # Unicode normalize + combine işaretlerini sil
-    s = unicodedata.normalize("NFKD", s)
-    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+def _normalize_uncached(s: str) -> str:
+    s = s.strip().lower()
+
+    # Saf ASCII ise Türkçe harf / NFKD adımları zaten no-op
+    if not s.isascii():
+        s = s.translate(_TR_TABLE)
+
+        # Unicode normalize + combine işaretlerini sil
+        s = unicodedata.normalize("NFKD", s)
+        s = "".join(ch for ch in s if not unicodedata.combining(ch))
 
     # alfanumerik dışında temizle
-    s = re.sub(r"[^a-z0-9\s]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _RE_NON_ALNUM.sub(" ", s)
+    s = _RE_SPACES.sub(" ", s).strip()
 
     # baştaki "I / II / A / B / 1" gibi prefixleri kırp
-    roman = {"i", "ii", "iii", "iv", "v", "vi", "vii", "viii", "ix", "x"}
     tokens = s.split()
     while tokens:
         t = tokens[0]
-        if t in roman:
+        if t in _ROMAN:
             tokens.pop(0)
             continue
         if t.isdigit():
@@ -44,6 +56,46 @@ def normalize_text(s: str) -> str:
     return " ".join(tokens).strip()
 
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_cached(s: str) -> str:
+    t0 = time.perf_counter()
+    out = _normalize_uncached(s)
+    _norm_stats["miss_time"] += time.perf_counter() - t0
+    return out
+
+
+def normalize_text(s: str) -> str:
+    if s is None:
+        return ""
+    if not isinstance(s, str):
+        # sayısal hücreler (tutar/yıl) tekrar etmez; cache'i kirletmesin
+        return _normalize_uncached(str(s))
+    return _normalize_cached(s)
+
+
+def normalize_cache_counters() -> Dict[str, float]:
+    """Toplanabilir ham sayaçlar (worker'lardan parent'a görev başı fark olarak taşınır)."""
+    info = _normalize_cached.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "miss_time": _norm_stats["miss_time"]}
+
+
+def normalize_cache_stats(counters: Optional[Dict[str, float]] = None, maxsize: Optional[int] = None) -> Dict[str, float]:
+    """normalize_text LRU sayaçları (admin mapping-debug sayfası için); counters yoksa bu process'inki."""
+    c = counters if counters is not None else normalize_cache_counters()
+    hits, misses, miss_time = c.get("hits", 0), c.get("misses", 0), c.get("miss_time", 0.0)
+    lookups = hits + misses
+    avg_miss = (miss_time / misses) if misses else 0.0
+    return {
+        "hits": hits,
+        "misses": misses,
+        "size": c.get("size", 0),
+        "maxsize": maxsize if maxsize is not None else NORMALIZE_CACHE_SIZE,
+        "hit_rate": (hits / lookups) if lookups else 0.0,
+        "miss_time_ms": miss_time * 1000.0,
+        "time_saved_ms": hits * avg_miss * 1000.0,
+    }
+
+
 def best_fuzzy_match(
     needle: str,
     haystack: List[str],
@@ -284,36 +336,103 @@ _GENERIC_CONTAINS_BLACKLIST = {
 _sorted_terms_for_contains = sorted(_term_to_key.keys(), key=len, reverse=True)
 
 
-def _contains_word_sequence(hay: str, needle: str) -> bool:
+# -------------------------------------------------
+# 5) Önceden derlenmiş eşleştirme motoru
+# -------------------------------------------------
+_TERM_END = ""  # normalize edilmiş metinde boş token olmaz -> trie terminal işareti olarak güvenli
+
+
+class _SynonymIndex:
     """
-    needle bir kelime dizisi ise, hay içinde kelime sınırlarında geçsin.
-    (Basit ama çok işe yarar: yanlış contains eşleşmelerini azaltır.)
+    map_item_to_key için derlenmiş indeks (modül yüklenirken bir kez kurulur).
+
+    - contains: terimlerin kelime dizilerinden token trie. Kalemin her token'ından yürünür,
+      kelime sınırında biten en öncelikli terim (uzun terim önce) seçilir; terim başına
+      regex derleyip taramaya gerek kalmaz.
+    - fuzzy: SequenceMatcher sadece uzunluk penceresi + karakter (1-gram) çoklu-küme üst
+      sınırından geçen birkaç aday için çalışır. İki sınır da ratio'nun gerçek üst sınırı
+      olduğundan eşik üstü bir aday asla elenmez; sonuç lineer taramayla birebir aynıdır.
     """
-    if not needle or needle in _GENERIC_CONTAINS_BLACKLIST:
-        return False
-    # kelime sınırı: " oz kaynaklar " gibi
-    pattern = r"(?:^|\s)" + re.escape(needle) + r"(?:$|\s)"
-    return re.search(pattern, hay) is not None
-
 
-def map_item_to_key(item_name: str) -> Optional[str]:
-    n = normalize_text(item_name)
-    if not n:
+    def __init__(self, term_to_key: Dict[str, str], contains_terms: List[str], fuzzy_terms: List[str]):
+        self.term_to_key = term_to_key
+
+        self._trie: Dict[str, dict] = {}
+        for rank, term in enumerate(contains_terms):
+            if len(term) < 8 or term in _GENERIC_CONTAINS_BLACKLIST:
+                continue
+            node = self._trie
+            for tok in term.split(" "):
+                node = node.setdefault(tok, {})
+            node.setdefault(_TERM_END, (rank, term))
+
+        # fuzzy: ilk geçiş sırası korunur (eşit skorda ilk terim kazanır)
+        self._fuzzy: List[Tuple[str, int, Counter]] = []
+        self._by_len: Dict[int, List[int]] = {}
+        seen = set()
+        for t in fuzzy_terms:
+            if t in seen:
+                continue
+            seen.add(t)
+            self._by_len.setdefault(len(t), []).append(len(self._fuzzy))
+            self._fuzzy.append((t, len(t), Counter(t)))
+
+    def contains(self, n: str) -> Optional[str]:
+        toks = n.split(" ")
+        best: Optional[Tuple[int, str]] = None
+        for i in range(len(toks)):
+            node = self._trie
+            for tok in toks[i:]:
+                node = node.get(tok)
+                if node is None:
+                    break
+                hit = node.get(_TERM_END)
+                if hit is not None and (best is None or hit[0] < best[0]):
+                    best = hit
+        return best[1] if best else None
+
+    def fuzzy(self, n: str, threshold: float) -> Optional[Tuple[str, float]]:
+        la = len(n)
+        bound = threshold - 1e-9
+        need = Counter(n)
+
+        cand: List[int] = []
+        for lb, idxs in self._by_len.items():
+            if 2.0 * min(la, lb) / (la + lb) < bound:
+                continue
+            for i in idxs:
+                _t, _lb, cnt = self._fuzzy[i]
+                overlap = sum(min(c, cnt[ch]) for ch, c in need.items())
+                if 2.0 * overlap / (la + lb) >= bound:
+                    cand.append(i)
+
+        best = None
+        for i in sorted(cand):
+            t = self._fuzzy[i][0]
+            ratio = SequenceMatcher(None, n, t).ratio()
+            if best is None or ratio > best[1]:
+                best = (t, ratio)
+        if best and best[1] >= threshold:
+            return best
         return None
 
+
+_index = _SynonymIndex(_term_to_key, _sorted_terms_for_contains, _all_norm_terms)
+
+
+@lru_cache(maxsize=8192)
+def _map_normalized(n: str) -> Optional[str]:
     # 1) exact match
     if n in _term_to_key:
         return _term_to_key[n]
 
     # 2) güvenli contains match (uzun terim öncelikli + kelime sınırı)
-    for term in _sorted_terms_for_contains:
-        if len(term) < 8:
-            continue
-        if _contains_word_sequence(n, term):
-            return _term_to_key[term]
+    term = _index.contains(n)
+    if term:
+        return _term_to_key[term]
 
     # 3) fuzzy match
-    m = best_fuzzy_match(n, _all_norm_terms, threshold=0.86)
+    m = _index.fuzzy(n, threshold=0.86)
     if m:
         matched_term, _score = m
         return _term_to_key.get(matched_term)
@@ -321,5 +440,12 @@ def map_item_to_key(item_name: str) -> Optional[str]:
     return None
 
 
+def map_item_to_key(item_name: str) -> Optional[str]:
+    n = normalize_text(item_name)
+    if not n:
+        return None
+    return _map_normalized(n)
+
+
 def explain_key(key: str) -> str:
     return CANONICAL_KEYS.get(key, key)
@@ -0,0 +1,227 @@
+# app/images.py
+"""
+Statik görseller için boyut/format varyantları + srcset yardımcısı.
+
+Build adımı (deploy öncesi ya da görsel değişince):
+    python -m app.images build
+    python -m app.images build --widths 480,960,1440 --quality 70
+
+- app/static altındaki her PNG/JPEG için IMAGE_WIDTHS genişliklerinde (orijinalden büyük olmayan)
+  AVIF, WebP ve orijinal formatta varyant üretir: static/img/<ad>.<genişlik>.<içerik hash>.<ext>.
+  Dosya adı içeriğe bağlı olduğu için sonsuza kadar cache'lenebilir.
+- Sonuçlar static/img/manifest.json'a yazılır; kaynak ve ayarlar değişmediyse (source_hash)
+  görsel yeniden kodlanmaz.
+- Pillow (reportlab bağımlılığı) gerekir; AVIF desteği yoksa o format atlanır.
+
+Şablonlarda:
+    {{ picture("hero-7.png", "Açıklama", sizes="(max-width: 720px) 100vw, 1100px", eager=True) }}
+Manifest yoksa ya da görsel manifestte değilse düz <img> döner (site build'siz de çalışır).
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+from html import escape
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from markupsafe import Markup
+
+from app.config import BASE_DIR
+
+STATIC_DIR = BASE_DIR / "static"
+IMG_DIR = STATIC_DIR / "img"
+MANIFEST_PATH = IMG_DIR / "manifest.json"
+
+IMAGE_WIDTHS = tuple(int(w) for w in os.getenv("IMAGE_WIDTHS", "480,960,1440").split(",") if w.strip())
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "72"))
+IMAGE_MIN_BYTES = int(os.getenv("IMAGE_MIN_BYTES", "16384"))  # daha küçük kaynaklar (ikonlar) olduğu gibi kalır
+
+# tarayıcının ilk uygun <source>'u seçmesi için en verimliden başlayarak
+FORMATS = ("avif", "webp")
+MIME = {"avif": "image/avif", "webp": "image/webp", "png": "image/png", "jpeg": "image/jpeg"}
+
+_lock = threading.Lock()
+_manifest: Optional[dict] = None
+_manifest_mtime: Optional[float] = None
+
+
+# =========================
+# Build
+# =========================
+def _encode(im, fmt: str, quality: int) -> bytes:
+    buf = io.BytesIO()
+    if fmt == "avif":
+        im.save(buf, "AVIF", quality=max(30, quality - 17), speed=6)
+    elif fmt == "webp":
+        im.save(buf, "WEBP", quality=quality, method=6)
+    elif fmt == "png":
+        im.save(buf, "PNG", optimize=True)
+    else:
+        im.convert("RGB").save(buf, "JPEG", quality=quality + 8, optimize=True, progressive=True)
+    return buf.getvalue()
+
+
+def _sources(src_dir: Path) -> List[Path]:
+    return sorted(
+        p for p in src_dir.iterdir()
+        if p.is_file() and p.suffix.lower() in (".png", ".jpg", ".jpeg") and p.stat().st_size >= IMAGE_MIN_BYTES
+    )
+
+
+def build(
+    src_dir: Path = STATIC_DIR,
+    out_dir: Path = IMG_DIR,
+    widths: tuple = IMAGE_WIDTHS,
+    quality: int = IMAGE_QUALITY,
+) -> dict:
+    try:
+        from PIL import Image, features
+    except ImportError as e:  # pragma: no cover - ortam bağımlı
+        raise RuntimeError("Görsel build'i için Pillow gerekli (pip install Pillow).") from e
+
+    formats = [f for f in FORMATS if features.check(f)]
+    out_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        previous = json.loads((out_dir / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+    manifest: Dict[str, dict] = {}
+    keep = {"manifest.json"}
+
+    for src in _sources(src_dir):
+        raw = src.read_bytes()
+        source_hash = hashlib.sha256(raw + f"{widths}|{quality}|{formats}".encode()).hexdigest()[:16]
+        old = previous.get(src.name)
+        if old and old.get("source_hash") == source_hash and all(
+            (out_dir.parent / i["file"]).is_file() for items in old["variants"].values() for i in items
+        ):
+            # kaynak + ayarlar aynı: yeniden kodlama yok
+            manifest[src.name] = old
+            keep.update(Path(i["file"]).name for items in old["variants"].values() for i in items)
+            continue
+
+        with Image.open(io.BytesIO(raw)) as im:
+            im.load()
+            width, height = im.size
+            src_fmt = "png" if src.suffix.lower() == ".png" else "jpeg"
+            fallback = "png" if im.mode in ("RGBA", "LA", "P") else "jpeg"
+            if im.mode not in ("RGB", "RGBA"):
+                im = im.convert("RGBA" if fallback == "png" else "RGB")
+
+            steps = sorted({w for w in widths if w < width} | {width})
+            entry = {"width": width, "height": height, "fallback": fallback, "source_hash": source_hash, "variants": {}}
+            for fmt in (*formats, fallback):
+                ext = "jpg" if fmt == "jpeg" else fmt
+                items = []
+                for w in steps:
+                    resized = im if w == width else im.resize((w, round(height * w / width)), Image.LANCZOS)
+                    data = _encode(resized, fmt, quality)
+                    if w == width and fmt == src_fmt and len(raw) < len(data):
+                        data = raw  # orijinal zaten daha küçük
+                    name = f"{src.stem}.{w}.{hashlib.sha256(data).hexdigest()[:10]}.{ext}"
+                    (out_dir / name).write_bytes(data)
+                    keep.add(name)
+                    items.append({"w": w, "file": f"{out_dir.name}/{name}", "bytes": len(data)})
+                entry["variants"][fmt] = items
+            manifest[src.name] = entry
+
+    # eski build'lerden kalan varyantları temizle
+    for p in out_dir.iterdir():
+        if p.is_file() and p.name not in keep:
+            p.unlink()
+
+    tmp = out_dir / ".manifest.json.tmp"
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, out_dir / "manifest.json")
+    return manifest
+
+
+# =========================
+# Manifest + şablon yardımcısı
+# =========================
+def load_manifest(path: Path = MANIFEST_PATH) -> dict:
+    """Manifest mtime değişince yeniden okunur (build sonrası restart gerekmez)."""
+    global _manifest, _manifest_mtime
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return {}
+    with _lock:
+        if _manifest is None or mtime != _manifest_mtime:
+            _manifest = json.loads(path.read_text(encoding="utf-8"))
+            _manifest_mtime = mtime
+        return _manifest
+
+
+def _srcset(items: List[dict]) -> str:
+    return ", ".join(f"/static/{i['file']} {i['w']}w" for i in items)
+
+
+def picture(
+    name: str,
+    alt: str,
+    sizes: str = "100vw",
+    *,
+    eager: bool = False,
+    deferred: bool = False,
+    css_class: str = "",
+) -> Markup:
+    """
+    <picture>: AVIF/WebP <source>'ları + orijinal formatta <img srcset>. eager=False ise
+    loading="lazy"; sayfanın ilk görünen (LCP) görseli için eager=True + fetchpriority=high.
+    deferred=True: src/srcset data-* olarak yazılır, JS (slider.js) görünür olunca yükler.
+    """
+    entry = load_manifest().get(name)
+    cls = f' class="{escape(css_class)}"' if css_class else ""
+    loading = 'loading="eager" fetchpriority="high"' if eager else 'loading="lazy"'
+    pre = "data-" if deferred else ""
+    if entry is None:
+        return Markup(f'<img {pre}src="/static/{escape(name)}" alt="{escape(alt)}"{cls} {loading} decoding="async">')
+
+    sizes_attr = escape(sizes)
+    parts = ["<picture>"]
+    for fmt in FORMATS:
+        items = entry["variants"].get(fmt)
+        if items:
+            parts.append(f'<source type="{MIME[fmt]}" {pre}srcset="{_srcset(items)}" sizes="{sizes_attr}">')
+    fb = entry["variants"][entry["fallback"]]
+    parts.append(
+        f'<img {pre}src="/static/{fb[-1]["file"]}" {pre}srcset="{_srcset(fb)}" sizes="{sizes_attr}" '
+        f'width="{entry["width"]}" height="{entry["height"]}" alt="{escape(alt)}"{cls} {loading} decoding="async">'
+    )
+    parts.append("</picture>")
+    return Markup("".join(parts))
+
+
+# =========================
+# CLI
+# =========================
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Statik görsel varyantları (AVIF/WebP + genişlikler)")
+    ap.add_argument("command", choices=["build"])
+    ap.add_argument("--widths", default=",".join(map(str, IMAGE_WIDTHS)))
+    ap.add_argument("--quality", type=int, default=IMAGE_QUALITY)
+    args = ap.parse_args(argv)
+
+    widths = tuple(int(w) for w in args.widths.split(",") if w.strip())
+    try:
+        manifest = build(widths=widths, quality=args.quality)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    for name, entry in manifest.items():
+        src = (STATIC_DIR / name).stat().st_size
+        best = {fmt: items[0]["bytes"] for fmt, items in entry["variants"].items()}
+        print(f"{name:14s} {src / 1024:8.0f} KB -> en küçük: " + ", ".join(f"{f} {b / 1024:.0f} KB" for f, b in best.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+# app/jobs.py
+"""
+Admin analiz işleri (parse -> analyze -> PDF) için arka plan kuyruğu.
+
+submit_analysis_job() AnalysisJob satırını yazar ve hemen döner. Runner thread'leri işin
+yaşam döngüsünü (durum, retry, timeout) yönetir; CPU işi app.workers process havuzunda
+çalışır. Durum tabloda tutulur, /admin/jobs/{id}/status ile sorgulanır.
+Havuz doluyken (PoolBusy) iş başlamamış sayılır: deneme hakkı yemez, JOB_BUSY_WAIT_S sonra
+yeniden denenir.
+
+Birden fazla process (uvicorn worker'ları, rolling restart) aynı tabloyu paylaşır:
+- Runner işi çalıştırmadan önce atomik UPDATE ile sahiplenir (owner + lease_until); rowcount 1
+  değilse iş başka process'tedir ve atlanır.
+- Heartbeat thread'i bu process'in aktif işlerinin lease'ini uzatır ve sahibi olmayan / lease'i
+  dolmuş (sahibi ölmüş) işleri yeniden kuyruğa alır.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import List, Optional, Set, Tuple
+from zipfile import BadZipFile
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from app import portfolio, timeseries
+from app.analysis_store import metrics_dict, save_analysis
+from app.bulk_pdf import analysis_pdf_path, write_atomic
+from app.config import SECTOR_LABELS
+from app.db import SessionLocal
+from app.models import Analysis, AnalysisJob, Company, Upload
+from app.workers import PoolBusy, TaskTimeout, pool as parse_pool
+
+JOB_WORKERS = int(os.getenv("ANALYSIS_JOB_WORKERS", "2"))
+JOB_TIMEOUT_S = float(os.getenv("ANALYSIS_JOB_TIMEOUT_S", "300"))
+JOB_MAX_ATTEMPTS = int(os.getenv("ANALYSIS_JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BACKOFF_S = float(os.getenv("ANALYSIS_JOB_RETRY_BACKOFF_S", "2"))
+# havuz doluyken (PoolBusy) tekrar deneme aralığı; bu beklemeler deneme sayılmaz
+JOB_BUSY_WAIT_S = float(os.getenv("ANALYSIS_JOB_BUSY_WAIT_S", "2"))
+JOB_LEASE_S = float(os.getenv("ANALYSIS_JOB_LEASE_S", "120"))
+
+# bu process'in kimliği (lease sahibi)
+OWNER_ID = f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+log = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+_lock = threading.Lock()
+_runner: Optional[ThreadPoolExecutor] = None
+_pending: Set[int] = set()  # bu process'te kuyrukta olup henüz başlamamış işler
+_heartbeat: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def _get_runner() -> ThreadPoolExecutor:
+    # runner: iş yaşam döngüsü (DB durum, retry); CPU işi (süre sınırıyla) parse_pool'da
+    global _runner
+    with _lock:
+        if _runner is None:
+            _runner = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="analysis-job")
+        return _runner
+
+
+def shutdown(wait: bool = False) -> None:
+    global _runner, _heartbeat
+    _stop.set()
+    with _lock:
+        if _runner is not None:
+            _runner.shutdown(wait=wait, cancel_futures=True)
+        _runner = None
+        _heartbeat = None
+        _pending.clear()
+
+
+def compute_analysis(xlsx_path: str, sector: str, company_name: str) -> Tuple[dict, bytes]:
+    # worker process'te çalışır: argümanlar ve dönüş değeri picklable olmalı
+    from app.admin_pdf import build_admin_analysis_pdf
+    from app.analysis_engine import analyze_financials
+    from app.parse_cache import parse_financials_cached
+
+    fin = parse_financials_cached(xlsx_path)
+    result = analyze_financials(fin, sector=sector)
+    sector_label = SECTOR_LABELS.get(sector, sector)
+    pdf_bytes = build_admin_analysis_pdf(company_name, sector_label, result.get("bullets", [])[:10])
+    return result, pdf_bytes
+
+
+def submit_analysis_job(db: Session, company_id: int, upload_id: int) -> AnalysisJob:
+    job = AnalysisJob(company_id=company_id, upload_id=upload_id, status="queued")
+    db.add(job)
+    db.commit()
+    _enqueue(job.id)
+    return job
+
+
+def _enqueue(job_id: int) -> None:
+    with _lock:
+        if job_id in _pending:
+            return
+        _pending.add(job_id)
+    _start_heartbeat()
+    _get_runner().submit(_run_job, job_id)
+
+
+# =========================
+# Sahiplik (lease)
+# =========================
+def _claimable(now: datetime):
+    return (
+        AnalysisJob.status.in_(ACTIVE_STATUSES),
+        or_(AnalysisJob.owner.is_(None), AnalysisJob.lease_until.is_(None), AnalysisJob.lease_until < now),
+    )
+
+
+def _claim(db: Session, job_id: int) -> bool:
+    """Sahibi olmayan ya da lease'i dolmuş işi atomik olarak bu process'e alır."""
+    now = datetime.utcnow()
+    res = db.execute(
+        update(AnalysisJob)
+        .where(AnalysisJob.id == job_id, *_claimable(now))
+        .values(owner=OWNER_ID, lease_until=now + timedelta(seconds=JOB_LEASE_S))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return res.rowcount == 1
+
+
+def _renew_leases(db: Session) -> None:
+    db.execute(
+        update(AnalysisJob)
+        .where(AnalysisJob.owner == OWNER_ID, AnalysisJob.status.in_(ACTIVE_STATUSES))
+        .values(lease_until=datetime.utcnow() + timedelta(seconds=JOB_LEASE_S))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def _orphaned(db: Session) -> List[int]:
+    return list(db.execute(select(AnalysisJob.id).where(*_claimable(datetime.utcnow())).order_by(AnalysisJob.id)).scalars())
+
+
+def recover_jobs() -> int:
+    """Sahibi olmayan ya da sahibi ölmüş (lease'i dolmuş) aktif işleri kuyruğa alır."""
+    db = SessionLocal()
+    try:
+        ids = _orphaned(db)
+    finally:
+        db.close()
+    for job_id in ids:
+        _enqueue(job_id)
+    return len(ids)
+
+
+def _heartbeat_loop() -> None:
+    while not _stop.wait(JOB_LEASE_S / 4):
+        db = SessionLocal()
+        try:
+            _renew_leases(db)
+            ids = _orphaned(db)
+        except Exception:
+            db.rollback()
+            log.exception("jobs heartbeat başarısız")
+            continue
+        finally:
+            db.close()
+        if _stop.is_set():
+            break
+        for job_id in ids:
+            _enqueue(job_id)
+
+
+def _start_heartbeat() -> None:
+    global _heartbeat
+    with _lock:
+        if _heartbeat is not None:
+            return
+        _stop.clear()
+        _heartbeat = threading.Thread(target=_heartbeat_loop, name="analysis-job-heartbeat", daemon=True)
+        _heartbeat.start()
+
+
+def _save_result(db: Session, job: AnalysisJob, company: Company, result: dict, pdf_bytes: bytes) -> Analysis:
+    # iş "done" durumu analiz satırlarıyla aynı commit'te (save_analysis commit eder): sonrasındaki
+    # bir hata yeniden denemede ikinci bir Analysis üretmez
+    job.status = "done"
+    job.error = None
+    job.finished_at = datetime.utcnow()
+    analysis = save_analysis(db, company.id, result)
+    job.analysis_id = analysis.id
+
+    pdf_path = analysis_pdf_path(analysis.id)
+    try:
+        write_atomic(pdf_path, pdf_bytes)
+        analysis.pdf_path = str(pdf_path)
+    except OSError:
+        # PDF indirilirken pdf_files.ensure_pdf yeniden üretir
+        log.exception("analysis %s PDF'i yazılamadı", analysis.id)
+    db.commit()
+
+    upload = db.query(Upload).filter(Upload.id == job.upload_id).first()
+    if upload is not None:
+        period = upload.period or timeseries.month_start(upload.uploaded_at)
+    else:
+        period = timeseries.month_start(analysis.created_at)
+    metrics = metrics_dict(analysis.metrics)
+    # özetler `python -m app.timeseries rebuild` / `python -m app.portfolio rebuild` ile yeniden
+    # kurulabilir; biri hata verirse analiz sonucu kaybolmasın
+    try:
+        timeseries.record(db, company.id, analysis.id, period, metrics)
+    except Exception:
+        db.rollback()
+        log.exception("timeseries.record başarısız (analysis %s)", analysis.id)
+    try:
+        portfolio.apply_analysis(db, company, analysis.id, period, analysis.created_at, metrics)
+    except Exception:
+        db.rollback()
+        log.exception("portfolio.apply_analysis başarısız (analysis %s)", analysis.id)
+    return analysis
+
+
+def _run_job(job_id: int) -> None:
+    from openpyxl.utils.exceptions import InvalidFileException  # openpyxl ilk analiz işinde yüklenir
+
+    with _lock:
+        _pending.discard(job_id)
+
+    db = SessionLocal()
+    try:
+        if not _claim(db, job_id):
+            return  # bitmiş ya da başka bir process'te çalışıyor
+        job = db.get(AnalysisJob, job_id)
+
+        company = db.query(Company).filter(Company.id == job.company_id).first()
+        upload = db.query(Upload).filter(Upload.id == job.upload_id).first()
+        if not company or not upload:
+            job.status = "failed"
+            job.error = "Firma veya upload bulunamadı."
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            return
+
+        while True:
+            job.attempts += 1
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+            db.commit()
+
+            retryable = True
+            try:
+                result, pdf_bytes = parse_pool.run(
+                    compute_analysis, upload.path, company.sector, company.name, timeout=JOB_TIMEOUT_S
+                )
+            except TaskTimeout as e:
+                # iş worker'da durduruldu; aynı dosya yine aşar, tekrar denenmez
+                error = str(e)
+                retryable = False
+            except PoolBusy as e:
+                # iş hiç başlamadı: deneme sayılmaz, havuz boşalınca tekrar sıraya girer
+                job.attempts -= 1
+                job.status = "queued"
+                job.error = str(e)
+                db.commit()
+                if _stop.wait(JOB_BUSY_WAIT_S):
+                    return  # kapanıyor; lease dolunca iş başka process'te devralınır
+                continue
+            except BrokenProcessPool:
+                error = "Worker process beklenmedik şekilde sonlandı (bellek limiti?)."
+            except MemoryError:
+                error = f"Bellek limiti aşıldı ({parse_pool.max_mb} MB)."
+            except (ValueError, BadZipFile, InvalidFileException) as e:
+                # Excel formatı hatası: tekrar denemek sonucu değiştirmez
+                error = str(e)
+                retryable = False
+            except Exception as e:
+                error = str(e) or e.__class__.__name__
+            else:
+                try:
+                    _save_result(db, job, company, result, pdf_bytes)
+                    return
+                except Exception as e:
+                    # analiz kaydı / commit: iş "running"de kalmasın
+                    db.rollback()
+                    log.exception("job %s: sonuç kaydedilemedi", job_id)
+                    if job.status == "done":
+                        return  # analiz kaydedildi; yalnızca sonraki adım başarısız
+                    error = f"Sonuç kaydedilemedi: {e}"
+
+            if not retryable or job.attempts >= JOB_MAX_ATTEMPTS:
+                job.status = "failed"
+                job.error = error
+                job.finished_at = datetime.utcnow()
+                db.commit()
+                return
+
+            job.status = "queued"
+            job.error = error
+            db.commit()
+            time.sleep(JOB_RETRY_BACKOFF_S * (2 ** (job.attempts - 1)))
+    except Exception:
+        # runner future'ının sonucu okunmaz: beklenmeyen hatayı logla, işi failed'e çek
+        log.exception("job %s beklenmedik hata", job_id)
+        db.rollback()
+        _mark_failed(job_id, "Beklenmeyen hata; ayrıntı sunucu logunda.")
+    finally:
+        db.close()
+
+
+def _mark_failed(job_id: int, error: str) -> None:
+    db = SessionLocal()
+    try:
+        job = db.get(AnalysisJob, job_id)
+        if job is not None and job.status in ACTIVE_STATUSES:
+            job.status = "failed"
+            job.error = error
+            job.finished_at = datetime.utcnow()
+            db.commit()
+    except Exception:
+        log.exception("job %s failed olarak işaretlenemedi", job_id)
+    finally:
+        db.close()
+
+
+def job_status(job: AnalysisJob) -> dict:
+    return {
+        "id": job.id,
+        "company_id": job.company_id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "error": job.error,
+        "analysis_id": job.analysis_id,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
@@ -0,0 +1,122 @@
+# app/listing.py
+"""
+Admin listeleri için keyset (cursor) sayfalama.
+
+Upload ve analiz listeleri (zaman, id) çiftine göre yeniden eskiye sıralanır; sonraki sayfa
+OFFSET ile değil, son satırın (zaman, id) değerinden devam eder. Sorgular
+(company_id, [kind,] uploaded_at) / (company_id, created_at) kompozit indekslerini izler,
+sayfa maliyeti listenin ne kadar derinine inildiğinden bağımsızdır.
+
+Cursor biçimi: "<ISO zaman>_<id>" (ör. 2024-05-01T10:00:00.123456_42); opak kabul edilir.
+Firma listesi portfolio.list_companies'te (id keyset, sektör/seviye filtreli).
+"""
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from app.models import Analysis, AnalysisMetrics, Upload
+
+LIST_PAGE_SIZE = int(os.getenv("ADMIN_LIST_PAGE_SIZE", "50"))
+LIST_PAGE_MAX = int(os.getenv("ADMIN_LIST_PAGE_MAX", "500"))
+
+
+# =========================
+# Cursor
+# =========================
+def encode_cursor(ts: datetime, row_id: int) -> str:
+    return f"{ts.isoformat()}_{row_id}"
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """Geçersiz / boş cursor -> None (ilk sayfa)."""
+    cursor = (cursor or "").strip()
+    if not cursor:
+        return None
+    ts, _, row_id = cursor.rpartition("_")
+    try:
+        return datetime.fromisoformat(ts), int(row_id)
+    except ValueError:
+        return None
+
+
+def _clamp(limit: Optional[int]) -> int:
+    return max(1, min(int(limit or LIST_PAGE_SIZE), LIST_PAGE_MAX))
+
+
+def _page(db: Session, q, ts_col, id_col, cursor: str, limit: int) -> dict:
+    limit = _clamp(limit)
+    pos = decode_cursor(cursor)
+    if pos is not None:
+        ts, row_id = pos
+        # ts <= cursor indeks üzerinde aralık sınırı verir; OR tek başına index range'e çevrilmez
+        q = q.where(ts_col <= ts, or_(ts_col < ts, and_(ts_col == ts, id_col < row_id)))
+    rows = db.execute(q.order_by(ts_col.desc(), id_col.desc()).limit(limit + 1)).all()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "rows": rows,
+        "next_cursor": encode_cursor(rows[-1].ts, rows[-1].id) if more else None,
+    }
+
+
+# =========================
+# Listeler
+# =========================
+def list_uploads(
+    db: Session,
+    company_id: int,
+    *,
+    kind: str = "",
+    cursor: str = "",
+    limit: int = LIST_PAGE_SIZE,
+) -> dict:
+    q = select(
+        Upload.id, Upload.kind, Upload.filename, Upload.period, Upload.uploaded_at.label("ts")
+    ).where(Upload.company_id == company_id)
+    if kind:
+        q = q.where(Upload.kind == kind)
+    return _page(db, q, Upload.uploaded_at, Upload.id, cursor, limit)
+
+
+def list_analyses(
+    db: Session,
+    company_id: int,
+    columns=(),
+    *,
+    cursor: str = "",
+    limit: int = LIST_PAGE_SIZE,
+) -> dict:
+    """columns: yanına eklenecek analysis_metrics kolonları (result_json okunmaz)."""
+    q = (
+        select(Analysis.id, Analysis.created_at.label("ts"), *[getattr(AnalysisMetrics, c) for c in columns])
+        .outerjoin(AnalysisMetrics, AnalysisMetrics.analysis_id == Analysis.id)
+        .where(Analysis.company_id == company_id)
+    )
+    return _page(db, q, Analysis.created_at, Analysis.id, cursor, limit)
+
+
+def latest_upload(db: Session, company_id: int, kind: str = "excel") -> Optional[Upload]:
+    """Firmanın en son upload'ı; (company_id, kind, uploaded_at) indeksinden tek satır."""
+    return db.execute(
+        select(Upload)
+        .where(Upload.company_id == company_id, Upload.kind == kind)
+        .order_by(Upload.uploaded_at.desc(), Upload.id.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def as_json(page: dict, fields) -> dict:
+    """API yanıtı: satırlar dict'e, tarih/zamanlar ISO metne çevrilir."""
+    items = []
+    for r in page["rows"]:
+        item = {}
+        for f in fields:
+            v = getattr(r, f)
+            item[f] = v.isoformat() if hasattr(v, "isoformat") else v
+        items.append(item)
+    return {"items": items, "next_cursor": page["next_cursor"]}
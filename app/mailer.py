@@ -0,0 +1,362 @@
+# app/mailer.py
+"""
+Giden e-posta kuyruğu.
+
+enqueue_email() mesajı önce diske (.eml) yazar, sonra bellek içi kuyruğa koyar ve hemen döner.
+Tek bir arka plan thread'i kuyruğu boşaltır:
+- SMTP bağlantısını açık tutar ve MAIL_IDLE_S boyunca iş gelmezse kapatır,
+- kuyrukta bekleyenleri (en fazla MAIL_BATCH_SIZE) aynı oturumda gönderir,
+- hata olursa mesajı üstel backoff ile yeniden dener; MAIL_MAX_ATTEMPTS sonrası
+  dosyayı spool/failed altına taşır.
+Başarılı gönderimde spool dosyası silinir. Restart sonrası start() spool'daki dosyaları
+yeniden kuyruğa alır; böylece gönderilmemiş mesaj kaybolmaz.
+
+Spool birden fazla process tarafından paylaşılabilir (uvicorn worker'ları): mesaj gönderilmeden
+önce atomik rename ile sahiplenilir (<ad>.eml -> <ad>.eml.<sahip>.sending); rename başarısızsa
+mesajı başka bir process almış demektir ve atlanır. Hata olursa dosya .eml adına geri döner.
+Sahibi ölmüş (MAIL_CLAIM_STALE_S'ten eski) .sending dosyaları start()'ta spool'a geri alınır.
+
+SMTP ayarları:
+- SMTP_HOST, SMTP_PORT (587), SMTP_USER, SMTP_PASSWORD, SMTP_FROM
+- SMTP_SECURITY: ssl | starttls | none (boşsa port 465 => ssl, diğerleri => starttls)
+  "none" + kullanıcı adı boş: lokal test sunucusu (aiosmtpd vb.) için.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from email import policy
+from email.message import EmailMessage
+from email.parser import BytesParser
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from app.config import DATA_DIR
+
+if TYPE_CHECKING:  # smtplib/ssl yalnızca gönderimde yüklenir
+    import smtplib
+
+log = logging.getLogger(__name__)
+
+SPOOL_DIR = Path(os.getenv("MAIL_SPOOL_DIR", str(DATA_DIR / "mail_spool")))
+MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", "20"))
+MAIL_IDLE_S = float(os.getenv("MAIL_IDLE_S", "30"))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", "6"))
+MAIL_RETRY_BACKOFF_S = float(os.getenv("MAIL_RETRY_BACKOFF_S", "5"))
+SMTP_TIMEOUT_S = float(os.getenv("SMTP_TIMEOUT_S", "25"))
+MAIL_CLAIM_STALE_S = float(os.getenv("MAIL_CLAIM_STALE_S", "900"))
+
+# bu process'in spool sahiplik etiketi
+_OWNER = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+_queue: "queue.Queue[Optional[Path]]" = queue.Queue()
+_attempts: Dict[str, int] = {}
+_stats = {"enqueued": 0, "sent": 0, "retried": 0, "failed": 0, "skipped": 0, "connections": 0}
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+# =========================
+# SMTP ayarları / bağlantı
+# =========================
+def _smtp_settings() -> dict:
+    host = os.getenv("SMTP_HOST")
+    port = int(os.getenv("SMTP_PORT", "587"))
+    user = os.getenv("SMTP_USER")
+    password = os.getenv("SMTP_PASSWORD")
+    from_email = os.getenv("SMTP_FROM") or user
+    security = (os.getenv("SMTP_SECURITY") or ("ssl" if port == 465 else "starttls")).strip().lower()
+
+    if not host or not from_email or (security != "none" and not (user and password)):
+        raise RuntimeError("SMTP env eksik: SMTP_HOST/SMTP_USER/SMTP_PASSWORD/SMTP_FROM")
+
+    return {
+        "host": host,
+        "port": port,
+        "user": user,
+        "password": password,
+        "from_email": from_email,
+        "security": security,
+    }
+
+
+def _connect(cfg: dict) -> smtplib.SMTP:
+    import smtplib
+    import ssl
+
+    ctx = ssl.create_default_context()
+    if cfg["security"] == "ssl":
+        server: smtplib.SMTP = smtplib.SMTP_SSL(cfg["host"], cfg["port"], context=ctx, timeout=SMTP_TIMEOUT_S)
+    else:
+        server = smtplib.SMTP(cfg["host"], cfg["port"], timeout=SMTP_TIMEOUT_S)
+        server.ehlo()
+        if cfg["security"] == "starttls":
+            server.starttls(context=ctx)
+            server.ehlo()
+    if cfg["user"] and cfg["password"]:
+        server.login(cfg["user"], cfg["password"])
+    _stats["connections"] += 1
+    return server
+
+
+def _close(server: Optional[smtplib.SMTP]) -> None:
+    if server is None:
+        return
+    import smtplib
+
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        try:
+            server.close()
+        except OSError:
+            pass
+
+
+# =========================
+# Spool
+# =========================
+def _spool_write(msg: EmailMessage) -> Path:
+    SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+    name = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}.eml"
+    tmp = SPOOL_DIR / f".{name}.tmp"
+    tmp.write_bytes(msg.as_bytes(policy=policy.SMTP))
+    path = SPOOL_DIR / name
+    os.replace(tmp, path)
+    return path
+
+
+def _spool_read(path: Path) -> EmailMessage:
+    with open(path, "rb") as f:
+        return BytesParser(policy=policy.default).parse(f)
+
+
+def _spool_fail(path: Path) -> None:
+    failed = SPOOL_DIR / "failed"
+    failed.mkdir(parents=True, exist_ok=True)
+    try:
+        os.replace(path, failed / path.name)
+    except OSError:
+        pass
+
+
+def pending() -> List[Path]:
+    if not SPOOL_DIR.exists():
+        return []
+    return sorted(SPOOL_DIR.glob("*.eml"))
+
+
+def _claim(path: Path) -> Optional[Path]:
+    """Atomik rename ile sahiplenir; dosya yoksa (başka process almış / göndermiş) None."""
+    claimed = path.with_name(f"{path.name}.{_OWNER}.sending")
+    try:
+        os.rename(path, claimed)
+    except FileNotFoundError:
+        return None
+    os.utime(claimed)  # bayatlık kontrolü sahiplenme zamanına göre
+    return claimed
+
+
+def _release(claimed: Path, path: Path) -> None:
+    try:
+        os.replace(claimed, path)
+    except OSError:
+        pass
+
+
+def _recover_stale() -> int:
+    if not SPOOL_DIR.exists():
+        return 0
+    cutoff = time.time() - MAIL_CLAIM_STALE_S
+    n = 0
+    for p in SPOOL_DIR.glob("*.eml.*.sending"):
+        try:
+            if p.stat().st_mtime >= cutoff:
+                continue
+            os.rename(p, SPOOL_DIR / (p.name.split(".eml.", 1)[0] + ".eml"))
+            n += 1
+        except OSError:
+            continue  # başka bir process aynı anda geri almış
+    if n:
+        log.warning("mailer: %d yarım kalmış gönderim spool'a geri alındı", n)
+    return n
+
+
+# =========================
+# Public API
+# =========================
+def build_message(
+    *,
+    to_email: str,
+    subject: str,
+    body_text: str,
+    attachment_bytes: bytes | None = None,
+    attachment_filename: str | None = None,
+    from_email: str | None = None,
+) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = from_email or _smtp_settings()["from_email"]
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    msg.set_content(body_text)
+
+    if attachment_bytes and attachment_filename:
+        msg.add_attachment(
+            attachment_bytes,
+            maintype="application",
+            subtype="pdf",
+            filename=attachment_filename,
+        )
+    return msg
+
+
+def enqueue_email(
+    *,
+    to_email: str,
+    subject: str,
+    body_text: str,
+    attachment_bytes: bytes | None = None,
+    attachment_filename: str | None = None,
+) -> Path:
+    """Mesajı spool'a yazar ve gönderim kuyruğuna alır. SMTP ayarı eksikse RuntimeError."""
+    cfg = _smtp_settings()
+    msg = build_message(
+        to_email=to_email,
+        subject=subject,
+        body_text=body_text,
+        attachment_bytes=attachment_bytes,
+        attachment_filename=attachment_filename,
+        from_email=cfg["from_email"],
+    )
+    # önce start(): ilk çağrıdaki spool taraması bu mesajı ikinci kez kuyruğa almasın
+    start()
+    path = _spool_write(msg)
+    _stats["enqueued"] += 1
+    _queue.put(path)
+    return path
+
+
+def start() -> int:
+    """Sender thread'ini başlatır (idempotent); ilk çağrıda spool'daki mesajları kuyruğa alır."""
+    global _thread
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return 0
+        _stop.clear()
+        # önceki çalışmadan kalan (stop sinyali dahil) kuyruğu boşalt; spool zaten hepsini içerir
+        while not _queue.empty():
+            _queue.get_nowait()
+        _recover_stale()
+        replay = pending()
+        for p in replay:
+            _queue.put(p)
+        _thread = threading.Thread(target=_sender_loop, name="mail-sender", daemon=True)
+        _thread.start()
+        return len(replay)
+
+
+def stop(timeout: float = 5.0) -> None:
+    """Sender'ı durdurur; gönderilemeyenler spool'da kalır ve sonraki start()'ta gönderilir."""
+    global _thread
+    with _lock:
+        t, _thread = _thread, None
+    if t is None:
+        return
+    _stop.set()
+    _queue.put(None)
+    t.join(timeout)
+
+
+def mail_stats() -> dict:
+    return {**_stats, "queued": _queue.qsize(), "spooled": len(pending())}
+
+
+# =========================
+# Sender
+# =========================
+def _next_batch(first: Path) -> List[Path]:
+    batch = [first]
+    while len(batch) < MAIL_BATCH_SIZE:
+        try:
+            item = _queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is None:
+            _queue.put(None)  # stop sinyalini döngüye geri bırak
+            break
+        batch.append(item)
+    return batch
+
+
+def _retry_later(path: Path, error: Exception) -> None:
+    key = path.name
+    n = _attempts.get(key, 0) + 1
+    _attempts[key] = n
+    if n >= MAIL_MAX_ATTEMPTS:
+        _attempts.pop(key, None)
+        _stats["failed"] += 1
+        _spool_fail(path)
+        log.error("%s gönderilemedi, failed/ altına taşındı: %s", key, error)
+        return
+    _stats["retried"] += 1
+    delay = MAIL_RETRY_BACKOFF_S * (2 ** (n - 1))
+    timer = threading.Timer(delay, _queue.put, args=(path,))
+    timer.daemon = True
+    timer.start()
+
+
+def _send_one(server: smtplib.SMTP, path: Path) -> None:
+    claimed = _claim(path)
+    if claimed is None:
+        _stats["skipped"] += 1
+        return  # başka bir process göndermiş / gönderiyor
+    try:
+        server.send_message(_spool_read(claimed))
+    except BaseException:
+        _release(claimed, path)  # retry / failed/ akışı .eml adı üzerinden devam eder
+        raise
+    claimed.unlink(missing_ok=True)
+    _attempts.pop(path.name, None)
+    _stats["sent"] += 1
+
+
+def _sender_loop() -> None:
+    server: Optional[smtplib.SMTP] = None
+    while not _stop.is_set():
+        try:
+            item = _queue.get(timeout=MAIL_IDLE_S if server is not None else None)
+        except queue.Empty:
+            _close(server)  # boşta kalan bağlantıyı bırak
+            server = None
+            continue
+        if item is None:
+            break
+
+        import smtplib  # ilk gönderimde yüklenir (ssl ile birlikte)
+
+        for path in _next_batch(item):
+            try:
+                if server is None:
+                    server = _connect(_smtp_settings())
+                try:
+                    _send_one(server, path)
+                except smtplib.SMTPServerDisconnected:
+                    # sunucu boşta bağlantıyı kapatmış olabilir: bir kez yeniden bağlan
+                    _close(server)
+                    server = _connect(_smtp_settings())
+                    _send_one(server, path)
+            except smtplib.SMTPRecipientsRefused as e:
+                # alıcı reddedildi: tekrar denemek sonucu değiştirmez
+                _stats["failed"] += 1
+                _spool_fail(path)
+                log.error("%s alıcı reddedildi: %s", path.name, e)
+            except (smtplib.SMTPException, OSError, RuntimeError) as e:
+                _close(server)
+                server = None
+                _retry_later(path, e)
+    _close(server)
@@ -1,105 +1,95 @@
-from pathlib import Path
-from datetime import datetime
-from io import BytesIO
+from datetime import date, datetime
+from io import BytesIO, StringIO
+from contextlib import asynccontextmanager
+import asyncio
 import os
-import json
 import shutil
+import time
 from typing import Optional
 
 from dotenv import load_dotenv
 load_dotenv()
 
-from email.message import EmailMessage
-import smtplib
-import ssl
-
-from fastapi import FastAPI, Request, Form, UploadFile, File, Depends
-from fastapi.responses import HTMLResponse, StreamingResponse, RedirectResponse
+from fastapi import APIRouter, FastAPI, Request, Form, UploadFile, File, Depends
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.scoring import calculate_risk
-from app.pdf_report import build_pdf_report
 
 # ✅ Admin imports
-from app.db import Base, engine, get_db
-from app.models import User, Company, Upload, Analysis
-from app.auth import hash_password, verify_password, make_session, read_session
-from app.analysis_engine import parse_financials_xlsx, analyze_financials
-from app.admin_pdf import build_admin_analysis_pdf
+from app.db import SessionLocal, get_db
+from app.models import User, Company, Upload, Analysis, AnalysisJob
+from app.auth import (
+    AuthError, auth_cache_stats, make_session, note_timing, read_session, resolve_admin, revoke_sessions,
+)
+from app.config import BASE_DIR, UPLOAD_DIR, SECTOR_LABELS
+from app import (
+    analysis_store, bulk_pdf, images, jobs, listing, mailer, mapping_log, migrations, page_cache, pdf_files,
+    portfolio, report_cache, timeseries, zip_export,
+)
+from app.assets import AssetStaticFiles, static_url
+from app.passwords import PasswordBusy, needs_rehash, pool as password_pool
+from app.workers import PoolBusy, pool as parse_pool
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # veri dizinleri + (AUTO_MIGRATE=1 ise) şema; AUTO_MIGRATE=0 ile deploy adımında
+    # `python -m app.migrations` çalıştırılır
+    await asyncio.to_thread(migrations.migrate if AUTO_MIGRATE else migrations.ensure_dirs)
+    # Parse worker'larını ısıt, önceki process'te yarım kalan analiz işlerini devral
+    await asyncio.to_thread(parse_pool.warm_up)
+    # kullanıcı bulunamayan girişlerde karşılaştırılacak sahte hash (ilk girişte KDF bedeli ödenmesin)
+    await password_pool.dummy_hash()
+    # eski tek-blob analizleri normalize et (dönüşecek satır yoksa tek sorgu)
+    await asyncio.to_thread(analysis_store.migrate_legacy)
+    await asyncio.to_thread(timeseries.backfill_missing)
+    await asyncio.to_thread(portfolio.backfill_if_needed)
+    jobs.recover_jobs()
+    mailer.start()
+    yield
+    mailer.stop()
+    jobs.shutdown(wait=False)
+    parse_pool.shutdown(wait=False)
+    password_pool.shutdown()
+
+
+router = APIRouter()
+
+
+async def server_timing(request: Request, call_next):
+    """Server-Timing: auth (kaynak: cache/db/rejected) + toplam süre."""
+    t0 = time.perf_counter()
+    response = await call_next(request)
+    parts = []
+    auth = getattr(request.state, "auth_timing", None)
+    if auth is not None:
+        parts.append(f'auth;dur={auth[1]:.3f};desc="{auth[0]}"')
+    parts.append(f"total;dur={(time.perf_counter() - t0) * 1000:.3f}")
+    response.headers["Server-Timing"] = ", ".join(parts)
+    return response
 
-app = FastAPI(title="CashGuard TR")
 
-BASE_DIR = Path(__file__).resolve().parent
-app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+templates.env.globals["picture"] = images.picture
+templates.env.globals["static_url"] = static_url
 
-# DB init
-DATA_DIR = (BASE_DIR / ".." / "data").resolve()
-UPLOAD_DIR = (DATA_DIR / "uploads").resolve()
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-os.makedirs(DATA_DIR, exist_ok=True)
-Base.metadata.create_all(bind=engine)
-
-SECTOR_LABELS = {
-    "defense": "Savunma Sanayi",
-    "construction": "İnşaat",
-    "electrical": "Elektrik Taahhüt",
-    "energy": "Enerji",
-}
+# Şema kurulumu startup'ta (lifespan) yapılır; import yan etkisizdir
+AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "1").strip().lower() not in ("0", "false", "no")
 
 LEAD_EMAIL = "rapor@cashguardtr.com"
 
+# Admin ana sayfasında sayfa başına firma
+COMPANY_PAGE_SIZE = int(os.getenv("ADMIN_COMPANY_PAGE_SIZE", "50"))
 
-# =========================
-# SMTP MAIL SENDER (supports 465 SSL + 587 STARTTLS)
-# =========================
-def send_email_smtp(
-    *,
-    to_email: str,
-    subject: str,
-    body_text: str,
-    attachment_bytes: bytes | None = None,
-    attachment_filename: str | None = None,
-):
-    host = os.getenv("SMTP_HOST")
-    port = int(os.getenv("SMTP_PORT", "587"))
-    user = os.getenv("SMTP_USER")
-    password = os.getenv("SMTP_PASSWORD")
-    from_email = os.getenv("SMTP_FROM") or user
-
-    if not host or not user or not password:
-        raise RuntimeError("SMTP env eksik: SMTP_HOST/SMTP_USER/SMTP_PASSWORD/SMTP_FROM")
-
-    msg = EmailMessage()
-    msg["From"] = from_email
-    msg["To"] = to_email
-    msg["Subject"] = subject
-    msg.set_content(body_text)
-
-    if attachment_bytes and attachment_filename:
-        msg.add_attachment(
-            attachment_bytes,
-            maintype="application",
-            subtype="pdf",
-            filename=attachment_filename,
-        )
-
-    ctx = ssl.create_default_context()
-
-    # 465 => SSL, 587 => STARTTLS
-    if port == 465:
-        with smtplib.SMTP_SSL(host, port, context=ctx, timeout=25) as server:
-            server.login(user, password)
-            server.send_message(msg)
-    else:
-        with smtplib.SMTP(host, port, timeout=25) as server:
-            server.ehlo()
-            server.starttls(context=ctx)
-            server.ehlo()
-            server.login(user, password)
-            server.send_message(msg)
+# Analiz geçmişi tablosunda gösterilen metrik kolonları
+ANALYSIS_LIST_COLUMNS = (
+    "year_bs", "year_is", "current_ratio", "quick_ratio", "cash_ratio",
+    "debt_to_equity", "interest_cover", "gross_margin", "net_debt",
+)
 
 
 def _common_ctx(request: Request, title: str):
@@ -129,25 +119,60 @@ def _clamp_pct(v: int) -> int:
         return 0
 
 
+def _risk_report(inputs: dict, company: str):
+    """
+    (score, level, messages, pdf_bytes). Aynı form cevapları için /result/pdf ve
+    /result/email aynı PDF'i kullanır (report_cache, TTL + boyut limitli).
+    """
+    company = (company or "").strip()
+
+    def build():
+        from app.pdf_report import build_pdf_report  # reportlab ilk PDF'te yüklenir
+
+        score, level, messages = calculate_risk(**inputs)
+        payload = {
+            "company": company,
+            "sector": SECTOR_LABELS[inputs["sector"]],
+            "score": score,
+            "level": level,
+            "messages": messages,
+            **{k: v for k, v in inputs.items() if k != "sector"},
+        }
+        return score, level, messages, build_pdf_report(payload)
+
+    return report_cache.get_or_build({**inputs, "company": company}, build)
+
+
 # =========================
 # PUBLIC ROUTES
 # =========================
-@app.get("/", response_class=HTMLResponse)
+def _static_page(request: Request, route: str, template: str, title: str, **extra):
+    """Public sayfa: page_cache'ten (gzip + ETag) döner; yalnızca ilk istekte render edilir."""
+
+    def render() -> str:
+        ctx = _common_ctx(request, title)
+        ctx.update(extra)
+        return templates.get_template(template).render(ctx)
+
+    return page_cache.cached_page(route, request, render, **extra)
+
+
+@router.get("/", response_class=HTMLResponse)
 def landing(request: Request):
-    ctx = _common_ctx(request, "CashGuard TR | cashguardtr.com")
-    return templates.TemplateResponse("index.html", ctx)
+    return _static_page(request, "landing", "index.html", "CashGuard TR | cashguardtr.com")
 
 
-@app.get("/check", response_class=HTMLResponse)
+@router.get("/check", response_class=HTMLResponse)
 def check(request: Request, sector: str = "defense"):
     sector = _sanitize_sector(sector)
     sector_label = SECTOR_LABELS[sector]
-    ctx = _common_ctx(request, f"{sector_label} Risk Testi | CashGuard TR")
-    ctx.update({"sector": sector, "sector_label": sector_label})
-    return templates.TemplateResponse("check.html", ctx)
+    return _static_page(
+        request, "check", "check.html", f"{sector_label} Risk Testi | CashGuard TR",
+        sector=sector, sector_label=sector_label,
+    )
 
 
-@app.post("/result", response_class=HTMLResponse)
+@router.post("/result", response_class=HTMLResponse)
 def result(
     request: Request,
     sector: str = Form("defense"),
@@ -243,7 +268,7 @@ def result(
     return templates.TemplateResponse("result.html", ctx)
 
 
-@app.post("/result/pdf")
+@router.post("/result/pdf")
 def result_pdf(
     request: Request,
     sector: str = Form("defense"),
@@ -291,7 +316,7 @@ def result_pdf(
     top_customer_share = _clamp_pct(top_customer_share if top_customer_share is not None else 0)
     top_customer_2m_gap_month = int(top_customer_2m_gap_month) if top_customer_2m_gap_month is not None else 99
 
-    score, level, messages = calculate_risk(
+    inputs = dict(
         sector=sector,
         collection_days=collection_days,
         payable_days=payable_days,
@@ -306,28 +331,7 @@ def result_pdf(
         limit_pressure=limit_pressure,
         hedging=hedging,
     )
-
-    payload = {
-        "company": company,
-        "sector": sector_label,
-        "score": score,
-        "level": level,
-        "messages": messages,
-        "collection_days": collection_days,
-        "payable_days": payable_days,
-        "fx_debt_ratio": fx_debt_ratio,
-        "fx_revenue_ratio": fx_revenue_ratio,
-        "cash_buffer_months": cash_buffer_months,
-        "top_customer_share": top_customer_share,
-        "top_customer_2m_gap_month": top_customer_2m_gap_month,
-        "unplanned_deferral_12m": unplanned_deferral_12m,
-        "delay_issue": delay_issue,
-        "short_debt_ratio": short_debt_ratio,
-        "limit_pressure": limit_pressure,
-        "hedging": hedging,
-    }
-
-    pdf_bytes = build_pdf_report(payload)
+    score, level, messages, pdf_bytes = _risk_report(inputs, company)
     filename = f"cashguardtr-{sector}-skor-{score}.pdf"
 
     return StreamingResponse(
@@ -337,7 +341,7 @@ def result_pdf(
     )
 
 
-@app.post("/result/email", response_class=HTMLResponse)
+@router.post("/result/email", response_class=HTMLResponse)
 def result_email(
     request: Request,
     sector: str = Form("defense"),
@@ -386,7 +390,7 @@ def result_email(
     top_customer_share = _clamp_pct(top_customer_share if top_customer_share is not None else 0)
     top_customer_2m_gap_month = int(top_customer_2m_gap_month) if top_customer_2m_gap_month is not None else 99
 
-    score, level, messages = calculate_risk(
+    inputs = dict(
         sector=sector,
         collection_days=collection_days,
         payable_days=payable_days,
@@ -401,28 +405,7 @@ def result_email(
         limit_pressure=limit_pressure,
         hedging=hedging,
     )
-
-    payload = {
-        "company": company,
-        "sector": sector_label,
-        "score": score,
-        "level": level,
-        "messages": messages,
-        "collection_days": collection_days,
-        "payable_days": payable_days,
-        "fx_debt_ratio": fx_debt_ratio,
-        "fx_revenue_ratio": fx_revenue_ratio,
-        "cash_buffer_months": cash_buffer_months,
-        "top_customer_share": top_customer_share,
-        "top_customer_2m_gap_month": top_customer_2m_gap_month,
-        "unplanned_deferral_12m": unplanned_deferral_12m,
-        "delay_issue": delay_issue,
-        "short_debt_ratio": short_debt_ratio,
-        "limit_pressure": limit_pressure,
-        "hedging": hedging,
-    }
-
-    pdf_bytes = build_pdf_report(payload)
+    score, level, messages, pdf_bytes = _risk_report(inputs, company)
     filename = f"cashguardtr-{sector}-skor-{score}.pdf"
 
     user_subject = f"CashGuard TR Sonuç Raporu — {sector_label} ({score}/100)"
@@ -451,14 +434,15 @@ def result_email(
     email_error = None
 
     try:
-        send_email_smtp(
+        # sadece kuyruğa alır; gönderim mailer thread'inde (retry + disk spool)
+        mailer.enqueue_email(
             to_email=email.strip(),
             subject=user_subject,
             body_text=user_body,
             attachment_bytes=pdf_bytes,
             attachment_filename=filename,
         )
-        send_email_smtp(
+        mailer.enqueue_email(
             to_email=LEAD_EMAIL,
             subject=lead_subject,
             body_text=lead_body,
@@ -495,37 +479,32 @@ def result_email(
     return templates.TemplateResponse("result.html", ctx)
 
 
-@app.get("/about", response_class=HTMLResponse)
+@router.get("/about", response_class=HTMLResponse)
 def about(request: Request):
-    ctx = _common_ctx(request, "Hakkında | CashGuard TR")
-    return templates.TemplateResponse("about.html", ctx)
+    return _static_page(request, "about", "about.html", "Hakkında | CashGuard TR")
 
 
-@app.get("/team", response_class=HTMLResponse)
+@router.get("/team", response_class=HTMLResponse)
 def team(request: Request):
-    ctx = _common_ctx(request, "Biz Kimiz | CashGuard TR")
-    return templates.TemplateResponse("team.html", ctx)
+    return _static_page(request, "team", "team.html", "Biz Kimiz | CashGuard TR")
 
 
-@app.get("/services", response_class=HTMLResponse)
+@router.get("/services", response_class=HTMLResponse)
 def services(request: Request):
-    ctx = _common_ctx(request, "Hizmetlerimiz | CashGuard TR")
-    return templates.TemplateResponse("services.html", ctx)
+    return _static_page(request, "services", "services.html", "Hizmetlerimiz | CashGuard TR")
 
 
-@app.get("/contact", response_class=HTMLResponse)
+@router.get("/contact", response_class=HTMLResponse)
 def contact(request: Request):
-    ctx = _common_ctx(request, "İletişim | CashGuard TR")
-    return templates.TemplateResponse("contact.html", ctx)
+    return _static_page(request, "contact", "contact.html", "İletişim | CashGuard TR")
 
 
-@app.get("/why-cash", response_class=HTMLResponse)
+@router.get("/why-cash", response_class=HTMLResponse)
 def why_cash(request: Request):
-    ctx = _common_ctx(request, "Nakit Neden Korunmalı? | CashGuard TR")
-    return templates.TemplateResponse("why_cash.html", ctx)
+    return _static_page(request, "why_cash", "why_cash.html", "Nakit Neden Korunmalı? | CashGuard TR")
 
 
-@app.get("/health")
+@router.get("/health")
 def health():
     return {"status": "ok"}
 
@@ -539,93 +518,296 @@ def _admin_ctx(request: Request, title: str, admin_email: str | None = None, err
     return ctx
 
 
-def _get_admin_email_from_cookie(request: Request) -> str | None:
-    token = request.cookies.get("cg_admin")
-    if not token:
-        return None
-    data = read_session(token)
-    if not data:
+def _session_user(request: Request, db: Session) -> User | None:
+    """Cookie'deki kullanıcı (logout / şifre değişikliği gibi DB'ye yazan işlemler için)."""
+    data = read_session(request.cookies.get("cg_admin") or "")
+    if not data or data.get("uid") is None:
         return None
-    return data.get("email")
+    return db.get(User, data["uid"])
 
 
 def require_admin(request: Request, db: Session = Depends(get_db)) -> str:
-    email = _get_admin_email_from_cookie(request)
-    if not email:
-        raise PermissionError("Not logged in")
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        raise PermissionError("Unknown user")
-    return email
+    """
+    Admin e-postasını döner, değilse PermissionError (AuthError). Kimlik cache'i sayesinde çoğu
+    istekte DB'ye gidilmez; süre Server-Timing başlığına ve /admin/metrics'e yazılır.
+    """
+    t0 = time.perf_counter()
+    source = "rejected"
+    try:
+        email, used_db = resolve_admin(request.cookies.get("cg_admin"), db)
+        source = "db" if used_db else "cache"
+        return email
+    finally:
+        ms = (time.perf_counter() - t0) * 1000
+        request.state.auth_timing = (source, ms)
+        note_timing(source, ms)
 
 
-def ensure_initial_admin(db: Session):
+def _user_exists(email: str) -> bool:
+    db = SessionLocal()
+    try:
+        return db.query(User.id).filter(User.email == email).first() is not None
+    finally:
+        db.close()
+
+
+def _create_initial_admin(email: str, password_hash: str) -> None:
+    db = SessionLocal()
+    try:
+        db.add(User(email=email, password_hash=password_hash, role="admin"))
+        db.commit()
+    except IntegrityError:
+        db.rollback()  # eşzamanlı ilk giriş aynı hesabı oluşturdu
+    finally:
+        db.close()
+
+
+async def ensure_initial_admin() -> None:
     """
     İlk admin hesabını ENV ile oluşturur:
     ADMIN_EMAIL, ADMIN_PASSWORD
+    Hash şifre havuzunda hesaplanır (PasswordBusy çağırana gider).
     """
     admin_email = os.getenv("ADMIN_EMAIL")
     admin_password = os.getenv("ADMIN_PASSWORD")
     if not admin_email or not admin_password:
         return
 
-    exists = db.query(User).filter(User.email == admin_email).first()
-    if exists:
+    if await run_in_threadpool(_user_exists, admin_email):
         return
 
-    u = User(email=admin_email, password_hash=hash_password(admin_password), role="admin")
-    db.add(u)
-    db.commit()
+    password_hash = await password_pool.hash(admin_password)
+    await run_in_threadpool(_create_initial_admin, admin_email, password_hash)
 
 
 # =========================
 # ADMIN ROUTES
 # =========================
-@app.get("/admin", response_class=HTMLResponse)
-def admin_home(request: Request, db: Session = Depends(get_db)):
-    ensure_initial_admin(db)
+def _companies_page(
+    request: Request,
+    db: Session,
+    email: str,
+    *,
+    error: str | None = None,
+    status_code: int = 200,
+    after: Optional[int] = None,
+    before: Optional[int] = None,
+    sector: str = "",
+    level: str = "",
+):
+    """Dashboard (portfolio özetleri) + keyset sayfalı firma listesi."""
+    page = portfolio.list_companies(db, after=after, before=before, sector=sector, level=level, limit=COMPANY_PAGE_SIZE)
+    ctx = _admin_ctx(request, "Firmalar | Admin", admin_email=email, error=error)
+    ctx.update(
+        {
+            "dashboard": portfolio.dashboard(db),
+            "companies": page["rows"],
+            "next_after": page["next_after"],
+            "prev_before": page["prev_before"],
+            "filter_sector": sector,
+            "filter_level": level,
+            "sector_labels": SECTOR_LABELS,
+            "level_labels": portfolio.LEVEL_LABELS,
+        }
+    )
+    return templates.TemplateResponse("admin_companies.html", ctx, status_code=status_code)
 
-    email = _get_admin_email_from_cookie(request)
-    if not email:
-        ctx = _admin_ctx(request, "Admin Giriş")
-        return templates.TemplateResponse("admin_login.html", ctx)
 
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
+@router.get("/admin", response_class=HTMLResponse)
+def admin_home(
+    request: Request,
+    after: Optional[int] = None,
+    before: Optional[int] = None,
+    sector: str = "",
+    level: str = "",
+    db: Session = Depends(get_db),
+):
+    try:
+        email = require_admin(request, db)
+    except AuthError:
+        if not request.cookies.get("cg_admin"):
+            ctx = _admin_ctx(request, "Admin Giriş")
+            return templates.TemplateResponse("admin_login.html", ctx)
         ctx = _admin_ctx(request, "Admin Giriş", error="Oturum geçersiz. Tekrar giriş yapın.")
         resp = templates.TemplateResponse("admin_login.html", ctx)
         resp.delete_cookie("cg_admin")
         return resp
 
-    companies = db.query(Company).order_by(Company.created_at.desc()).all()
-    ctx = _admin_ctx(request, "Firmalar | Admin", admin_email=email)
-    ctx.update({"companies": companies})
-    return templates.TemplateResponse("admin_companies.html", ctx)
+    return _companies_page(request, db, email, after=after, before=before, sector=sector, level=level)
+
+
+@router.post("/admin/batch-score")
+def admin_batch_score(request: Request, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """Portföy dosyasını (xlsx/csv) toplu skorlar, sonucu CSV olarak döner."""
+    try:
+        email = require_admin(request, db)
+    except PermissionError:
+        return RedirectResponse(url="/admin", status_code=302)
+
+    from app.batch_scoring import read_records, score_batch, write_csv  # numpy ilk toplu skorlamada yüklenir
+
+    try:
+        records = read_records(BytesIO(file.file.read()), filename=file.filename or "")
+        result = score_batch(records)
+    except Exception as e:
+        return _companies_page(request, db, email, error=f"Toplu skorlama başarısız: {e}", status_code=400)
 
+    out = StringIO()
+    write_csv(out, records, result)
+    filename = f"cashguardtr-portfoy-skor-{datetime.utcnow():%Y%m%d}.csv"
+    return StreamingResponse(
+        BytesIO(out.getvalue().encode("utf-8-sig")),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/admin/pdfs/regenerate")
+def admin_pdfs_regenerate(request: Request, company_id: Optional[int] = Form(None), db: Session = Depends(get_db)):
+    """Analiz PDF'lerini arka planda toplu yeniden üretir (aynı anda tek çalışma)."""
+    try:
+        _ = require_admin(request, db)
+    except PermissionError:
+        return RedirectResponse(url="/admin", status_code=302)
+
+    bulk_pdf.start_background(parse_pool, company_id=company_id)
+    return RedirectResponse(url="/admin/pdfs/regenerate", status_code=303)
+
+
+@router.get("/admin/pdfs/regenerate")
+def admin_pdfs_regenerate_status(request: Request, db: Session = Depends(get_db)):
+    try:
+        _ = require_admin(request, db)
+    except PermissionError:
+        return JSONResponse({"error": "unauthorized"}, status_code=401)
 
-@app.post("/admin/login")
-def admin_login(request: Request, email: str = Form(...), password: str = Form(...), db: Session = Depends(get_db)):
-    ensure_initial_admin(db)
+    return bulk_pdf.progress()
 
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.password_hash):
+
+def _login_lookup(email: str):
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == email).first()
+        return (user.id, user.password_hash) if user else None
+    finally:
+        db.close()
+
+
+def _login_finish(user_id: int, new_hash: str | None) -> str:
+    db = SessionLocal()
+    try:
+        user = db.get(User, user_id)
+        if new_hash:
+            # eski SHA-256 / eski maliyetli hash: doğru şifreyle güncel KDF'e taşınır (oturumlar korunur)
+            user.password_hash = new_hash
+            db.commit()
+        return make_session(user)
+    finally:
+        db.close()
+
+
+@router.post("/admin/login")
+async def admin_login(request: Request, email: str = Form(...), password: str = Form(...)):
+    """
+    KDF doğrulaması sınırlı şifre havuzunda çalışır; beklerken ne event loop ne de request
+    thread'leri tutulur. Havuz doluysa 503 döner, diğer istekler aç kalmaz.
+    """
+    try:
+        await ensure_initial_admin()
+        found = await run_in_threadpool(_login_lookup, email)
+        ok = await password_pool.verify(password, found[1] if found else await password_pool.dummy_hash())
+        new_hash = await password_pool.hash(password) if found and ok and needs_rehash(found[1]) else None
+    except PasswordBusy as e:
+        ctx = _admin_ctx(request, "Admin Giriş", error=str(e))
+        return templates.TemplateResponse("admin_login.html", ctx, status_code=503)
+
+    if not found or not ok:
         ctx = _admin_ctx(request, "Admin Giriş", error="E-posta veya şifre hatalı.")
         return templates.TemplateResponse("admin_login.html", ctx)
 
-    token = make_session(user.email)
+    token = await run_in_threadpool(_login_finish, found[0], new_hash)
     resp = RedirectResponse(url="/admin", status_code=302)
     resp.set_cookie("cg_admin", token, httponly=True, samesite="lax", secure=True)
     return resp
 
 
-@app.get("/admin/logout")
-def admin_logout():
+@router.get("/admin/logout")
+def admin_logout(request: Request, db: Session = Depends(get_db)):
+    # cookie imzalı ve durumsuz: silmek yetmez, sürümü artırıp kopyalarını da geçersiz kılıyoruz
+    user = _session_user(request, db)
+    if user is not None:
+        revoke_sessions(user)
+        db.commit()
     resp = RedirectResponse(url="/admin", status_code=302)
     resp.delete_cookie("cg_admin")
     return resp
 
 
-@app.post("/admin/companies/create")
+def _password_lookup(request: Request):
+    """(admin e-postası, (user_id, hash) | None); admin değilse None."""
+    db = SessionLocal()
+    try:
+        email = require_admin(request, db)
+        user = _session_user(request, db)
+        return email, ((user.id, user.password_hash) if user else None)
+    except PermissionError:
+        return None
+    finally:
+        db.close()
+
+
+def _password_error(request: Request, email: str, error: str, status_code: int):
+    db = SessionLocal()
+    try:
+        return _companies_page(request, db, email, error=error, status_code=status_code)
+    finally:
+        db.close()
+
+
+def _password_finish(user_id: int, new_hash: str) -> str:
+    db = SessionLocal()
+    try:
+        user = db.get(User, user_id)
+        user.password_hash = new_hash
+        revoke_sessions(user)
+        db.commit()
+        return make_session(user)
+    finally:
+        db.close()
+
+
+@router.post("/admin/password")
+async def admin_change_password(
+    request: Request,
+    current_password: str = Form(...),
+    new_password: str = Form(...),
+):
+    """
+    Şifre değişikliği: diğer tüm oturumlar kapanır, bu oturuma yeni cookie verilir.
+    Doğrulama ve yeni hash girişteki gibi şifre havuzunda; havuz doluysa 503.
+    """
+    found = await run_in_threadpool(_password_lookup, request)
+    if found is None:
+        return RedirectResponse(url="/admin", status_code=302)
+    email, user = found
+
+    try:
+        ok = user is not None and await password_pool.verify(current_password, user[1])
+        if not ok:
+            return await run_in_threadpool(_password_error, request, email, "Mevcut şifre hatalı.", 400)
+        if len(new_password) < 8:
+            return await run_in_threadpool(_password_error, request, email, "Yeni şifre en az 8 karakter olmalı.", 400)
+        new_hash = await password_pool.hash(new_password)
+    except PasswordBusy as e:
+        return await run_in_threadpool(_password_error, request, email, str(e), 503)
+
+    token = await run_in_threadpool(_password_finish, user[0], new_hash)
+    resp = RedirectResponse(url="/admin", status_code=303)
+    resp.set_cookie("cg_admin", token, httponly=True, samesite="lax", secure=True)
+    return resp
+
+
+@router.post("/admin/companies/create")
 def admin_company_create(
     request: Request,
     name: str = Form(...),
@@ -640,12 +822,14 @@ def admin_company_create(
     sector = _sanitize_sector(sector)
     c = Company(name=name.strip(), sector=sector)
     db.add(c)
+    db.flush()
+    portfolio.register_company(db, c)
     db.commit()
     return RedirectResponse(url=f"/admin/companies/{c.id}", status_code=302)
 
 
-@app.get("/admin/companies/{company_id}", response_class=HTMLResponse)
-def admin_company_page(request: Request, company_id: int, db: Session = Depends(get_db)):
+@router.get("/admin/companies/{company_id}", response_class=HTMLResponse)
+def admin_company_page(request: Request, company_id: int, cursor: str = "", db: Session = Depends(get_db)):
     try:
         email = require_admin(request, db)
     except PermissionError:
@@ -653,20 +837,140 @@ def admin_company_page(request: Request, company_id: int, db: Session = Depends(
 
     company = db.query(Company).filter(Company.id == company_id).first()
     if not company:
-        ctx = _admin_ctx(request, "Firma | Admin", admin_email=email, error="Firma bulunamadı.")
-        return templates.TemplateResponse("admin_companies.html", ctx)
+        return _companies_page(request, db, email, error="Firma bulunamadı.")
 
-    uploads = db.query(Upload).filter(Upload.company_id == company_id).order_by(Upload.uploaded_at.desc()).all()
+    page = listing.list_uploads(db, company_id, cursor=cursor)
     ctx = _admin_ctx(request, f"{company.name} | Admin", admin_email=email)
-    ctx.update({"company": company, "uploads": uploads})
+    ctx.update({"company": company, "uploads": page["rows"], "cursor": cursor, "next_cursor": page["next_cursor"]})
     return templates.TemplateResponse("admin_company.html", ctx)
 
 
-@app.post("/admin/companies/{company_id}/upload")
+@router.get("/admin/companies/{company_id}/analyses", response_class=HTMLResponse)
+def admin_company_analyses(request: Request, company_id: int, cursor: str = "", db: Session = Depends(get_db)):
+    """Firmanın analiz geçmişi; sadece analysis_metrics okunur (result_json / mapping log yüklenmez)."""
+    try:
+        email = require_admin(request, db)
+    except PermissionError:
+        return RedirectResponse(url="/admin", status_code=302)
+
+    company = db.query(Company).filter(Company.id == company_id).first()
+    if not company:
+        return RedirectResponse(url="/admin", status_code=302)
+
+    page = listing.list_analyses(db, company_id, ANALYSIS_LIST_COLUMNS, cursor=cursor)
+    ctx = _admin_ctx(request, f"{company.name} | Analiz Geçmişi", admin_email=email)
+    ctx.update(
+        {
+            "company": company,
+            "sector_label": SECTOR_LABELS.get(company.sector, company.sector),
+            "rows": page["rows"],
+            "cursor": cursor,
+            "next_cursor": page["next_cursor"],
+        }
+    )
+    return templates.TemplateResponse("admin_analyses.html", ctx)
+
+
+# =========================
+# ADMIN LİSTE API'si (keyset sayfalı JSON)
+# =========================
+@router.get("/admin/api/companies")
+def admin_api_companies(
+    request: Request,
+    after: Optional[int] = None,
+    before: Optional[int] = None,
+    sector: str = "",
+    level: str = "",
+    limit: int = listing.LIST_PAGE_SIZE,
+    db: Session = Depends(get_db),
+):
+    try:
+        _ = require_admin(request, db)
+    except PermissionError:
+        return JSONResponse({"error": "unauthorized"}, status_code=401)
+
+    limit = max(1, min(limit, listing.LIST_PAGE_MAX))
+    page = portfolio.list_companies(db, after=after, before=before, sector=sector, level=level, limit=limit)
+    items = [
+        {"id": r.id, "name": r.name, "sector": r.sector, "level": r.level, "current_ratio": r.current_ratio,
+         "period": r.period.strftime("%Y-%m") if r.period else None}
+        for r in page["rows"]
+    ]
+    return {"items": items, "next_after": page["next_after"], "prev_before": page["prev_before"]}
+
+
+@router.get("/admin/api/companies/{company_id}/uploads")
+def admin_api_uploads(
+    request: Request,
+    company_id: int,
+    kind: str = "",
+    cursor: str = "",
+    limit: int = listing.LIST_PAGE_SIZE,
+    db: Session = Depends(get_db),
+):
+    try:
+        _ = require_admin(request, db)
+    except PermissionError:
+        return JSONResponse({"error": "unauthorized"}, status_code=401)
+
+    page = listing.list_uploads(db, company_id, kind=kind, cursor=cursor, limit=limit)
+    return listing.as_json(page, ("id", "kind", "filename", "period", "ts"))
+
+
+@router.get("/admin/api/companies/{company_id}/analyses")
+def admin_api_analyses(
+    request: Request,
+    company_id: int,
+    cursor: str = "",
+    limit: int = listing.LIST_PAGE_SIZE,
+    db: Session = Depends(get_db),
+):
+    try:
+        _ = require_admin(request, db)
+    except PermissionError:
+        return JSONResponse({"error": "unauthorized"}, status_code=401)
+
+    page = listing.list_analyses(db, company_id, ANALYSIS_LIST_COLUMNS, cursor=cursor, limit=limit)
+    return listing.as_json(page, ("id", "ts", *ANALYSIS_LIST_COLUMNS))
+
+
+@router.get("/admin/companies/{company_id}/trend")
+def admin_company_trend(
+    request: Request,
+    company_id: int,
+    metrics: str = "",
+    period_from: str = "",
+    period_to: str = "",
+    db: Session = Depends(get_db),
+):
+    """
+    Firma metrik trendi (dönem sıralı değer + delta + 3/12 aylık ortalama, 12 aylık min/max).
+    metrics: virgülle ayrılmış metrik adları (boş => varsayılan set). Dönemler YYYY-AA.
+    """
+    try:
+        _ = require_admin(request, db)
+    except PermissionError:
+        return JSONResponse({"error": "unauthorized"}, status_code=401)
+
+    names = [m.strip() for m in metrics.split(",") if m.strip()] or list(timeseries.DEFAULT_TREND_METRICS)
+    unknown = [m for m in names if m not in timeseries.TREND_METRICS]
+    if unknown:
+        return JSONResponse({"error": f"Bilinmeyen metrik: {', '.join(unknown)}"}, status_code=400)
+
+    series = timeseries.trend(
+        db, company_id, names,
+        period_from=timeseries.parse_period(period_from),
+        period_to=timeseries.parse_period(period_to),
+    )
+    return {"company_id": company_id, "metrics": series}
+
+
+@router.post("/admin/companies/{company_id}/upload")
 def admin_upload_excel(
     request: Request,
     company_id: int,
     file: UploadFile = File(...),
+    period: str = Form(""),
     db: Session = Depends(get_db),
 ):
     try:
@@ -686,17 +990,20 @@ def admin_upload_excel(
     with dest.open("wb") as f:
         shutil.copyfileobj(file.file, f)
 
-    up = Upload(company_id=company_id, kind="excel", filename=safe_name, path=str(dest))
+    up = Upload(company_id=company_id, kind="excel", filename=safe_name, path=str(dest), period=timeseries.parse_period(period))
     db.add(up)
     db.commit()
 
     return RedirectResponse(url=f"/admin/companies/{company_id}", status_code=302)
 
 
-@app.post("/admin/companies/{company_id}/analyze")
+@router.post("/admin/companies/{company_id}/analyze")
 def admin_analyze(request: Request, company_id: int, db: Session = Depends(get_db)):
+    """
+    Analizi kuyruğa alır ve hemen döner; parse -> analyze -> PDF arka planda çalışır.
+    """
     try:
-        email = require_admin(request, db)
+        _ = require_admin(request, db)
     except PermissionError:
         return RedirectResponse(url="/admin", status_code=302)
 
@@ -704,41 +1011,95 @@ def admin_analyze(request: Request, company_id: int, db: Session = Depends(get_d
     if not company:
         return RedirectResponse(url="/admin", status_code=302)
 
-    last_upload = (
-        db.query(Upload)
-        .filter(Upload.company_id == company_id, Upload.kind == "excel")
-        .order_by(Upload.uploaded_at.desc())
-        .first()
-    )
+    last_upload = listing.latest_upload(db, company_id)
     if not last_upload:
         return RedirectResponse(url=f"/admin/companies/{company_id}", status_code=302)
 
+    job = jobs.submit_analysis_job(db, company_id=company_id, upload_id=last_upload.id)
+    return RedirectResponse(url=f"/admin/jobs/{job.id}", status_code=302)
+
+
+@router.get("/admin/jobs/{job_id}", response_class=HTMLResponse)
+def admin_job_page(request: Request, job_id: int, db: Session = Depends(get_db)):
     try:
-        fin = parse_financials_xlsx(last_upload.path)
-        result = analyze_financials(fin, sector=company.sector)
-    except Exception as e:
-        ctx = _admin_ctx(request, f"{company.name} | Admin", admin_email=email, error=str(e))
-        uploads = db.query(Upload).filter(Upload.company_id == company_id).order_by(Upload.uploaded_at.desc()).all()
-        ctx.update({"company": company, "uploads": uploads})
-        return templates.TemplateResponse("admin_company.html", ctx)
+        email = require_admin(request, db)
+    except PermissionError:
+        return RedirectResponse(url="/admin", status_code=302)
 
-    analysis = Analysis(company_id=company_id, result_json=json.dumps(result, ensure_ascii=False))
-    db.add(analysis)
-    db.commit()
+    job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+    if not job:
+        return RedirectResponse(url="/admin", status_code=302)
+    if job.status == "done" and job.analysis_id:
+        return RedirectResponse(url=f"/admin/analyses/{job.analysis_id}", status_code=302)
 
-    # PDF üretip dosyaya yaz (isteğe bağlı)
-    sector_label = SECTOR_LABELS.get(company.sector, company.sector)
-    pdf_bytes = build_admin_analysis_pdf(company.name, sector_label, result.get("bullets", [])[:10])
-    pdf_path = UPLOAD_DIR / f"analysis_{analysis.id}.pdf"
-    pdf_path.write_bytes(pdf_bytes)
+    company = db.query(Company).filter(Company.id == job.company_id).first()
+    ctx = _admin_ctx(request, "Analiz İşi | Admin", admin_email=email)
+    ctx.update({"company": company, "job": jobs.job_status(job)})
+    return templates.TemplateResponse("admin_job.html", ctx)
 
-    analysis.pdf_path = str(pdf_path)
-    db.commit()
 
-    return RedirectResponse(url=f"/admin/analyses/{analysis.id}", status_code=302)
+@router.get("/admin/jobs/{job_id}/status")
+def admin_job_status(request: Request, job_id: int, db: Session = Depends(get_db)):
+    try:
+        _ = require_admin(request, db)
+    except PermissionError:
+        return JSONResponse({"error": "unauthorized"}, status_code=401)
+
+    job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+    if not job:
+        return JSONResponse({"error": "not found"}, status_code=404)
+    return jobs.job_status(job)
+
+
+@router.get("/admin/metrics")
+def admin_metrics(request: Request, db: Session = Depends(get_db)):
+    try:
+        _ = require_admin(request, db)
+    except PermissionError:
+        return JSONResponse({"error": "unauthorized"}, status_code=401)
+
+    return {
+        "auth": auth_cache_stats(),
+        "passwords": password_pool.stats(),
+        "report_cache": report_cache.report_cache_stats(),
+        "page_cache": page_cache.page_cache_stats(),
+        "mapping_log_cache": mapping_log.mapping_log_cache_stats(),
+        **parse_pool.cache_stats(),
+        "mail": mailer.mail_stats(),
+        "bulk_pdf": bulk_pdf.progress(),
+    }
+
 
+@router.get("/admin/analyses/export")
+def admin_analyses_export(
+    request: Request,
+    company_id: str = "",
+    date_from: str = "",
+    date_to: str = "",
+    db: Session = Depends(get_db),
+):
+    """Seçili analiz PDF'lerini ZIP olarak stream eder (boş filtre => tümü)."""
+    try:
+        email = require_admin(request, db)
+    except PermissionError:
+        return RedirectResponse(url="/admin", status_code=302)
+
+    try:
+        cid = int(company_id) if company_id.strip() else None
+        d_from = date.fromisoformat(date_from) if date_from.strip() else None
+        d_to = date.fromisoformat(date_to) if date_to.strip() else None
+    except ValueError:
+        return _companies_page(request, db, email, error="Geçersiz filtre (tarih YYYY-AA-GG olmalı).", status_code=400)
+
+    filename = zip_export.export_filename(cid, d_from, d_to)
+    return StreamingResponse(
+        zip_export.stream_zip(parse_pool, cid, d_from, d_to),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
-@app.get("/admin/analyses/{analysis_id}", response_class=HTMLResponse)
+
+@router.get("/admin/analyses/{analysis_id}", response_class=HTMLResponse)
 def admin_analysis_view(request: Request, analysis_id: int, db: Session = Depends(get_db)):
     try:
         email = require_admin(request, db)
@@ -750,7 +1111,7 @@ def admin_analysis_view(request: Request, analysis_id: int, db: Session = Depend
         return RedirectResponse(url="/admin", status_code=302)
 
     company = db.query(Company).filter(Company.id == analysis.company_id).first()
-    data = json.loads(analysis.result_json)
+    data = analysis_store.load_summary(analysis)
 
     sector_label = SECTOR_LABELS.get(company.sector, company.sector)
     ctx = _admin_ctx(request, "Analiz | Admin", admin_email=email)
@@ -758,8 +1119,9 @@ def admin_analysis_view(request: Request, analysis_id: int, db: Session = Depend
     return templates.TemplateResponse("admin_analysis.html", ctx)
 
 
-@app.get("/admin/analyses/{analysis_id}/pdf")
+@router.get("/admin/analyses/{analysis_id}/pdf")
 def admin_analysis_pdf(request: Request, analysis_id: int, db: Session = Depends(get_db)):
+    """Saklı PDF'i dosyadan sunar (ETag / 304 / byte range); dosya yoksa bir kez üretip kaydeder."""
     try:
         _ = require_admin(request, db)
     except PermissionError:
@@ -769,25 +1131,35 @@ def admin_analysis_pdf(request: Request, analysis_id: int, db: Session = Depends
     if not analysis:
         return RedirectResponse(url="/admin", status_code=302)
 
-    if analysis.pdf_path and Path(analysis.pdf_path).exists():
-        pdf_bytes = Path(analysis.pdf_path).read_bytes()
-    else:
-        company = db.query(Company).filter(Company.id == analysis.company_id).first()
-        data = json.loads(analysis.result_json)
-        sector_label = SECTOR_LABELS.get(company.sector, company.sector)
-        pdf_bytes = build_admin_analysis_pdf(company.name, sector_label, data.get("bullets", [])[:10])
-
-    filename = f"cashguard-admin-analiz-{analysis_id}.pdf"
-    return StreamingResponse(BytesIO(pdf_bytes), media_type="application/pdf", headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+    try:
+        path = pdf_files.ensure_pdf(db, analysis, parse_pool)
+    except PoolBusy as e:
+        return JSONResponse({"error": str(e)}, status_code=503)
+    except pdf_files.PdfRenderError as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+    st = pdf_files.stat_pdf(path)
+    if st is None:
+        return JSONResponse({"error": "pdf_missing"}, status_code=404)
+
+    headers = pdf_files.cache_headers(pdf_files.etag_for(analysis_id, path, st), st)
+    if pdf_files.not_modified(request.headers, headers["ETag"], st):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename=f"cashguard-admin-analiz-{analysis_id}.pdf",
+        headers=headers,
+        stat_result=st,
+    )
 
 
 # =========================
 # ✅ NEW: MAPPING DEBUG ROUTES
 # =========================
-@app.get("/admin/companies/{company_id}/mapping-debug", response_class=HTMLResponse)
+@router.get("/admin/companies/{company_id}/mapping-debug", response_class=HTMLResponse)
 def admin_company_mapping_debug(request: Request, company_id: int, db: Session = Depends(get_db)):
     """
-    Son yüklenen Excel üzerinden parse_financials_xlsx çalıştırır ve mapping log'u gösterir.
+    Son yüklenen Excel üzerinden parse_financials_xlsx çalıştırır (parse cache üzerinden) ve mapping log'u gösterir.
     """
     try:
         email = require_admin(request, db)
@@ -798,22 +1170,16 @@ def admin_company_mapping_debug(request: Request, company_id: int, db: Session =
     if not company:
         return RedirectResponse(url="/admin", status_code=302)
 
-    last_upload = (
-        db.query(Upload)
-        .filter(Upload.company_id == company_id, Upload.kind == "excel")
-        .order_by(Upload.uploaded_at.desc())
-        .first()
-    )
+    last_upload = listing.latest_upload(db, company_id)
     if not last_upload:
         ctx = _admin_ctx(request, "Mapping Debug | Admin", admin_email=email, error="Bu firmaya ait Excel upload bulunamadı.")
         return templates.TemplateResponse("admin_company.html", ctx)
 
     try:
-        fin = parse_financials_xlsx(last_upload.path)
-        mlog = fin.get("mapping_log", {}) or {}
+        info = parse_pool.run(mapping_log.upload_summary, last_upload.path)
     except Exception as e:
         ctx = _admin_ctx(request, "Mapping Debug | Admin", admin_email=email, error=str(e))
-        ctx.update({"company": company})
+        ctx.update({"company": company, "source": "last_upload", "log_summary": None})
         return templates.TemplateResponse("admin_mapping_debug.html", ctx)
 
     ctx = _admin_ctx(request, "Mapping Debug | Admin", admin_email=email)
@@ -823,21 +1189,53 @@ def admin_company_mapping_debug(request: Request, company_id: int, db: Session =
             "source": "last_upload",
             "upload_filename": last_upload.filename,
             "upload_path": last_upload.path,
-            "bs_log": mlog.get("balance_sheet", []),
-            "is_log": mlog.get("income_statement", []),
-            "bs_unmapped": mlog.get("unmapped_balance_sheet", []),
-            "is_unmapped": mlog.get("unmapped_income_statement", []),
-            "year_bs": fin.get("year_bs"),
-            "year_is": fin.get("year_is"),
+            "log_summary": info,
+            "log_api": f"/admin/companies/{company.id}/mapping-log",
+            "year_bs": info.get("year_bs"),
+            "year_is": info.get("year_is"),
+            "norm_stats": parse_pool.cache_stats()["normalize_cache"],
         }
     )
     return templates.TemplateResponse("admin_mapping_debug.html", ctx)
 
 
-@app.get("/admin/analyses/{analysis_id}/mapping-debug", response_class=HTMLResponse)
+@router.get("/admin/companies/{company_id}/mapping-log")
+def admin_company_mapping_log(
+    request: Request,
+    company_id: int,
+    section: str = "",
+    unmapped: Optional[str] = None,
+    key: str = "",
+    code_from: str = "",
+    code_to: str = "",
+    q: str = "",
+    offset: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+):
+    """Son upload'ın mapping log'undan tek sayfa (filtre + sayfalama worker'da)."""
+    try:
+        _ = require_admin(request, db)
+    except PermissionError:
+        return JSONResponse({"error": "unauthorized"}, status_code=401)
+
+    last_upload = listing.latest_upload(db, company_id)
+    if not last_upload:
+        return JSONResponse({"error": "not_found"}, status_code=404)
+
+    filters = mapping_log.parse_filters(unmapped, key, code_from, code_to, q, offset, limit)
+    try:
+        return parse_pool.run(mapping_log.upload_page, last_upload.path, section, filters)
+    except PoolBusy as e:
+        return JSONResponse({"error": str(e)}, status_code=503)
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+
+@router.get("/admin/analyses/{analysis_id}/mapping-debug", response_class=HTMLResponse)
 def admin_analysis_mapping_debug(request: Request, analysis_id: int, db: Session = Depends(get_db)):
     """
-    Kayıtlı Analysis.result_json içindeki mapping_log'u gösterir.
+    Kayıtlı analizin mapping_log'unu gösterir (analysis_mapping_logs; sadece bu sayfa açar).
     """
     try:
         email = require_admin(request, db)
@@ -849,8 +1247,14 @@ def admin_analysis_mapping_debug(request: Request, analysis_id: int, db: Session
         return RedirectResponse(url="/admin", status_code=302)
 
     company = db.query(Company).filter(Company.id == analysis.company_id).first()
-    data = json.loads(analysis.result_json)
-    mlog = (data.get("mapping_log") or {})
+    data = analysis_store.load_summary(analysis)
+
+    try:
+        log_summary = mapping_log.analysis_summary(db, analysis, parse_pool)
+    except Exception as e:
+        ctx = _admin_ctx(request, "Mapping Debug | Admin", admin_email=email, error=str(e))
+        ctx.update({"company": company, "source": "analysis", "log_summary": None})
+        return templates.TemplateResponse("admin_mapping_debug.html", ctx)
 
     ctx = _admin_ctx(request, "Mapping Debug | Admin", admin_email=email)
     ctx.update(
@@ -858,12 +1262,72 @@ def admin_analysis_mapping_debug(request: Request, analysis_id: int, db: Session
             "company": company,
             "source": "analysis",
             "analysis_id": analysis.id,
-            "bs_log": mlog.get("balance_sheet", []),
-            "is_log": mlog.get("income_statement", []),
-            "bs_unmapped": mlog.get("unmapped_balance_sheet", []),
-            "is_unmapped": mlog.get("unmapped_income_statement", []),
+            "log_summary": log_summary,
+            "log_api": f"/admin/analyses/{analysis.id}/mapping-log",
             "year_bs": (data.get("meta") or {}).get("year_bs"),
             "year_is": (data.get("meta") or {}).get("year_is"),
+            "norm_stats": parse_pool.cache_stats()["normalize_cache"],
         }
     )
     return templates.TemplateResponse("admin_mapping_debug.html", ctx)
+
+
+@router.get("/admin/analyses/{analysis_id}/mapping-log")
+def admin_analysis_mapping_log(
+    request: Request,
+    analysis_id: int,
+    section: str = "",
+    unmapped: Optional[str] = None,
+    key: str = "",
+    code_from: str = "",
+    code_to: str = "",
+    q: str = "",
+    offset: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+):
+    """Kayıtlı analizin mapping log'undan tek sayfa."""
+    try:
+        _ = require_admin(request, db)
+    except PermissionError:
+        return JSONResponse({"error": "unauthorized"}, status_code=401)
+
+    analysis = db.query(Analysis).filter(Analysis.id == analysis_id).first()
+    if not analysis:
+        return JSONResponse({"error": "not_found"}, status_code=404)
+
+    filters = mapping_log.parse_filters(unmapped, key, code_from, code_to, q, offset, limit)
+    try:
+        return mapping_log.analysis_page(db, analysis, parse_pool, section, filters)
+    except PoolBusy as e:
+        return JSONResponse({"error": str(e)}, status_code=503)
+
+
+# =========================
+# App factory
+# =========================
+def create_app() -> FastAPI:
+    """
+    ASGI uygulamasını kurar. Import yan etkisizdir (DB/dizin işlemi yok); ağır modüller
+    (openpyxl, numpy, reportlab, smtplib) ilk ihtiyaç duyan istekte yüklenir.
+
+        uvicorn --factory app.main:create_app
+    """
+    app = FastAPI(title="CashGuard TR", lifespan=lifespan)
+    app.middleware("http")(server_timing)
+    app.mount("/static", AssetStaticFiles(directory=str(BASE_DIR / "static")), name="static")
+    app.include_router(router)
+    return app
+
+
+_app: Optional[FastAPI] = None
+
+
+def __getattr__(name: str):
+    # `uvicorn app.main:app` ve `from app.main import app` için: ilk erişimde kurulur
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,254 @@
+# app/mapping_log.py
+"""
+Mapping log'un sayfalı / filtreli okunması (mapping-debug JSON API'si).
+
+Mapping-debug sayfası artık log'u HTML'e gömmez; sadece bölüm sayılarını render eder, satırlar
+/mapping-log JSON API'sinden sayfa sayfa çekilir.
+
+- Bölümler: balance_sheet, income_statement (legacy BILANCO/GELIR) ve trial_balance (mizan).
+- Filtreler: unmapped (key'siz satırlar; mizan satırlarının key'i olmadığından orada yok sayılır),
+  key (tam eşleşme), code_from/code_to (hesap kodu aralığı, bkz. _code_in_range), q (metin arama).
+- Kayıtlı analizlerin log'u analysis_mapping_logs'tan açılır. Çözülmüş log'lar bayt bütçeli bir
+  LRU'da (MAPPING_LOG_CACHE_MB; maliyet = ham JSON boyutu x DECODED_FACTOR) tutulur, sayfa gezinmek
+  her seferinde gzip açmaz. Bütçeye sığmayan büyük mizanlar web process'inde hiç çözülmez:
+  sıkıştırılmış blob worker'a gider, yalnızca istenen sayfa / özet döner.
+- Son upload için log worker process'te üretilir (parse cache üzerinden); web process'e sadece
+  istenen sayfa döner.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.analysis_store import decode_mapping_log, load_mapping_log
+from app.models import Analysis, AnalysisMappingLog
+from app.workers import ParsePool
+
+MAPPING_LOG_PAGE_MAX = int(os.getenv("MAPPING_LOG_PAGE_MAX", "500"))
+MAPPING_LOG_CACHE_MB = float(os.getenv("MAPPING_LOG_CACHE_MB", "64"))
+# çözülmüş dict/str nesneleri ham JSON'un ~3.6 katı bellek tutar (100k satırlık mizanda ölçüldü)
+DECODED_FACTOR = 4
+
+SECTIONS = ("trial_balance", "balance_sheet", "income_statement")
+SECTION_LABELS = {
+    "trial_balance": "Mizan satırları",
+    "balance_sheet": "Bilanço mapping",
+    "income_statement": "Gelir tablosu mapping",
+}
+
+_CODE_RE = re.compile(r"^\s*(\d[\d.\s-]*)")
+
+_lock = threading.Lock()
+_decoded: "OrderedDict[int, Tuple[dict, int]]" = OrderedDict()
+_decoded_bytes = 0
+
+
+# =========================
+# Bölümler / özet
+# =========================
+def sections(mlog: dict) -> Dict[str, List[dict]]:
+    if mlog.get("mode") == "trial_balance":
+        return {
+            "trial_balance": mlog.get("trial_balance_rows") or [],
+            "income_statement": mlog.get("income_statement_mapping") or [],
+        }
+    return {
+        "balance_sheet": mlog.get("balance_sheet") or [],
+        "income_statement": mlog.get("income_statement") or [],
+    }
+
+
+def summary(mlog: dict) -> dict:
+    out = []
+    for name, rows in sections(mlog).items():
+        mapped_rows = bool(rows) and "key" in rows[0]
+        out.append({
+            "name": name,
+            "label": SECTION_LABELS[name],
+            "total": len(rows),
+            "unmapped": sum(1 for r in rows if not r.get("key")) if mapped_rows else None,
+        })
+    return {"mode": mlog.get("mode"), "income_mode": mlog.get("income_mode"), "sections": out}
+
+
+# =========================
+# Filtre + sayfa
+# =========================
+def _code_of(row: dict) -> str:
+    code = row.get("code")
+    if code is None:
+        m = _CODE_RE.match(str(row.get("raw") or ""))
+        code = m.group(1) if m else ""
+    return re.sub(r"\D", "", str(code))
+
+
+def _code_in_range(code: str, code_from: str, code_to: str) -> bool:
+    """Kod, sınırın uzunluğu kadar önekiyle karşılaştırılır: 100..199 => 102.01.001 dahil."""
+    if not code:
+        return False
+    if code_from and code[: len(code_from)] < code_from:
+        return False
+    if code_to and code[: len(code_to)] > code_to:
+        return False
+    return True
+
+
+def page(
+    mlog: dict,
+    section: str,
+    *,
+    unmapped: bool = False,
+    key: str = "",
+    code_from: str = "",
+    code_to: str = "",
+    q: str = "",
+    offset: int = 0,
+    limit: int = 100,
+) -> dict:
+    secs = sections(mlog)
+    if section not in secs:
+        section = next(iter(secs), section)
+    rows = secs.get(section, [])
+
+    limit = max(1, min(int(limit), MAPPING_LOG_PAGE_MAX))
+    offset = max(0, int(offset))
+    code_from, code_to = re.sub(r"\D", "", code_from), re.sub(r"\D", "", code_to)
+    key = key.strip()
+    q = q.strip().casefold()
+    has_key = bool(rows) and "key" in rows[0]
+
+    items: List[dict] = []
+    matched = 0
+    for r in rows:
+        if has_key:
+            if unmapped and r.get("key"):
+                continue
+            if key and r.get("key") != key:
+                continue
+        elif key:
+            continue
+        if (code_from or code_to) and not _code_in_range(_code_of(r), code_from, code_to):
+            continue
+        if q and q not in " ".join(str(r.get(f) or "") for f in ("raw", "norm", "name", "code", "key_label")).casefold():
+            continue
+        if offset <= matched < offset + limit:
+            items.append(r)
+        matched += 1
+
+    nxt = offset + limit
+    return {
+        "section": section,
+        "total": len(rows),
+        "matched": matched,
+        "offset": offset,
+        "limit": limit,
+        "items": items,
+        "next_offset": nxt if nxt < matched else None,
+    }
+
+
+# =========================
+# Kaynaklar
+# =========================
+def _cached(analysis_id: int) -> Optional[dict]:
+    with _lock:
+        item = _decoded.get(analysis_id)
+        if item is None:
+            return None
+        _decoded.move_to_end(analysis_id)
+        return item[0]
+
+
+def _remember(analysis_id: int, mlog: dict, cost: int) -> None:
+    global _decoded_bytes
+    with _lock:
+        if analysis_id in _decoded:
+            return
+        _decoded[analysis_id] = (mlog, cost)
+        _decoded_bytes += cost
+        while _decoded_bytes > MAPPING_LOG_CACHE_MB * 1024 * 1024 and len(_decoded) > 1:
+            _, (_, c) = _decoded.popitem(last=False)
+            _decoded_bytes -= c
+
+
+def _blob_summary(data: bytes) -> dict:
+    # worker process'te çalışır
+    return summary(decode_mapping_log(data))
+
+
+def _blob_page(data: bytes, section: str, filters: Dict[str, Any]) -> dict:
+    # worker process'te çalışır
+    return page(decode_mapping_log(data), section, **filters)
+
+
+def _with_log(db: Session, analysis: Analysis, pool: ParsePool, fn: Callable[[dict], dict], blob_fn, *args: Any) -> dict:
+    """
+    fn(mlog): log cache'te ya da bütçeye sığıyorsa web process'inde; sığmıyorsa blob_fn(data, *args)
+    worker'da çalışır (PoolBusy çağırana gider). Analizler değişmediği için cache anahtarı id'dir.
+    """
+    mlog = _cached(analysis.id)
+    if mlog is not None:
+        return fn(mlog)
+    row = db.get(AnalysisMappingLog, analysis.id)
+    if row is None:
+        return fn(load_mapping_log(db, analysis))  # dönüştürülmemiş eski satır
+    cost = row.raw_size * DECODED_FACTOR
+    if cost > MAPPING_LOG_CACHE_MB * 1024 * 1024:
+        return pool.run(blob_fn, row.data, *args)
+    mlog = decode_mapping_log(row.data)
+    _remember(analysis.id, mlog, cost)
+    return fn(mlog)
+
+
+def analysis_summary(db: Session, analysis: Analysis, pool: ParsePool) -> dict:
+    return _with_log(db, analysis, pool, summary, _blob_summary)
+
+
+def analysis_page(db: Session, analysis: Analysis, pool: ParsePool, section: str, filters: Dict[str, Any]) -> dict:
+    return _with_log(db, analysis, pool, lambda mlog: page(mlog, section, **filters), _blob_page, section, filters)
+
+
+def mapping_log_cache_stats() -> dict:
+    with _lock:
+        return {"items": len(_decoded), "bytes": _decoded_bytes, "budget_mb": MAPPING_LOG_CACHE_MB}
+
+
+def upload_summary(xlsx_path: str) -> dict:
+    # worker process'te çalışır
+    from app.parse_cache import parse_financials_cached
+
+    fin = parse_financials_cached(xlsx_path)
+    return {**summary(fin.get("mapping_log") or {}), "year_bs": fin.get("year_bs"), "year_is": fin.get("year_is")}
+
+
+def upload_page(xlsx_path: str, section: str, filters: Dict[str, Any]) -> dict:
+    # worker process'te çalışır
+    from app.parse_cache import parse_financials_cached
+
+    fin = parse_financials_cached(xlsx_path)
+    return page(fin.get("mapping_log") or {}, section, **filters)
+
+
+def parse_filters(
+    unmapped: Optional[str] = None,
+    key: str = "",
+    code_from: str = "",
+    code_to: str = "",
+    q: str = "",
+    offset: int = 0,
+    limit: int = 100,
+) -> Dict[str, Any]:
+    return {
+        "unmapped": (unmapped or "").lower() in ("1", "true", "on", "yes"),
+        "key": key,
+        "code_from": code_from,
+        "code_to": code_to,
+        "q": q,
+        "offset": offset,
+        "limit": limit,
+    }
@@ -0,0 +1,94 @@
+# app/migrations.py
+"""
+Şema kurulumu: create_all yeni tabloları oluşturur ama mevcut tablolara kolon eklemez.
+Sonradan eklenen kolonlar (nullable ya da server_default'lu) ADDED_COLUMNS'ta listelenir ve
+eksikse ALTER TABLE ile eklenir. SQLite ve Postgres için ADD COLUMN yeterli; veri taşıma gerekiyorsa ilgili modül
+kendi migrate fonksiyonunu çalıştırır (ör. analysis_store.migrate_legacy).
+Aynı şekilde mevcut tablolara sonradan eklenen indeksler (modeldeki Index tanımları) eksikse
+oluşturulur.
+
+Şema app.main import'unda değil, uygulama startup'ında (AUTO_MIGRATE=1, varsayılan) ya da
+deploy adımında açıkça kurulur:
+    python -m app.migrations
+"""
+from __future__ import annotations
+
+import logging
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.config import DATA_DIR, UPLOAD_DIR
+from app.db import Base
+from app import models  # noqa: F401  (tabloları metadata'ya kaydeder)
+
+log = logging.getLogger(__name__)
+
+# tablo -> (kolon, ...): modelde tanımlı, eski veritabanlarında olmayabilir
+ADDED_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "uploads": ("period",),
+    "users": ("session_version",),
+    "analysis_jobs": ("owner", "lease_until"),
+}
+
+
+def ensure_schema(engine: Engine) -> None:
+    Base.metadata.create_all(bind=engine)
+
+    insp = inspect(engine)
+    for table_name, columns in ADDED_COLUMNS.items():
+        existing = {c["name"] for c in insp.get_columns(table_name)}
+        table = Base.metadata.tables[table_name]
+        for name in columns:
+            if name in existing:
+                continue
+            col = table.c[name]
+            ddl = f"ALTER TABLE {table_name} ADD COLUMN {name} {col.type.compile(dialect=engine.dialect)}"
+            if col.server_default is not None:
+                # NOT NULL kolon mevcut satırlar için varsayılanla eklenir
+                ddl += f" NOT NULL DEFAULT {col.server_default.arg}"
+            with engine.begin() as conn:
+                conn.execute(text(ddl))
+            log.info("migrations: %s.%s eklendi", table_name, name)
+
+    insp = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {ix["name"] for ix in insp.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            index.create(bind=engine)
+            log.info("migrations: %s indeksi oluşturuldu", index.name)
+
+
+def ensure_dirs() -> None:
+    """Veri dizinleri (SQLite dosyası, yüklemeler) instance'a özel diskte; her startup'ta."""
+    for path in (DATA_DIR, UPLOAD_DIR):
+        path.mkdir(parents=True, exist_ok=True)
+
+
+def migrate(engine: Optional[Engine] = None) -> None:
+    if engine is None:
+        from app.db import engine
+    ensure_dirs()
+    ensure_schema(engine)
+
+
+# =========================
+# CLI
+# =========================
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv not in ([], ["migrate"]):
+        print("Kullanım: python -m app.migrations [migrate]", file=sys.stderr)
+        return 2
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    migrate()
+    print("şema güncel")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, String, Text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db import Base
@@ -10,6 +10,8 @@ class User(Base):
     email = Column(String(255), unique=True, index=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     role = Column(String(50), default="admin", nullable=False)
+    # signed session'a gömülür; artırılınca kullanıcının tüm açık oturumları geçersiz olur
+    session_version = Column(Integer, default=1, server_default="1", nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
 
@@ -32,21 +34,177 @@ class Upload(Base):
     kind = Column(String(50), nullable=False)  # "excel"
     filename = Column(String(255), nullable=False)
     path = Column(String(500), nullable=False)
+    # mizanın ait olduğu ay (ayın 1'i); boşsa upload ayı kabul edilir
+    period = Column(Date, nullable=True)
 
     uploaded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     company = relationship("Company", back_populates="uploads")
 
+    # firma upload listesi ve "son excel" araması (listing.py) bu indeksleri kullanır
+    __table_args__ = (
+        Index("ix_uploads_company_uploaded", "company_id", "uploaded_at"),
+        Index("ix_uploads_company_kind_uploaded", "company_id", "kind", "uploaded_at"),
+    )
+
 
 class Analysis(Base):
     __tablename__ = "analyses"
     id = Column(Integer, primary_key=True)
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
 
-    # JSON string (basit)
+    # JSON string: sadece meta + bullets (metrikler ve mapping log ayrı tablolarda)
     result_json = Column(Text, nullable=False)
     pdf_path = Column(String(500), nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     company = relationship("Company", back_populates="analyses")
+    metrics = relationship("AnalysisMetrics", uselist=False, back_populates="analysis", cascade="all, delete-orphan")
+    mapping_log = relationship("AnalysisMappingLog", uselist=False, back_populates="analysis", cascade="all, delete-orphan")
+
+    __table_args__ = (Index("ix_analyses_company_created", "company_id", "created_at"),)
+
+
+class AnalysisMetrics(Base):
+    """analyze_financials()['metrics'] + meta; analiz başına tek satır, tipli kolonlar."""
+
+    __tablename__ = "analysis_metrics"
+    analysis_id = Column(Integer, ForeignKey("analyses.id"), primary_key=True)
+
+    year_bs = Column(Integer, nullable=True)
+    year_is = Column(Integer, nullable=True)
+
+    current_ratio = Column(Float, nullable=True)
+    quick_ratio = Column(Float, nullable=True)
+    hard_quick_ratio = Column(Float, nullable=True)
+    cash_ratio = Column(Float, nullable=True)
+    nwc = Column(Float, nullable=True)
+    current_assets = Column(Float, nullable=True)
+    current_liabilities = Column(Float, nullable=True)
+    cash = Column(Float, nullable=True)
+    trade_receivables = Column(Float, nullable=True)
+    inventories = Column(Float, nullable=True)
+    net_debt = Column(Float, nullable=True)
+    debt_to_equity = Column(Float, nullable=True)
+    interest_cover = Column(Float, nullable=True)
+
+    gross_margin = Column(Float, nullable=True)
+    gross_sales = Column(Float, nullable=True)
+    sales_discounts = Column(Float, nullable=True)
+    net_sales_calc = Column(Float, nullable=True)
+    gross_profit_calc = Column(Float, nullable=True)
+
+    revenue = Column(Float, nullable=True)
+    cogs = Column(Float, nullable=True)
+    equity = Column(Float, nullable=True)
+    total_assets = Column(Float, nullable=True)
+
+    analysis = relationship("Analysis", back_populates="metrics")
+
+
+class AnalysisMappingLog(Base):
+    """mapping_log (mizan satırları dahil) sıkıştırılmış JSON; sadece mapping-debug okur."""
+
+    __tablename__ = "analysis_mapping_logs"
+    analysis_id = Column(Integer, ForeignKey("analyses.id"), primary_key=True)
+
+    codec = Column(String(20), default="gzip-json", nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    raw_size = Column(Integer, nullable=False)
+
+    analysis = relationship("Analysis", back_populates="mapping_log")
+
+
+class CompanyMetricPoint(Base):
+    """
+    Firma metrik zaman serisi (uzun format): (firma, metrik, dönem) başına bir nokta.
+    delta/pct_change önceki noktaya göre; mean/min/max son 3 ve 12 ayın noktaları üzerinden.
+    """
+
+    __tablename__ = "company_metric_points"
+    company_id = Column(Integer, ForeignKey("companies.id"), primary_key=True)
+    metric = Column(String(40), primary_key=True)
+    period = Column(Date, primary_key=True)
+
+    analysis_id = Column(Integer, ForeignKey("analyses.id"), nullable=False)
+    value = Column(Float, nullable=True)
+
+    delta = Column(Float, nullable=True)
+    pct_change = Column(Float, nullable=True)
+    mean_3 = Column(Float, nullable=True)
+    mean_12 = Column(Float, nullable=True)
+    min_12 = Column(Float, nullable=True)
+    max_12 = Column(Float, nullable=True)
+
+    __table_args__ = (Index("ix_company_metric_points_company_period", "company_id", "period"),)
+
+
+class CompanyLatest(Base):
+    """
+    Firma başına son durum (en son dönemin analizi): risk seviyesi + özet metrikler.
+    Her firmanın bir satırı vardır (analiz yoksa level="NONE"); dashboard ve firma listesi buradan okur.
+    """
+
+    __tablename__ = "company_latest"
+    company_id = Column(Integer, ForeignKey("companies.id"), primary_key=True)
+    sector = Column(String(50), nullable=False)
+    level = Column(String(10), default="NONE", nullable=False)
+
+    analysis_id = Column(Integer, ForeignKey("analyses.id"), nullable=True)
+    period = Column(Date, nullable=True)
+    analyzed_at = Column(DateTime, nullable=True)
+
+    current_ratio = Column(Float, nullable=True, index=True)
+    quick_ratio = Column(Float, nullable=True)
+    cash_ratio = Column(Float, nullable=True)
+    nwc = Column(Float, nullable=True)
+    net_debt = Column(Float, nullable=True)
+    debt_to_equity = Column(Float, nullable=True, index=True)
+    interest_cover = Column(Float, nullable=True, index=True)
+    gross_margin = Column(Float, nullable=True)
+
+    __table_args__ = (
+        Index("ix_company_latest_level_company", "level", "company_id"),
+        Index("ix_company_latest_sector_level_company", "sector", "level", "company_id"),
+    )
+
+
+class PortfolioBucket(Base):
+    """(sektör, risk seviyesi) başına firma sayısı ve ortalama için metrik toplamları; artımlı güncellenir."""
+
+    __tablename__ = "portfolio_buckets"
+    sector = Column(String(50), primary_key=True)
+    level = Column(String(10), primary_key=True)
+    companies = Column(Integer, default=0, nullable=False)
+
+    sum_current_ratio = Column(Float, default=0.0, nullable=False)
+    n_current_ratio = Column(Integer, default=0, nullable=False)
+    sum_debt_to_equity = Column(Float, default=0.0, nullable=False)
+    n_debt_to_equity = Column(Integer, default=0, nullable=False)
+    sum_interest_cover = Column(Float, default=0.0, nullable=False)
+    n_interest_cover = Column(Integer, default=0, nullable=False)
+    sum_gross_margin = Column(Float, default=0.0, nullable=False)
+    n_gross_margin = Column(Integer, default=0, nullable=False)
+
+
+class AnalysisJob(Base):
+    __tablename__ = "analysis_jobs"
+    id = Column(Integer, primary_key=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False, index=True)
+    upload_id = Column(Integer, ForeignKey("uploads.id"), nullable=False)
+
+    # queued -> running -> done | failed
+    status = Column(String(20), default="queued", nullable=False, index=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    error = Column(Text, nullable=True)
+    analysis_id = Column(Integer, ForeignKey("analyses.id"), nullable=True)
+
+    # işi çalıştıran process ve sahipliğin geçerlilik süresi (app.jobs heartbeat'i uzatır);
+    # süresi dolan iş başka bir process tarafından devralınabilir
+    owner = Column(String(64), nullable=True)
+    lease_until = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
@@ -0,0 +1,122 @@
+# app/page_cache.py
+"""
+Public pazarlama sayfaları için tam sayfa render cache'i.
+
+/, /about, /team, /services, /contact, /why-cash ve /check'in tek dinamik girdisi yıl ve
+(check için) sektör. Sayfa bir kez render edilip gzip'li olarak saklanır; sonraki istekler
+Jinja'ya uğramadan cache'ten döner.
+
+- Anahtar: route + base_url (url_for mutlak URL üretir) + yıl + parametreler.
+- ETag gövdenin SHA-256'sından; If-None-Match eşleşirse 304 (gövde yok).
+- gzip kabul etmeyen istemciye gövde açılarak gönderilir (nadir).
+- Cache process belleğinde; deploy (restart) ile boşalır. Şablon/asset değişince ETag da değişir.
+  PAGE_CACHE_TTL_S sonunda girdiler yeniden render edilir.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from starlette.responses import Response
+
+PAGE_CACHE_TTL_S = float(os.getenv("PAGE_CACHE_TTL_S", "3600"))
+PAGE_CACHE_MAX_ITEMS = int(os.getenv("PAGE_CACHE_MAX_ITEMS", "256"))
+PAGE_CACHE_CONTROL = os.getenv("PAGE_CACHE_CONTROL", "public, no-cache")
+GZIP_LEVEL = 6
+
+
+class Page:
+    __slots__ = ("etag", "gz", "size", "expires")
+
+    def __init__(self, body: bytes):
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.gz = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+        self.size = len(body)
+        self.expires = time.monotonic() + PAGE_CACHE_TTL_S
+
+
+_lock = threading.Lock()
+_entries: "OrderedDict[Tuple, Page]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "not_modified": 0, "evictions": 0}
+
+
+def _key(route: str, base_url: str, params: Mapping[str, Any]) -> Tuple:
+    return (route, base_url, datetime.now().year, tuple(sorted(params.items())))
+
+
+def _get(key: Tuple) -> Optional[Page]:
+    with _lock:
+        page = _entries.get(key)
+        if page is None or page.expires < time.monotonic():
+            _stats["misses"] += 1
+            return None
+        _entries.move_to_end(key)
+        _stats["hits"] += 1
+        return page
+
+
+def _put(key: Tuple, page: Page) -> None:
+    with _lock:
+        _entries[key] = page
+        _entries.move_to_end(key)
+        while len(_entries) > PAGE_CACHE_MAX_ITEMS:
+            _entries.popitem(last=False)
+            _stats["evictions"] += 1
+
+
+def _accepts_gzip(headers: Mapping[str, str]) -> bool:
+    for token in headers.get("accept-encoding", "").split(","):
+        name, _, q = token.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return q.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _respond(page: Page, headers: Mapping[str, str]) -> Response:
+    gz = _accepts_gzip(headers)
+    # her temsil (gzip / düz) kendi ETag'ini taşır
+    etag = page.etag[:-1] + '-gz"' if gz else page.etag
+    out = {"ETag": etag, "Cache-Control": PAGE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+
+    inm = headers.get("if-none-match")
+    if inm and (inm.strip() == "*" or etag in [t.strip().removeprefix("W/") for t in inm.split(",")]):
+        with _lock:
+            _stats["not_modified"] += 1
+        return Response(status_code=304, headers=out)
+
+    if gz:
+        out["Content-Encoding"] = "gzip"
+        return Response(page.gz, media_type="text/html; charset=utf-8", headers=out)
+    return Response(gzip.decompress(page.gz), media_type="text/html; charset=utf-8", headers=out)
+
+
+def cached_page(route: str, request, render: Callable[[], str], **params: Any) -> Response:
+    """render() yalnızca cache'te yoksa çağrılır; params anahtarın parçasıdır."""
+    key = _key(route, str(request.base_url), params)
+    page = _get(key)
+    if page is None:
+        page = Page(render().encode("utf-8"))
+        _put(key, page)
+    return _respond(page, request.headers)
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
+
+
+def page_cache_stats() -> Dict[str, Any]:
+    with _lock:
+        return {
+            **_stats,
+            "items": len(_entries),
+            "bytes_gz": sum(len(p.gz) for p in _entries.values()),
+            "ttl_s": PAGE_CACHE_TTL_S,
+        }
@@ -0,0 +1,172 @@
+# app/parse_cache.py
+"""
+parse_financials_xlsx sonuçları için içerik-adresli disk cache.
+
+Anahtar = SHA-256(dosya baytları) + parser/mapping parmak izi. Parmak izi
+PARSER_VERSION, SYNONYMS, CANONICAL_KEYS ve CONTRA_3DIGIT'ten türetilir; bunlardan
+biri değişince eski girdiler erişilemez olur ve ilk yazımda silinir.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.analysis_engine import CONTRA_3DIGIT, PARSER_VERSION, parse_financials_xlsx
+from app.fin_mapping import CANONICAL_KEYS, SYNONYMS
+
+BASE_DIR = Path(__file__).resolve().parent
+CACHE_DIR = Path(os.getenv("PARSE_CACHE_DIR", str((BASE_DIR / ".." / "data" / "parse_cache").resolve())))
+
+ENABLED = os.getenv("PARSE_CACHE_ENABLED", "1") not in {"0", "false", "no"}
+MAX_BYTES = int(float(os.getenv("PARSE_CACHE_MAX_MB", "256")) * 1024 * 1024)
+MAX_AGE_S = int(float(os.getenv("PARSE_CACHE_MAX_AGE_DAYS", "30")) * 86400)
+
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def parser_fingerprint() -> str:
+    payload = json.dumps(
+        {
+            "parser": PARSER_VERSION,
+            "synonyms": SYNONYMS,
+            "canonical": CANONICAL_KEYS,
+            "contra": sorted(CONTRA_3DIGIT),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _entry_path(fingerprint: str, digest: str) -> Path:
+    return CACHE_DIR / fingerprint / f"{digest}.json.gz"
+
+
+def _restore_tuples(fin: dict) -> dict:
+    # JSON tuple'ları listeye çevirir; (isim, tutar) çiftlerini geri tuple yap
+    for k in ("balance_sheet_raw", "income_statement_raw"):
+        if isinstance(fin.get(k), list):
+            fin[k] = [tuple(x) for x in fin[k]]
+    return fin
+
+
+def _load(path: Path) -> Optional[dict]:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            fin = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        os.utime(path)  # LRU tahliyesi için son kullanım
+    except OSError:
+        pass
+    return _restore_tuples(fin)
+
+
+def _store(path: Path, fin: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+        json.dump(fin, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def evict(fingerprint: Optional[str] = None) -> int:
+    """
+    - Güncel parmak izine ait olmayan klasörleri siler (SYNONYMS/CONTRA değişimi).
+    - MAX_AGE'den eski girdileri siler.
+    - Toplam boyut MAX_BYTES'ı aşarsa en eski kullanılanlardan başlayarak siler.
+    """
+    if not CACHE_DIR.exists():
+        return 0
+    fingerprint = fingerprint or parser_fingerprint()
+    removed = 0
+
+    for d in CACHE_DIR.iterdir():
+        if d.is_dir() and d.name != fingerprint:
+            shutil.rmtree(d, ignore_errors=True)
+            removed += 1
+
+    cur = CACHE_DIR / fingerprint
+    if not cur.exists():
+        return removed
+
+    now = time.time()
+    entries = []
+    for p in cur.glob("*.json.gz"):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        if now - st.st_mtime > MAX_AGE_S:
+            p.unlink(missing_ok=True)
+            removed += 1
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+
+    total = sum(sz for _, sz, _ in entries)
+    for _mt, sz, p in sorted(entries, key=lambda x: x[0]):
+        if total <= MAX_BYTES:
+            break
+        p.unlink(missing_ok=True)
+        total -= sz
+        removed += 1
+
+    _stats["evictions"] += removed
+    return removed
+
+
+def parse_financials_cached(xlsx_path: str) -> dict:
+    """parse_financials_xlsx ile aynı dict; aynı dosya daha önce parse edildiyse diskten döner."""
+    if not ENABLED:
+        return parse_financials_xlsx(xlsx_path)
+
+    fingerprint = parser_fingerprint()
+    path = _entry_path(fingerprint, file_sha256(xlsx_path))
+
+    if path.exists():
+        fin = _load(path)
+        if fin is not None:
+            _stats["hits"] += 1
+            return fin
+
+    _stats["misses"] += 1
+    fin = parse_financials_xlsx(xlsx_path)
+    try:
+        _store(path, fin)
+        evict(fingerprint)
+    except OSError:
+        # cache yazılamıyorsa analiz yine de devam etsin
+        pass
+    return fin
+
+
+def parse_cache_counters() -> Dict[str, int]:
+    """Toplanabilir ham sayaçlar (worker'lardan parent'a görev başı fark olarak taşınır)."""
+    return dict(_stats)
+
+
+def parse_cache_stats(counters: Optional[Dict[str, int]] = None) -> Dict[str, float]:
+    c = counters if counters is not None else _stats
+    lookups = c.get("hits", 0) + c.get("misses", 0)
+    return {
+        "hits": c.get("hits", 0),
+        "misses": c.get("misses", 0),
+        "evictions": c.get("evictions", 0),
+        "hit_rate": (c.get("hits", 0) / lookups) if lookups else 0.0,
+        "enabled": ENABLED,
+    }
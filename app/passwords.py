@@ -0,0 +1,195 @@
+# app/passwords.py
+"""
+Şifre hash'leme: scrypt (varsayılan) veya PBKDF2-SHA256, ayarlanabilir maliyetle.
+
+Saklanan biçimler:
+    scrypt$<n>$<r>$<p>$<salt b64>$<hash b64>
+    pbkdf2_sha256$<iterasyon>$<salt b64>$<hash b64>
+    <64 hex>                      eski tek SHA-256 (pepper + şifre); girişte yeniden hash'lenir
+
+KDF girdisi HMAC-SHA256(PASSWORD_PEPPER, şifre); pepper DB ile birlikte sızmaz.
+
+- PASSWORD_HASH_ALGO: scrypt | pbkdf2_sha256
+- PASSWORD_SCRYPT_N / _R / _P: scrypt maliyeti (bellek ~ 128 * n * r bayt)
+- PASSWORD_PBKDF2_ITERATIONS: PBKDF2 iterasyon sayısı
+- PASSWORD_WORKERS: doğrulama thread sayısı (hashlib KDF'leri GIL'i bırakır)
+- PASSWORD_QUEUE_DEPTH: aynı anda bekleyen/çalışan en fazla doğrulama; dolunca PasswordBusy
+
+Ayarlar değişince eski parametreli hash'ler needs_rehash() ile bir sonraki girişte güncellenir.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+PASSWORD_HASH_ALGO = os.getenv("PASSWORD_HASH_ALGO", "scrypt")
+PASSWORD_SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 14)))
+PASSWORD_SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+PASSWORD_SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "600000"))
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", "2"))
+PASSWORD_QUEUE_DEPTH = int(os.getenv("PASSWORD_QUEUE_DEPTH", "16"))
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+def _pepper() -> bytes:
+    return os.getenv("PASSWORD_PEPPER", "CHANGE_ME_PEPPER").encode("utf-8")
+
+
+def _b64(b: bytes) -> str:
+    return base64.b64encode(b).decode("ascii").rstrip("=")
+
+
+def _unb64(s: str) -> bytes:
+    return base64.b64decode(s + "=" * (-len(s) % 4))
+
+
+# =========================
+# KDF'ler
+# =========================
+def _kdf_input(password: str) -> bytes:
+    return hmac.new(_pepper(), password.encode("utf-8"), hashlib.sha256).digest()
+
+
+def _scrypt(secret: bytes, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(secret, salt=salt, n=n, r=r, p=p, maxmem=2 * 128 * n * r * p + 1024 * 1024, dklen=KEY_BYTES)
+
+
+def _pbkdf2(secret: bytes, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", secret, salt, iterations, dklen=KEY_BYTES)
+
+
+def _legacy(password: str) -> str:
+    return hashlib.sha256((_pepper().decode("utf-8") + password).encode("utf-8")).hexdigest()
+
+
+def hash_password(password: str, algo: Optional[str] = None) -> str:
+    algo = algo or PASSWORD_HASH_ALGO
+    salt = os.urandom(SALT_BYTES)
+    secret = _kdf_input(password)
+    if algo == "scrypt":
+        n, r, p = PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P
+        return f"scrypt${n}${r}${p}${_b64(salt)}${_b64(_scrypt(secret, salt, n, r, p))}"
+    if algo == "pbkdf2_sha256":
+        it = PASSWORD_PBKDF2_ITERATIONS
+        return f"pbkdf2_sha256${it}${_b64(salt)}${_b64(_pbkdf2(secret, salt, it))}"
+    raise ValueError(f"Bilinmeyen PASSWORD_HASH_ALGO: {algo}")
+
+
+def verify_password(password: str, stored: str) -> bool:
+    parts = (stored or "").split("$")
+    try:
+        if parts[0] == "scrypt" and len(parts) == 6:
+            n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+            got = _scrypt(_kdf_input(password), _unb64(parts[4]), n, r, p)
+            return hmac.compare_digest(got, _unb64(parts[5]))
+        if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            got = _pbkdf2(_kdf_input(password), _unb64(parts[2]), int(parts[1]))
+            return hmac.compare_digest(got, _unb64(parts[3]))
+    except (ValueError, TypeError):
+        return False
+    if len(parts) == 1 and len(stored) == 64:
+        return hmac.compare_digest(_legacy(password), stored)
+    return False
+
+
+def needs_rehash(stored: str) -> bool:
+    """Eski SHA-256 ya da güncel ayarlardan farklı algoritma/maliyet."""
+    parts = (stored or "").split("$")
+    if PASSWORD_HASH_ALGO == "scrypt":
+        return parts[:4] != ["scrypt", str(PASSWORD_SCRYPT_N), str(PASSWORD_SCRYPT_R), str(PASSWORD_SCRYPT_P)]
+    return parts[:2] != ["pbkdf2_sha256", str(PASSWORD_PBKDF2_ITERATIONS)]
+
+
+# kullanıcı bulunamadığında da aynı maliyette doğrulama yapılır (e-posta varlığı süreden anlaşılmasın)
+_dummy_hash: Optional[str] = None
+
+
+def dummy_hash() -> str:
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password(base64.b64encode(os.urandom(12)).decode("ascii"))
+    return _dummy_hash
+
+
+# =========================
+# Sınırlı doğrulama havuzu
+# =========================
+class PasswordBusy(RuntimeError):
+    """Doğrulama kuyruğu dolu; giriş isteği reddedilir."""
+
+
+class _HashPool:
+    def __init__(self, workers: int, queue_depth: int):
+        self.workers = max(1, workers)
+        self.queue_depth = max(1, queue_depth)
+        self._slots = threading.BoundedSemaphore(self.queue_depth)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {"verified": 0, "hashed": 0, "rejected_busy": 0}
+        self._in_flight = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pwhash")
+            return self._executor
+
+    def submit(self, fn: Callable, *args, stat: str) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["rejected_busy"] += 1
+            raise PasswordBusy("Çok fazla eşzamanlı giriş denemesi; biraz sonra tekrar deneyin.")
+        with self._lock:
+            self._in_flight += 1
+        try:
+            fut = self._get_executor().submit(fn, *args)
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+            raise
+
+        def _done(_f: Future) -> None:
+            with self._lock:
+                self._in_flight -= 1
+                self._stats[stat] += 1
+            self._slots.release()
+
+        fut.add_done_callback(_done)
+        return fut
+
+    async def verify(self, password: str, stored: str) -> bool:
+        return await asyncio.wrap_future(self.submit(verify_password, password, stored, stat="verified"))
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self.submit(hash_password, password, stat="hashed"))
+
+    async def dummy_hash(self) -> str:
+        """dummy_hash(); ilk hesaplama da havuzda yapılır (event loop KDF ile bloklanmaz)."""
+        global _dummy_hash
+        if _dummy_hash is None:
+            _dummy_hash = await self.hash(base64.b64encode(os.urandom(12)).decode("ascii"))
+        return _dummy_hash
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "in_flight": self._in_flight, "workers": self.workers, "queue_depth": self.queue_depth,
+                    "algo": PASSWORD_HASH_ALGO}
+
+    def shutdown(self) -> None:
+        with self._lock:
+            ex, self._executor = self._executor, None
+        if ex is not None:
+            ex.shutdown(wait=False, cancel_futures=True)
+
+
+pool = _HashPool(PASSWORD_WORKERS, PASSWORD_QUEUE_DEPTH)
@@ -0,0 +1,140 @@
+# app/pdf_files.py
+"""
+Saklı analiz PDF'lerinin sunulması.
+
+- Dosya FileResponse ile gönderilir: belleğe okunmaz; ASGI sunucusu destekliyorsa
+  (http.response.pathsend) sendfile ile sıfır kopya, değilse 64 KB'lık parçalar halinde.
+  Byte range / If-Range isteklerini FileResponse karşılar (206).
+- ETag güçlüdür: analiz id (değişmez) + dosya içeriğinin SHA-256'sı. Hash dosya başına bir kez
+  hesaplanır ve (yol, mtime, boyut) ile cache'lenir; toplu yeniden üretim dosyayı değiştirince
+  yeni hash'e düşülür.
+- If-None-Match / If-Modified-Since eşleşirse 304 döner (gövde yok).
+- Dosyası olmayan analizin PDF'i bir kez üretilip kalıcı yazılır; aynı analiz için eşzamanlı
+  istekler tek üretimi bekler. Üretim hatası PdfRenderError olarak döner (PoolBusy olduğu gibi).
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.bulk_pdf import render_analysis_pdf
+from app.models import Analysis, Company
+from app.workers import ParsePool, PoolBusy
+
+PDF_ETAG_CACHE_ITEMS = int(os.getenv("PDF_ETAG_CACHE_ITEMS", "4096"))
+PDF_CACHE_CONTROL = "private, no-cache"
+
+_lock = threading.Lock()
+_hashes: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_render_locks: Dict[int, threading.Lock] = {}
+
+log = logging.getLogger(__name__)
+
+
+class PdfRenderError(RuntimeError):
+    """Eksik PDF üretilemedi (worker / render / kayıt hatası)."""
+
+
+# =========================
+# ETag / koşullu istek
+# =========================
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def etag_for(analysis_id: int, path: str, st: os.stat_result) -> str:
+    key = (path, st.st_mtime_ns, st.st_size)
+    with _lock:
+        digest = _hashes.get(key)
+        if digest is not None:
+            _hashes.move_to_end(key)
+    if digest is None:
+        digest = _file_sha256(path)
+        with _lock:
+            _hashes[key] = digest
+            while len(_hashes) > PDF_ETAG_CACHE_ITEMS:
+                _hashes.popitem(last=False)
+    return f'"a{analysis_id}-{digest[:32]}"'
+
+
+def cache_headers(etag: str, st: os.stat_result) -> Dict[str, str]:
+    return {
+        "ETag": etag,
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        "Cache-Control": PDF_CACHE_CONTROL,
+    }
+
+
+def not_modified(headers: Mapping[str, str], etag: str, st: os.stat_result) -> bool:
+    """RFC 9110: If-None-Match varsa If-Modified-Since yok sayılır."""
+    inm = headers.get("if-none-match")
+    if inm is not None:
+        tags = [t.strip() for t in inm.split(",")]
+        # GET için zayıf karşılaştırma: W/ öneki yok sayılır
+        return "*" in tags or etag in (t[2:] if t.startswith("W/") else t for t in tags)
+    ims = headers.get("if-modified-since")
+    if ims:
+        try:
+            return int(st.st_mtime) <= parsedate_to_datetime(ims).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+# =========================
+# Eksik PDF
+# =========================
+def _render_lock(analysis_id: int) -> threading.Lock:
+    with _lock:
+        return _render_locks.setdefault(analysis_id, threading.Lock())
+
+
+def ensure_pdf(db: Session, analysis: Analysis, pool: ParsePool) -> str:
+    """Analizin PDF yolunu döner; dosya yoksa worker'da üretir, yazar ve pdf_path'i kaydeder."""
+    if analysis.pdf_path and os.path.isfile(analysis.pdf_path):
+        return analysis.pdf_path
+
+    lock = _render_lock(analysis.id)
+    try:
+        with lock:
+            db.refresh(analysis)
+            if analysis.pdf_path and os.path.isfile(analysis.pdf_path):
+                return analysis.pdf_path
+            company = db.get(Company, analysis.company_id)
+            try:
+                _aid, path, _size = pool.run(
+                    render_analysis_pdf, analysis.id, company.name, company.sector, analysis.result_json
+                )
+                analysis.pdf_path = path
+                db.commit()
+            except PoolBusy:
+                raise
+            except Exception as e:
+                db.rollback()
+                log.exception("analiz %s: PDF üretilemedi", analysis.id)
+                raise PdfRenderError(f"PDF üretilemedi: {e}") from e
+        return path
+    finally:
+        with _lock:
+            if _render_locks.get(analysis.id) is lock and not lock.locked():
+                _render_locks.pop(analysis.id, None)
+
+
+def stat_pdf(path: str) -> Optional[os.stat_result]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if Path(path).is_file() else None
@@ -1,56 +1,44 @@
 from io import BytesIO
 from datetime import datetime
-from pathlib import Path
 
 from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
 from reportlab.lib import colors
 from reportlab.lib.units import mm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 
+from app.pdf_template import (
+    ACCENT,
+    CARD,
+    MUTED,
+    TEXT,
+    ReportCanvas,
+    draw_logo,
+    fill_background,
+)
+
+# Header yerleşimi (statik header formu ve dinamik satırlar ortak kullanır)
+LOGO_SIZE = 18 * mm
+LOGO_X = 6 * mm
+TITLE_X = LOGO_X + LOGO_SIZE + 6 * mm
+
+
+def _page_chrome(c, width, height):
+    # her sayfa: arka plan + footer
+    fill_background(c, width, height)
+    c.setFillColor(MUTED)
+    c.setFont("DejaVu", 9.5)
+    c.drawString(18 * mm, 12 * mm, "cashguardtr.com • İletişim: info@cashguardtr.com")
 
-BASE_DIR = Path(__file__).resolve().parent
-FONT_DIR = BASE_DIR / "assets" / "fonts"
-ICON_PATH = BASE_DIR / "static" / "icon-512.png"
 
-# Web sitenin koyu teması
-BG = colors.HexColor("#0b1220")
-CARD = colors.HexColor("#0f1b33")
-TEXT = colors.HexColor("#e6edf7")
-MUTED = colors.HexColor("#a6b3cc")
-ACCENT = colors.HexColor("#7c3aed")
+def _first_page_header(c, width, height):
+    draw_logo(c, LOGO_X, height - 6 * mm - LOGO_SIZE, LOGO_SIZE)
 
+    c.setFillColor(TEXT)
+    c.setFont("DejaVu-Bold", 18)
+    c.drawString(TITLE_X, height - 10 * mm, "CashGuard")
 
-def _register_fonts():
-    """
-    Türkçe karakterler için Unicode font kaydı.
-    Render deploy'da font yoksa net hata verir.
-    """
-    try:
-        pdfmetrics.getFont("DejaVu")
-        return
-    except KeyError:
-        pass
-
-    regular = FONT_DIR / "DejaVuSans.ttf"
-    bold = FONT_DIR / "DejaVuSans-Bold.ttf"
-
-    if not regular.exists():
-        raise FileNotFoundError(
-            f"Font not found: {regular}\n"
-            f"Beklenen klasör: {FONT_DIR}\n"
-            "Çözüm: DejaVuSans.ttf (ve tercihen DejaVuSans-Bold.ttf) dosyalarını "
-            "repo içinde app/assets/fonts/ altına koy ve push et."
-        )
-
-    pdfmetrics.registerFont(TTFont("DejaVu", str(regular)))
-
-    # Bold yoksa regular ile devam
-    if bold.exists():
-        pdfmetrics.registerFont(TTFont("DejaVu-Bold", str(bold)))
-    else:
-        pdfmetrics.registerFont(TTFont("DejaVu-Bold", str(regular)))
+    c.setFont("DejaVu", 11)
+    c.setFillColor(MUTED)
+    c.drawString(TITLE_X, height - 16 * mm, "Nakit Risk Taraması Raporu")
 
 
 def _wrap_text(c, text, max_width, font_name, font_size):
@@ -76,51 +64,20 @@ def build_pdf_report(payload: dict) -> bytes:
     score, level, messages (list[str]) and input fields.
     Optional: company, sector
     """
-    _register_fonts()
-
     buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=A4)
+    # arka plan, logo, başlık ve footer şablon formlarından gelir; burada sadece dinamik içerik
+    c = ReportCanvas(buf, page=_page_chrome, first_page=_first_page_header)
     width, height = A4
 
-    # Background
-    c.setFillColor(BG)
-    c.rect(0, 0, width, height, fill=1, stroke=0)
-
     margin_x = 18 * mm
     top_y = height - 18 * mm
 
-    # Header
-    logo_size = 18 * mm
-    logo_x = 6 * mm
-    logo_y = height - 6 * mm - logo_size
-
-    if ICON_PATH.exists():
-        c.drawImage(
-            str(ICON_PATH),
-            logo_x,
-            logo_y,
-            width=logo_size,
-            height=logo_size,
-            mask="auto",
-            preserveAspectRatio=True,
-        )
-
-    title_x = logo_x + logo_size + 6 * mm
-
-    c.setFillColor(TEXT)
-    c.setFont("DejaVu-Bold", 18)
-    c.drawString(title_x, height - 10 * mm, "CashGuard")
-
-    c.setFont("DejaVu", 11)
-    c.setFillColor(MUTED)
-    c.drawString(title_x, height - 16 * mm, "Nakit Risk Taraması Raporu")
-
     # Sector (optional)
     sector = (payload.get("sector") or "").strip()
     if sector:
         c.setFont("DejaVu", 10.5)
         c.setFillColor(MUTED)
-        c.drawString(title_x, height - 21.5 * mm, f"Sektör: {sector}")
+        c.drawString(TITLE_X, height - 21.5 * mm, f"Sektör: {sector}")
 
     c.setFont("DejaVu", 10)
     c.setFillColor(MUTED)
@@ -229,9 +186,6 @@ def build_pdf_report(payload: dict) -> bytes:
     # Messages
     if y < 70 * mm:
         c.showPage()
-        width, height = A4
-        c.setFillColor(BG)
-        c.rect(0, 0, width, height, fill=1, stroke=0)
         y = height - 18 * mm
 
     c.setFillColor(TEXT)
@@ -255,8 +209,6 @@ def build_pdf_report(payload: dict) -> bytes:
         needed_h = (len(lines) * line_h) + (3.0 * mm)
         if y - needed_h < 16 * mm:
             c.showPage()
-            c.setFillColor(BG)
-            c.rect(0, 0, width, height, fill=1, stroke=0)
             y = height - 18 * mm
             c.setFillColor(TEXT)
             c.setFont("DejaVu-Bold", 13)
@@ -273,11 +225,6 @@ def build_pdf_report(payload: dict) -> bytes:
             y -= line_h
         y -= 2.2 * mm
 
-    # Footer
-    c.setFillColor(MUTED)
-    c.setFont("DejaVu", 9.5)
-    c.drawString(margin_x, 12 * mm, "cashguardtr.com • İletişim: info@cashguardtr.com")
-
     c.save()
     pdf_bytes = buf.getvalue()
     buf.close()
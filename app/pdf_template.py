@@ -0,0 +1,145 @@
+# app/pdf_template.py
+"""
+PDF raporları için ortak şablon katmanı (public rapor + admin rapor).
+
+- Fontlar process başına bir kez kaydedilir (register_fonts); worker'lar warm_up() ile ısıtır.
+- Logo PNG'si process başına bir kez okunup çözülür (paylaşılan ImageReader); dokümana
+  canvas.drawImage ile ilk sayfa formunun içinde bir kez eklenir.
+- Statik sayfa iskeleti (arka plan, footer; ilk sayfada header/logo) doküman başına bir kez
+  form XObject olarak yazılır, her sayfada sadece "/Form Do" çağrılır. Render kodu yalnızca
+  dinamik metni çizer.
+
+DejaVu alt kümesi (subset) doküman başına üretilir: içerik kullanılan glyph'lere bağlı.
+"""
+from __future__ import annotations
+
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Optional
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+BASE_DIR = Path(__file__).resolve().parent
+FONT_DIR = BASE_DIR / "assets" / "fonts"
+FONT_REGULAR = FONT_DIR / "DejaVuSans.ttf"
+FONT_BOLD = FONT_DIR / "DejaVuSans-Bold.ttf"
+ICON_PATH = BASE_DIR / "static" / "icon-512.png"
+
+# Web sitenin koyu teması
+BG = colors.HexColor("#0b1220")
+CARD = colors.HexColor("#0f1b33")
+TEXT = colors.HexColor("#e6edf7")
+MUTED = colors.HexColor("#a6b3cc")
+ACCENT = colors.HexColor("#7c3aed")
+
+_font_lock = threading.Lock()
+_fonts_ready = False
+
+
+# ===============================
+# Fonts
+# ===============================
+def register_fonts() -> None:
+    """
+    Türkçe karakterler için Unicode font kaydı (DejaVu / DejaVu-Bold).
+    Render deploy'da font yoksa net hata verir.
+    """
+    global _fonts_ready
+    if _fonts_ready:
+        return
+    with _font_lock:
+        if _fonts_ready:
+            return
+        try:
+            pdfmetrics.getFont("DejaVu")
+            pdfmetrics.getFont("DejaVu-Bold")
+        except KeyError:
+            if not FONT_REGULAR.exists():
+                raise FileNotFoundError(
+                    f"Font not found: {FONT_REGULAR}\n"
+                    f"Beklenen klasör: {FONT_DIR}\n"
+                    "Çözüm: DejaVuSans.ttf (ve tercihen DejaVuSans-Bold.ttf) dosyalarını "
+                    "repo içinde app/assets/fonts/ altına koy ve push et."
+                )
+            pdfmetrics.registerFont(TTFont("DejaVu", str(FONT_REGULAR)))
+            # Bold yoksa regular ile devam
+            pdfmetrics.registerFont(TTFont("DejaVu-Bold", str(FONT_BOLD if FONT_BOLD.exists() else FONT_REGULAR)))
+        _fonts_ready = True
+
+
+# ===============================
+# Logo (process başına bir kez çözülür)
+# ===============================
+_LOGO_MASK = "auto"
+
+
+@lru_cache(maxsize=1)
+def _logo() -> Optional[ImageReader]:
+    if not ICON_PATH.exists():
+        return None
+    img = ImageReader(str(ICON_PATH))
+    img.getRGBData()  # çözümü şimdi yap; sonraki dokümanlar hazır veriyi kullanır
+    return img
+
+
+def draw_logo(c: canvas.Canvas, x: float, y: float, size: float) -> None:
+    img = _logo()
+    if img is not None:
+        c.drawImage(img, x, y, width=size, height=size, mask=_LOGO_MASK, preserveAspectRatio=True)
+
+
+def warm_up() -> None:
+    """Fontları kaydeder ve logoyu önceden çözer (worker initializer'ı çağırır)."""
+    register_fonts()
+    _logo()
+
+
+# ===============================
+# Canvas
+# ===============================
+Painter = Callable[[canvas.Canvas, float, float], None]
+
+
+class ReportCanvas(canvas.Canvas):
+    """
+    A4 canvas; sayfa iskeleti form XObject olarak bir kez tanımlanır.
+
+    page: her sayfaya (arka plan, footer), first_page: sadece ilk sayfaya (header, logo)
+    çizilecek statik içerik. Her ikisi (canvas, genişlik, yükseklik) alır.
+    """
+
+    PAGE_FORM = "cgPage"
+    FIRST_PAGE_FORM = "cgFirstPage"
+
+    def __init__(self, buf, *, page: Painter, first_page: Optional[Painter] = None):
+        register_fonts()
+        super().__init__(buf, pagesize=A4)
+        w, h = A4
+
+        self.beginForm(self.PAGE_FORM)
+        page(self, w, h)
+        self.endForm()
+        self.doForm(self.PAGE_FORM)
+
+        if first_page is not None:
+            self.beginForm(self.FIRST_PAGE_FORM)
+            first_page(self, w, h)
+            self.endForm()
+            self.doForm(self.FIRST_PAGE_FORM)
+
+    def showPage(self):
+        super().showPage()
+        # save() son sayfayı kapatırken de buraya gelir; o zaman eklenen Do hiç yazılmaz
+        self.doForm(self.PAGE_FORM)
+
+
+def fill_background(c: canvas.Canvas, w: float, h: float) -> None:
+    c.setFillColor(BG)
+    c.rect(0, 0, w, h, fill=1, stroke=0)
+
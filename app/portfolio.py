@@ -0,0 +1,326 @@
+# app/portfolio.py
+"""
+Portföy dashboard'u için artımlı tutulan özetler.
+
+- company_latest: firma başına en son dönemin analizi (risk seviyesi + özet metrikler).
+  Firma oluşturulunca level="NONE" satırı açılır, analiz yazılınca güncellenir.
+- portfolio_buckets: (sektör, seviye) başına firma sayısı + ortalama için metrik toplamları.
+  Bir firmanın son durumu değişince eski kovasından çıkarılıp yenisine eklenir (UPDATE n = n + d).
+  Eşzamanlı analizler (runner thread'leri / process'ler) için company_latest satırı önceki
+  analysis_id'ye koşullu UPDATE ile değiştirilir; satırı kazanan işlem kovaları günceller,
+  kaybeden yeniden okuyup tekrar dener. Böylece aynı eski kova iki kez düşülmez.
+
+Dashboard yalnızca bu iki tabloyu okur (kovalar + indeksli "en kötü N"); analyses taranmaz.
+
+Yeniden kurulum:
+    python -m app.portfolio rebuild
+"""
+from __future__ import annotations
+
+import sys
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import SECTOR_LABELS
+from app.db import SessionLocal
+from app.models import Analysis, AnalysisJob, AnalysisMetrics, Company, CompanyLatest, PortfolioBucket, Upload
+from app.timeseries import month_start
+
+LEVELS = ("RED", "YELLOW", "GREEN", "UNKNOWN", "NONE")
+LEVEL_LABELS = {
+    "RED": "Yüksek risk",
+    "YELLOW": "Orta risk",
+    "GREEN": "Düşük risk",
+    "UNKNOWN": "Hesaplanamadı",
+    "NONE": "Analiz yok",
+}
+
+LATEST_METRICS = (
+    "current_ratio", "quick_ratio", "cash_ratio", "nwc", "net_debt",
+    "debt_to_equity", "interest_cover", "gross_margin",
+)
+AVG_METRICS = ("current_ratio", "debt_to_equity", "interest_cover", "gross_margin")
+
+# (metrik, karşılaştırma, eşik): ilk eşleşen kural seviyeyi belirler (RED önce)
+LEVEL_RULES: Tuple[Tuple[str, Tuple[Tuple[str, str, float], ...]], ...] = (
+    ("RED", (("current_ratio", "<", 1.0), ("interest_cover", "<", 1.0), ("debt_to_equity", ">", 3.0))),
+    ("YELLOW", (("current_ratio", "<", 1.5), ("quick_ratio", "<", 1.0), ("interest_cover", "<", 2.0),
+                ("debt_to_equity", ">", 1.5))),
+)
+
+# dashboard "en kötü N" listeleri: (metrik, başlık, artan mı)
+WORST_LISTS = (
+    ("current_ratio", "En düşük cari oran", True),
+    ("interest_cover", "En düşük faiz karşılama", True),
+    ("debt_to_equity", "En yüksek borç/özkaynak", False),
+)
+WORST_N = 10
+
+APPLY_RETRIES = 5
+
+
+# =========================
+# Seviye
+# =========================
+def risk_level(metrics: Dict[str, Optional[float]]) -> str:
+    if metrics.get("current_ratio") is None:
+        return "UNKNOWN"
+    for level, rules in LEVEL_RULES:
+        for key, op, limit in rules:
+            v = metrics.get(key)
+            if v is not None and (v < limit if op == "<" else v > limit):
+                return level
+    return "GREEN"
+
+
+# =========================
+# Kovalar
+# =========================
+def _bucket_delta(metrics: Dict[str, Optional[float]], sign: int) -> dict:
+    d = {"companies": sign}
+    for m in AVG_METRICS:
+        v = metrics.get(m)
+        d[f"sum_{m}"] = sign * v if v is not None else 0.0
+        d[f"n_{m}"] = sign if v is not None else 0
+    return d
+
+
+def _bucket_add(db: Session, sector: str, level: str, metrics: Dict[str, Optional[float]], sign: int) -> None:
+    d = _bucket_delta(metrics, sign)
+    values = {getattr(PortfolioBucket, k): getattr(PortfolioBucket, k) + v for k, v in d.items()}
+    res = db.execute(
+        update(PortfolioBucket)
+        .where(PortfolioBucket.sector == sector, PortfolioBucket.level == level)
+        .values(values)
+    )
+    if not res.rowcount:
+        # rebuild() bilinen sektör x seviye ızgarasını açar; buraya sadece yeni bir sektörle gelinir
+        db.add(PortfolioBucket(sector=sector, level=level, **d))
+        db.flush()
+
+
+def _metrics_of(row: CompanyLatest) -> Dict[str, Optional[float]]:
+    return {m: getattr(row, m) for m in LATEST_METRICS}
+
+
+# =========================
+# Yazma
+# =========================
+def register_company(db: Session, company: Company) -> None:
+    """Yeni firma: NONE kovasına ekler (commit çağırana ait)."""
+    db.add(CompanyLatest(company_id=company.id, sector=company.sector, level="NONE"))
+    _bucket_add(db, company.sector, "NONE", {}, +1)
+
+
+def apply_analysis(
+    db: Session,
+    company: Company,
+    analysis_id: int,
+    period: date,
+    analyzed_at: datetime,
+    metrics: Dict[str, Optional[float]],
+) -> bool:
+    """
+    Analiz firmanın en son dönemine aitse company_latest + kovaları günceller (commit eder).
+    Daha eski bir dönemin analiziyse değişiklik yapmaz; False döner.
+    """
+    latest = {m: metrics.get(m) for m in LATEST_METRICS}
+    level = risk_level(metrics)
+    for _ in range(APPLY_RETRIES):
+        row = db.get(CompanyLatest, company.id, populate_existing=True)
+        if row is None:
+            try:
+                register_company(db, company)
+                db.flush()
+            except IntegrityError:
+                db.rollback()  # başka bir işlem aynı anda açtı
+                continue
+            row = db.get(CompanyLatest, company.id)
+        if row.period is not None and (period, analysis_id) < (row.period, row.analysis_id or 0):
+            return False
+
+        old_level, old_metrics, old_aid = row.level, _metrics_of(row), row.analysis_id
+        same = CompanyLatest.analysis_id.is_(None) if old_aid is None else CompanyLatest.analysis_id == old_aid
+        res = db.execute(
+            update(CompanyLatest)
+            .where(CompanyLatest.company_id == company.id, same)
+            .values(level=level, analysis_id=analysis_id, period=period, analyzed_at=analyzed_at, **latest)
+            .execution_options(synchronize_session=False)
+        )
+        if res.rowcount != 1:
+            db.rollback()  # satır okunduktan sonra değişti: yeniden oku
+            continue
+
+        _bucket_add(db, row.sector, old_level, old_metrics, -1)
+        _bucket_add(db, row.sector, level, latest, +1)
+        db.commit()
+        return True
+    raise RuntimeError(f"company_latest güncellenemedi (firma {company.id}): eşzamanlı güncelleme")
+
+
+def rebuild() -> int:
+    """company_latest + portfolio_buckets'ı analysis_metrics'ten baştan kurar; firma sayısını döner."""
+    db = SessionLocal()
+    try:
+        db.execute(delete(CompanyLatest))
+        db.execute(delete(PortfolioBucket))
+
+        latest: Dict[int, tuple] = {}
+        q = (
+            select(Analysis.company_id, Analysis.id, Analysis.created_at, Upload.period, Upload.uploaded_at,
+                   *[getattr(AnalysisMetrics, m) for m in LATEST_METRICS])
+            .join(AnalysisMetrics, AnalysisMetrics.analysis_id == Analysis.id)
+            .outerjoin(AnalysisJob, AnalysisJob.analysis_id == Analysis.id)
+            .outerjoin(Upload, Upload.id == AnalysisJob.upload_id)
+        )
+        for r in db.execute(q):
+            period = r[3] or month_start(r[4] or r[2])
+            key = (period, r[1])
+            cur = latest.get(r[0])
+            if cur is None or key > cur[0]:
+                latest[r[0]] = (key, r)
+
+        buckets: Dict[Tuple[str, str], dict] = {
+            (s, lv): _bucket_delta({}, 0) for s in SECTOR_LABELS for lv in LEVELS
+        }
+        rows = []
+        n = 0
+        for cid, sector in db.execute(select(Company.id, Company.sector)):
+            n += 1
+            item = latest.get(cid)
+            if item is None:
+                level, metrics, extra = "NONE", {}, {}
+            else:
+                (period, aid), r = item
+                metrics = dict(zip(LATEST_METRICS, r[5:]))
+                level = risk_level(metrics)
+                extra = {"analysis_id": aid, "period": period, "analyzed_at": r[2], **metrics}
+            rows.append({"company_id": cid, "sector": sector, "level": level, **extra})
+            b = buckets.setdefault((sector, level), _bucket_delta({}, 0))
+            for k, v in _bucket_delta(metrics, +1).items():
+                b[k] += v
+
+        db.bulk_insert_mappings(CompanyLatest, rows)
+        db.bulk_insert_mappings(PortfolioBucket, [{"sector": s, "level": lv, **b} for (s, lv), b in buckets.items()])
+        db.commit()
+        return n
+    finally:
+        db.close()
+
+
+def backfill_if_needed() -> int:
+    """Her firmanın company_latest satırı yoksa (ilk kurulum / eski veritabanı) yeniden kurar."""
+    db = SessionLocal()
+    try:
+        companies = db.execute(select(func.count(Company.id))).scalar_one()
+        tracked = db.execute(select(func.count(CompanyLatest.company_id))).scalar_one()
+    finally:
+        db.close()
+    return rebuild() if companies != tracked else 0
+
+
+# =========================
+# Okuma
+# =========================
+def dashboard(db: Session) -> dict:
+    buckets = db.execute(select(PortfolioBucket)).scalars().all()
+
+    levels = {lv: 0 for lv in LEVELS}
+    sectors: Dict[str, dict] = {}
+    for b in buckets:
+        levels[b.level] = levels.get(b.level, 0) + b.companies
+        s = sectors.setdefault(b.sector, {"sector": b.sector, "label": SECTOR_LABELS.get(b.sector, b.sector),
+                                          "companies": 0, "levels": {lv: 0 for lv in LEVELS},
+                                          **{f"sum_{m}": 0.0 for m in AVG_METRICS}, **{f"n_{m}": 0 for m in AVG_METRICS}})
+        s["companies"] += b.companies
+        s["levels"][b.level] = s["levels"].get(b.level, 0) + b.companies
+        for m in AVG_METRICS:
+            s[f"sum_{m}"] += getattr(b, f"sum_{m}")
+            s[f"n_{m}"] += getattr(b, f"n_{m}")
+
+    sector_rows = []
+    for s in sorted(sectors.values(), key=lambda x: -x["companies"]):
+        s["avg"] = {m: (s[f"sum_{m}"] / s[f"n_{m}"]) if s[f"n_{m}"] else None for m in AVG_METRICS}
+        sector_rows.append(s)
+
+    worst = []
+    for metric, title, ascending in WORST_LISTS:
+        col = getattr(CompanyLatest, metric)
+        rows = db.execute(
+            select(CompanyLatest.company_id, Company.name, CompanyLatest.level, col)
+            .join(Company, Company.id == CompanyLatest.company_id)
+            .where(col.is_not(None))
+            .order_by(col.asc() if ascending else col.desc())
+            .limit(WORST_N)
+        ).all()
+        worst.append({"metric": metric, "title": title, "rows": rows})
+
+    total = sum(levels.values())
+    return {
+        "total": total,
+        "levels": [{"level": lv, "label": LEVEL_LABELS[lv], "count": levels.get(lv, 0),
+                    "share": (levels.get(lv, 0) / total) if total else 0.0} for lv in LEVELS],
+        "sectors": sector_rows,
+        "worst": worst,
+    }
+
+
+def list_companies(
+    db: Session,
+    *,
+    after: Optional[int] = None,
+    before: Optional[int] = None,
+    sector: str = "",
+    level: str = "",
+    limit: int = 50,
+) -> dict:
+    """
+    Firma listesi (yeniden eskiye, id keyset). after: bu id'den eski sayfa, before: bu id'den yeni sayfa.
+    Sektör/seviye filtresi company_latest (sector, level, company_id) indeksini kullanır.
+    """
+    q = select(Company.id, Company.name, Company.sector, CompanyLatest.level, CompanyLatest.current_ratio,
+               CompanyLatest.period).join(CompanyLatest, CompanyLatest.company_id == Company.id)
+    if sector:
+        q = q.where(CompanyLatest.sector == sector)
+    if level:
+        q = q.where(CompanyLatest.level == level)
+
+    if before is not None:
+        rows = db.execute(q.where(Company.id > before).order_by(Company.id.asc()).limit(limit + 1)).all()
+        has_more_newer = len(rows) > limit
+        rows = list(reversed(rows[:limit]))
+        has_more_older = True
+    else:
+        if after is not None:
+            q = q.where(Company.id < after)
+        rows = db.execute(q.order_by(Company.id.desc()).limit(limit + 1)).all()
+        has_more_older = len(rows) > limit
+        rows = rows[:limit]
+        has_more_newer = after is not None
+
+    return {
+        "rows": rows,
+        "next_after": rows[-1][0] if rows and has_more_older else None,
+        "prev_before": rows[0][0] if rows and has_more_newer else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] != ["rebuild"]:
+        print("Kullanım: python -m app.portfolio rebuild", file=sys.stderr)
+        return 2
+    from app.db import engine
+    from app.migrations import ensure_schema
+
+    ensure_schema(engine)
+    print(f"{rebuild()} firma işlendi")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
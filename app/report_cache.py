@@ -0,0 +1,107 @@
+# app/report_cache.py
+"""
+Public risk testi için kısa ömürlü rapor cache'i.
+
+Kullanıcı aynı cevaplarla genelde önce /result/pdf, sonra /result/email çağırır; ikisi de
+calculate_risk + build_pdf_report yapıyordu. Anahtar, normalize edilmiş form girdilerinin
+kanonik JSON'unun SHA-256'sı; değer (score, level, messages, pdf_bytes).
+
+- REPORT_CACHE_TTL_S: girdi ömrü (sn)
+- REPORT_CACHE_MAX_MB / REPORT_CACHE_MAX_ITEMS: dolunca en eski kullanılan (LRU) atılır
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Tuple
+
+REPORT_CACHE_TTL_S = float(os.getenv("REPORT_CACHE_TTL_S", "900"))
+REPORT_CACHE_MAX_BYTES = int(float(os.getenv("REPORT_CACHE_MAX_MB", "64")) * 1024 * 1024)
+REPORT_CACHE_MAX_ITEMS = int(os.getenv("REPORT_CACHE_MAX_ITEMS", "512"))
+
+Report = Tuple[int, str, List[str], bytes]
+
+_lock = threading.Lock()
+_entries: "OrderedDict[str, Tuple[float, int, Report]]" = OrderedDict()
+_bytes = 0
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+
+def cache_key(inputs: Dict[str, Any]) -> str:
+    canonical = json.dumps(inputs, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _drop(key: str) -> None:
+    global _bytes
+    _exp, size, _val = _entries.pop(key)
+    _bytes -= size
+
+
+def get(key: str) -> Report | None:
+    with _lock:
+        item = _entries.get(key)
+        if item is None:
+            _stats["misses"] += 1
+            return None
+        if item[0] < time.monotonic():
+            _drop(key)
+            _stats["expired"] += 1
+            _stats["misses"] += 1
+            return None
+        _entries.move_to_end(key)
+        _stats["hits"] += 1
+        return item[2]
+
+
+def put(key: str, report: Report) -> None:
+    global _bytes
+    size = len(report[3])
+    if size > REPORT_CACHE_MAX_BYTES:
+        return
+    with _lock:
+        if key in _entries:
+            _drop(key)
+        _entries[key] = (time.monotonic() + REPORT_CACHE_TTL_S, size, report)
+        _bytes += size
+
+        now = time.monotonic()
+        for k in [k for k, (exp, _s, _v) in _entries.items() if exp < now]:
+            _drop(k)
+            _stats["expired"] += 1
+        while _entries and (_bytes > REPORT_CACHE_MAX_BYTES or len(_entries) > REPORT_CACHE_MAX_ITEMS):
+            _drop(next(iter(_entries)))
+            _stats["evictions"] += 1
+
+
+def get_or_build(inputs: Dict[str, Any], build: Callable[[], Report]) -> Report:
+    key = cache_key(inputs)
+    report = get(key)
+    if report is None:
+        report = build()
+        put(key, report)
+    return report
+
+
+def clear() -> None:
+    global _bytes
+    with _lock:
+        _entries.clear()
+        _bytes = 0
+
+
+def report_cache_stats() -> Dict[str, float]:
+    with _lock:
+        lookups = _stats["hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "hit_rate": (_stats["hits"] / lookups) if lookups else 0.0,
+            "items": len(_entries),
+            "bytes": _bytes,
+            "max_bytes": REPORT_CACHE_MAX_BYTES,
+            "ttl_s": REPORT_CACHE_TTL_S,
+        }
@@ -1,3 +1,62 @@
+# ----------------------------
+# Sektör ağırlık profilleri
+# ----------------------------
+PROFILES = {
+    "defense": {
+        "gap": 1.00,
+        "fx": 1.00,
+        "cash": 1.00,
+        "conc": 1.00,
+        "delay": 1.00,
+        "shortdebt": 1.00,
+        "limit": 1.00,
+        "hedge_penalty": 1.00,
+        "hedge_bonus": 1.00,
+        "top2m": 1.00,
+        "deferral": 1.00,
+    },
+    "construction": {
+        "gap": 0.80,          # vade uzunluğu sektör normu
+        "fx": 1.00,
+        "cash": 1.25,         # nakit kritik
+        "conc": 1.10,
+        "delay": 1.10,
+        "shortdebt": 1.10,
+        "limit": 1.10,
+        "hedge_penalty": 1.00,
+        "hedge_bonus": 1.00,
+        "top2m": 1.20,        # 2 ay tahsilat yoksa kırılma sert
+        "deferral": 1.25,     # plan dışı erteleme = alarm
+    },
+    "electrical": {
+        "gap": 0.90,
+        "fx": 1.10,           # ithal malzeme/ekipman etkisi
+        "cash": 1.25,
+        "conc": 1.05,
+        "delay": 1.10,
+        "shortdebt": 1.10,
+        "limit": 1.05,
+        "hedge_penalty": 1.05,
+        "hedge_bonus": 1.00,
+        "top2m": 1.20,
+        "deferral": 1.20,
+    },
+    "energy": {
+        "gap": 1.00,
+        "fx": 1.20,           # FX borç/gelir uyumu kritik
+        "cash": 1.00,
+        "conc": 0.90,         # az sayıda offtaker normal olabilir
+        "delay": 1.00,
+        "shortdebt": 1.00,
+        "limit": 0.95,
+        "hedge_penalty": 1.20,  # hedge yoksa daha sert
+        "hedge_bonus": 1.20,    # hedge güçlü ise bonus daha değerli
+        "top2m": 1.05,
+        "deferral": 1.10,
+    },
+}
+
+
 def calculate_risk(
     sector: str,
 
@@ -16,64 +75,6 @@ def calculate_risk(
     limit_pressure: str,
     hedging: str,
 ):
-    # ----------------------------
-    # Sektör ağırlık profilleri
-    # ----------------------------
-    PROFILES = {
-        "defense": {
-            "gap": 1.00,
-            "fx": 1.00,
-            "cash": 1.00,
-            "conc": 1.00,
-            "delay": 1.00,
-            "shortdebt": 1.00,
-            "limit": 1.00,
-            "hedge_penalty": 1.00,
-            "hedge_bonus": 1.00,
-            "top2m": 1.00,
-            "deferral": 1.00,
-        },
-        "construction": {
-            "gap": 0.80,          # vade uzunluğu sektör normu
-            "fx": 1.00,
-            "cash": 1.25,         # nakit kritik
-            "conc": 1.10,
-            "delay": 1.10,
-            "shortdebt": 1.10,
-            "limit": 1.10,
-            "hedge_penalty": 1.00,
-            "hedge_bonus": 1.00,
-            "top2m": 1.20,        # 2 ay tahsilat yoksa kırılma sert
-            "deferral": 1.25,     # plan dışı erteleme = alarm
-        },
-        "electrical": {
-            "gap": 0.90,
-            "fx": 1.10,           # ithal malzeme/ekipman etkisi
-            "cash": 1.25,
-            "conc": 1.05,
-            "delay": 1.10,
-            "shortdebt": 1.10,
-            "limit": 1.05,
-            "hedge_penalty": 1.05,
-            "hedge_bonus": 1.00,
-            "top2m": 1.20,
-            "deferral": 1.20,
-        },
-        "energy": {
-            "gap": 1.00,
-            "fx": 1.20,           # FX borç/gelir uyumu kritik
-            "cash": 1.00,
-            "conc": 0.90,         # az sayıda offtaker normal olabilir
-            "delay": 1.00,
-            "shortdebt": 1.00,
-            "limit": 0.95,
-            "hedge_penalty": 1.20,  # hedge yoksa daha sert
-            "hedge_bonus": 1.20,    # hedge güçlü ise bonus daha değerli
-            "top2m": 1.05,
-            "deferral": 1.10,
-        },
-    }
-
     sector = (sector or "defense").strip().lower()
     if sector not in PROFILES:
         sector = "defense"
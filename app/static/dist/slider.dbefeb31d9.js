@@ -0,0 +1,113 @@
+(() => {
+const slider = document.querySelector(".hero-slider");
+if (!slider) return;
+const viewport = slider.querySelector(".hs-viewport");
+const track = slider.querySelector(".hs-track");
+if (!viewport || !track) return;
+const items = Array.from(track.children).filter((el) => el.matches("picture, img, .hs-slide"));
+if (!items.length) return;
+function setBg(wrap) {
+const img = wrap.querySelector("img");
+if (!img) return;
+const apply = () => {
+const src = img.currentSrc || img.src;
+if (src) wrap.style.setProperty("--bg", `url("${src}")`);
+};
+if (img.complete && img.naturalWidth) apply();
+else img.addEventListener("load", apply, { once: true });
+}
+items.forEach((el) => {
+if (el.classList.contains("hs-slide")) return;
+const wrap = document.createElement("div");
+wrap.className = "hs-slide";
+el.parentNode.insertBefore(wrap, el);
+wrap.appendChild(el);
+});
+const slides = Array.from(track.querySelectorAll(".hs-slide"));
+const prevBtn = slider.querySelector("#hsPrev") || slider.querySelector(".hs-btn.prev");
+const nextBtn = slider.querySelector("#hsNext") || slider.querySelector(".hs-btn.next");
+const dotsWrap = slider.querySelector("#hsDots") || slider.querySelector(".hs-dots");
+function loadSlide(wrap) {
+if (!wrap || wrap.dataset.loaded) return;
+wrap.dataset.loaded = "1";
+wrap.querySelectorAll("source[data-srcset], img[data-srcset], img[data-src]").forEach((el) => {
+if (el.dataset.srcset) { el.srcset = el.dataset.srcset; el.removeAttribute("data-srcset"); }
+if (el.dataset.src) { el.src = el.dataset.src; el.removeAttribute("data-src"); }
+});
+setBg(wrap);
+}
+slides.forEach((wrap, i) => {
+const img = wrap.querySelector("img");
+if (img && i > 0 && !img.hasAttribute("loading")) img.loading = "lazy";
+});
+loadSlide(slides[0]);
+if ("IntersectionObserver" in window) {
+const io = new IntersectionObserver((entries) => {
+entries.forEach((e) => {
+if (e.isIntersecting) {
+loadSlide(e.target);
+io.unobserve(e.target);
+}
+});
+}, { root: viewport, rootMargin: "0px 50% 0px 50%" });
+slides.slice(1).forEach((wrap) => io.observe(wrap));
+} else {
+slides.forEach(loadSlide);
+}
+let index = 0;
+let dots = [];
+if (dotsWrap) {
+dotsWrap.innerHTML = "";
+dots = slides.map((_, i) => {
+const b = document.createElement("button");
+b.type = "button";
+b.className = "hs-dot";
+b.setAttribute("aria-label", `Görsel ${i + 1}`);
+b.addEventListener("click", () => go(i));
+dotsWrap.appendChild(b);
+return b;
+});
+}
+function paintDots() {
+dots.forEach((d, i) => d.classList.toggle("active", i === index));
+}
+function clamp(i) {
+if (i < 0) return slides.length - 1;
+if (i >= slides.length) return 0;
+return i;
+}
+function go(i) {
+index = clamp(i);
+loadSlide(slides[index]);
+loadSlide(slides[clamp(index + 1)]);
+const w = viewport.clientWidth;
+viewport.scrollTo({ left: index * w, behavior: "smooth" });
+paintDots();
+}
+if (prevBtn) prevBtn.addEventListener("click", () => go(index - 1));
+if (nextBtn) nextBtn.addEventListener("click", () => go(index + 1));
+let raf = 0;
+viewport.addEventListener("scroll", () => {
+cancelAnimationFrame(raf);
+raf = requestAnimationFrame(() => {
+const w = viewport.clientWidth || 1;
+const newIndex = Math.round(viewport.scrollLeft / w);
+if (newIndex !== index) {
+index = clamp(newIndex);
+paintDots();
+}
+});
+}, { passive: true });
+window.addEventListener("resize", () => go(index));
+go(0);
+})();
+(function(){
+const cta = document.querySelector('.sticky-cta');
+if(!cta) return;
+function onScroll(){
+const y = window.scrollY || document.documentElement.scrollTop || 0;
+cta.classList.toggle('is-visible', y > 200);
+}
+window.addEventListener('scroll', onScroll, { passive:true });
+onScroll();
+})();
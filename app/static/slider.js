@@ -6,38 +6,71 @@
   const track = slider.querySelector(".hs-track");
   if (!viewport || !track) return;
 
-  // 1) img'leri slide wrapper içine al (blur bg için)
-  const imgs = Array.from(track.querySelectorAll("img"));
-  if (!imgs.length) return;
-
-  // Eğer daha önce sarıldıysa tekrar sarmayalım
-  const alreadyWrapped = track.querySelector(".hs-slide");
-  if (!alreadyWrapped) {
-    imgs.forEach((img) => {
-      const wrap = document.createElement("div");
-      wrap.className = "hs-slide";
-      wrap.style.setProperty("--bg", `url("${img.getAttribute("src")}")`);
-
-      // img'yi wrap içine taşı
-      img.parentNode.insertBefore(wrap, img);
-      wrap.appendChild(img);
-    });
-  } else {
-    // wrapped ise bg değişkenini set et
-    track.querySelectorAll(".hs-slide").forEach((wrap) => {
-      const img = wrap.querySelector("img");
-      if (img) wrap.style.setProperty("--bg", `url("${img.getAttribute("src")}")`);
-    });
+  // 1) görselleri (img ya da <picture>) slide wrapper içine al (blur bg için)
+  const items = Array.from(track.children).filter((el) => el.matches("picture, img, .hs-slide"));
+  if (!items.length) return;
+
+  // blur bg, img gerçekten yüklendikten sonra seçilen varyanttan (currentSrc) alınır;
+  // src attribute'u okumak tam boy orijinali ayrıca indirtiyordu
+  function setBg(wrap) {
+    const img = wrap.querySelector("img");
+    if (!img) return;
+    const apply = () => {
+      const src = img.currentSrc || img.src;
+      if (src) wrap.style.setProperty("--bg", `url("${src}")`);
+    };
+    if (img.complete && img.naturalWidth) apply();
+    else img.addEventListener("load", apply, { once: true });
   }
 
+  items.forEach((el) => {
+    if (el.classList.contains("hs-slide")) return;
+    const wrap = document.createElement("div");
+    wrap.className = "hs-slide";
+    el.parentNode.insertBefore(wrap, el);
+    wrap.appendChild(el);
+  });
+
   const slides = Array.from(track.querySelectorAll(".hs-slide"));
   const prevBtn = slider.querySelector("#hsPrev") || slider.querySelector(".hs-btn.prev");
   const nextBtn = slider.querySelector("#hsNext") || slider.querySelector(".hs-btn.next");
   const dotsWrap = slider.querySelector("#hsDots") || slider.querySelector(".hs-dots");
 
+  // 2) lazy-load: ilk slide hemen, diğerleri görünür alana yaklaşınca (ya da sıradaki olunca)
+  // data-src / data-srcset (picture(..., deferred=True)) gerçek attribute'a taşınır
+  function loadSlide(wrap) {
+    if (!wrap || wrap.dataset.loaded) return;
+    wrap.dataset.loaded = "1";
+    wrap.querySelectorAll("source[data-srcset], img[data-srcset], img[data-src]").forEach((el) => {
+      if (el.dataset.srcset) { el.srcset = el.dataset.srcset; el.removeAttribute("data-srcset"); }
+      if (el.dataset.src) { el.src = el.dataset.src; el.removeAttribute("data-src"); }
+    });
+    setBg(wrap);
+  }
+
+  slides.forEach((wrap, i) => {
+    const img = wrap.querySelector("img");
+    if (img && i > 0 && !img.hasAttribute("loading")) img.loading = "lazy";
+  });
+  loadSlide(slides[0]);
+
+  if ("IntersectionObserver" in window) {
+    const io = new IntersectionObserver((entries) => {
+      entries.forEach((e) => {
+        if (e.isIntersecting) {
+          loadSlide(e.target);
+          io.unobserve(e.target);
+        }
+      });
+    }, { root: viewport, rootMargin: "0px 50% 0px 50%" });
+    slides.slice(1).forEach((wrap) => io.observe(wrap));
+  } else {
+    slides.forEach(loadSlide);
+  }
+
   let index = 0;
 
-  // 2) dots
+  // 3) dots
   let dots = [];
   if (dotsWrap) {
     dotsWrap.innerHTML = "";
@@ -64,16 +97,18 @@
 
   function go(i) {
     index = clamp(i);
+    loadSlide(slides[index]);
+    loadSlide(slides[clamp(index + 1)]);
     const w = viewport.clientWidth;
     viewport.scrollTo({ left: index * w, behavior: "smooth" });
     paintDots();
   }
 
-  // 3) buttons
+  // 4) buttons
   if (prevBtn) prevBtn.addEventListener("click", () => go(index - 1));
   if (nextBtn) nextBtn.addEventListener("click", () => go(index + 1));
 
-  // 4) scroll ile index güncelle (swipe sonrası dot doğru kalsın)
+  // 5) scroll ile index güncelle (swipe sonrası dot doğru kalsın)
   let raf = 0;
   viewport.addEventListener("scroll", () => {
     cancelAnimationFrame(raf);
@@ -0,0 +1,289 @@
+# app/timeseries.py
+"""
+Firma bazında metrik zaman serisi (company_metric_points).
+
+- Her analiz, dönemine (mizan ayı: Upload.period, yoksa upload/analiz ayı) bir nokta yazar;
+  aynı ayda tekrar analiz edilirse son analiz geçerlidir.
+- delta / pct_change / 3 ve 12 aylık mean-min-max yazma anında hesaplanır: yeni nokta
+  eklendiğinde sadece etkilenen noktalar (sonraki 12 ay + bir sonraki nokta) güncellenir.
+- trend() yalnızca (company_id, metric, period) birincil anahtarı üzerinden aralık okur;
+  Excel parse edilmez, result_json açılmaz.
+
+Geri doldurma (analysis_metrics'ten):
+    python -m app.timeseries rebuild [--company ID]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.analysis_store import METRIC_KEYS
+from app.db import SessionLocal
+from app.models import Analysis, AnalysisJob, AnalysisMetrics, CompanyMetricPoint, Upload
+
+TREND_METRICS = METRIC_KEYS
+DEFAULT_TREND_METRICS = (
+    "current_ratio", "quick_ratio", "cash_ratio", "nwc", "net_debt",
+    "debt_to_equity", "interest_cover", "gross_margin",
+)
+WINDOWS = (3, 12)
+LOOKBACK_MONTHS = max(WINDOWS)
+
+DERIVED = ("delta", "pct_change", "mean_3", "mean_12", "min_12", "max_12")
+
+
+# =========================
+# Dönem yardımcıları
+# =========================
+def month_start(d: date | datetime) -> date:
+    return date(d.year, d.month, 1)
+
+
+def parse_period(text: str) -> Optional[date]:
+    """'2024-05' / '2024-05-17' -> 2024-05-01; boş/geçersiz -> None."""
+    text = (text or "").strip()
+    if not text:
+        return None
+    try:
+        y, m = text[:7].split("-")
+        return date(int(y), int(m), 1)
+    except ValueError:
+        return None
+
+
+def _month_index(d: date) -> int:
+    return d.year * 12 + d.month - 1
+
+
+def _add_months(d: date, n: int) -> date:
+    i = _month_index(d) + n
+    return date(i // 12, i % 12 + 1, 1)
+
+
+# =========================
+# Türetilmiş değerler
+# =========================
+def _derive(points: Sequence[Tuple[date, Optional[float]]]) -> List[Dict[str, Optional[float]]]:
+    """Dönem sıralı (period, value) listesi için delta/pct_change/rolling değerler."""
+    out: List[Dict[str, Optional[float]]] = []
+    prev: Optional[float] = None
+    idx = [_month_index(p) for p, _v in points]
+    for i, (_p, v) in enumerate(points):
+        row: Dict[str, Optional[float]] = dict.fromkeys(DERIVED)
+        if v is not None and prev is not None:
+            row["delta"] = v - prev
+            row["pct_change"] = (v - prev) / abs(prev) if prev else None
+        for w in WINDOWS:
+            vals = []
+            j = i
+            while j >= 0 and idx[i] - idx[j] < w:
+                if points[j][1] is not None:
+                    vals.append(points[j][1])
+                j -= 1
+            if vals:
+                row[f"mean_{w}"] = sum(vals) / len(vals)
+                if w == LOOKBACK_MONTHS:
+                    row[f"min_{w}"] = min(vals)
+                    row[f"max_{w}"] = max(vals)
+        if v is not None:
+            prev = v
+        out.append(row)
+    return out
+
+
+def _recompute(db: Session, company_id: int, since: date) -> None:
+    """
+    since'teki değişiklikten etkilenen noktaların türetilmiş kolonlarını yeniden yazar:
+    since'ten sonraki 12 ay (rolling pencereler) + since'ten sonraki ilk nokta (delta).
+    """
+    first = _add_months(since, -LOOKBACK_MONTHS)
+    last = _add_months(since, LOOKBACK_MONTHS - 1)
+    nxt = db.execute(
+        select(func.min(CompanyMetricPoint.period)).where(
+            CompanyMetricPoint.company_id == company_id, CompanyMetricPoint.period > since
+        )
+    ).scalar()
+    if nxt is not None and nxt > last:
+        last = nxt
+    rows = db.execute(
+        select(CompanyMetricPoint)
+        .where(
+            CompanyMetricPoint.company_id == company_id,
+            CompanyMetricPoint.period >= first,
+            CompanyMetricPoint.period <= last,
+        )
+        .order_by(CompanyMetricPoint.metric, CompanyMetricPoint.period)
+    ).scalars().all()
+
+    by_metric: Dict[str, List[CompanyMetricPoint]] = defaultdict(list)
+    for r in rows:
+        by_metric[r.metric].append(r)
+
+    for series in by_metric.values():
+        derived = _derive([(r.period, r.value) for r in series])
+        for i, (r, d) in enumerate(zip(series, derived)):
+            if r.period < since:
+                continue
+            if i == 0:
+                # geriye bakış penceresinde önceki nokta yok; delta için daha eski değeri oku
+                d.update(_delta_from_previous(db, company_id, r))
+            for k in DERIVED:
+                setattr(r, k, d[k])
+
+
+def _delta_from_previous(db: Session, company_id: int, point: CompanyMetricPoint) -> Dict[str, Optional[float]]:
+    prev = db.execute(
+        select(CompanyMetricPoint.value)
+        .where(
+            CompanyMetricPoint.company_id == company_id,
+            CompanyMetricPoint.metric == point.metric,
+            CompanyMetricPoint.period < point.period,
+            CompanyMetricPoint.value.is_not(None),
+        )
+        .order_by(CompanyMetricPoint.period.desc())
+        .limit(1)
+    ).scalar()
+    if prev is None or point.value is None:
+        return {"delta": None, "pct_change": None}
+    return {"delta": point.value - prev, "pct_change": (point.value - prev) / abs(prev) if prev else None}
+
+
+# =========================
+# Yazma
+# =========================
+def record(db: Session, company_id: int, analysis_id: int, period: date, metrics: Dict[str, Optional[float]]) -> None:
+    """Analizin metriklerini dönemine yazar (varsa üzerine) ve sonraki noktaları günceller (commit eder)."""
+    period = month_start(period)
+    db.execute(
+        delete(CompanyMetricPoint).where(
+            CompanyMetricPoint.company_id == company_id, CompanyMetricPoint.period == period
+        )
+    )
+    db.add_all(
+        CompanyMetricPoint(company_id=company_id, metric=m, period=period, analysis_id=analysis_id, value=metrics.get(m))
+        for m in TREND_METRICS
+    )
+    db.flush()
+    _recompute(db, company_id, period)
+    db.commit()
+
+
+def rebuild(company_id: Optional[int] = None) -> int:
+    """Serileri analysis_metrics'ten baştan kurar (Excel parse edilmez); yazılan nokta sayısı."""
+    db = SessionLocal()
+    try:
+        q = (
+            select(Analysis.id, Analysis.company_id, Analysis.created_at, Upload.period, Upload.uploaded_at,
+                   *[getattr(AnalysisMetrics, m) for m in TREND_METRICS])
+            .join(AnalysisMetrics, AnalysisMetrics.analysis_id == Analysis.id)
+            .outerjoin(AnalysisJob, AnalysisJob.analysis_id == Analysis.id)
+            .outerjoin(Upload, Upload.id == AnalysisJob.upload_id)
+            .order_by(Analysis.company_id, Analysis.id)
+        )
+        d = delete(CompanyMetricPoint)
+        if company_id is not None:
+            q = q.where(Analysis.company_id == company_id)
+            d = d.where(CompanyMetricPoint.company_id == company_id)
+        db.execute(d)
+
+        written = 0
+        for cid, rows in _group_by_company(db.execute(q)):
+            latest: Dict[date, tuple] = {}
+            for r in rows:  # id sıralı: aynı dönemde son analiz kazanır
+                period = r[3] or month_start(r[4] or r[2])
+                latest[period] = r
+            periods = sorted(latest)
+            mappings = []
+            for mi, m in enumerate(TREND_METRICS):
+                series = [(p, latest[p][5 + mi]) for p in periods]
+                for (p, v), dv in zip(series, _derive(series)):
+                    mappings.append({"company_id": cid, "metric": m, "period": p, "analysis_id": latest[p][0], "value": v, **dv})
+            db.bulk_insert_mappings(CompanyMetricPoint, mappings)
+            written += len(mappings)
+        db.commit()
+        return written
+    finally:
+        db.close()
+
+
+def _group_by_company(result: Iterable) -> Iterable[Tuple[int, List[tuple]]]:
+    cid, buf = None, []
+    for r in result:
+        if r[1] != cid and buf:
+            yield cid, buf
+            buf = []
+        cid = r[1]
+        buf.append(tuple(r))
+    if buf:
+        yield cid, buf
+
+
+def backfill_missing() -> int:
+    """Analizi olup hiç noktası olmayan firmaların serisini kurar (startup'ta çağrılır)."""
+    db = SessionLocal()
+    try:
+        has_points = select(CompanyMetricPoint.company_id).distinct()
+        ids = db.execute(
+            select(Analysis.company_id).distinct().where(Analysis.company_id.not_in(has_points))
+        ).scalars().all()
+    finally:
+        db.close()
+    return sum(rebuild(cid) for cid in ids)
+
+
+# =========================
+# Okuma
+# =========================
+def trend(
+    db: Session,
+    company_id: int,
+    metrics: Sequence[str] = DEFAULT_TREND_METRICS,
+    period_from: Optional[date] = None,
+    period_to: Optional[date] = None,
+) -> Dict[str, List[dict]]:
+    metrics = [m for m in metrics if m in TREND_METRICS]
+    conds = [CompanyMetricPoint.company_id == company_id, CompanyMetricPoint.metric.in_(metrics)]
+    if period_from is not None:
+        conds.append(CompanyMetricPoint.period >= period_from)
+    if period_to is not None:
+        conds.append(CompanyMetricPoint.period <= period_to)
+    rows = db.execute(
+        select(CompanyMetricPoint.metric, CompanyMetricPoint.period, CompanyMetricPoint.analysis_id,
+               CompanyMetricPoint.value, *[getattr(CompanyMetricPoint, k) for k in DERIVED])
+        .where(*conds)
+        .order_by(CompanyMetricPoint.metric, CompanyMetricPoint.period)
+    ).all()
+
+    out: Dict[str, List[dict]] = {m: [] for m in metrics}
+    for r in rows:
+        item = {"period": r[1].strftime("%Y-%m"), "analysis_id": r[2], "value": r[3]}
+        item.update(zip(DERIVED, r[4:]))
+        out[r[0]].append(item)
+    return out
+
+
+# =========================
+# CLI
+# =========================
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Firma metrik zaman serisi")
+    ap.add_argument("command", choices=["rebuild"])
+    ap.add_argument("--company", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    from app.db import engine
+    from app.migrations import ensure_schema
+
+    ensure_schema(engine)
+    print(f"{rebuild(args.company)} nokta yazıldı")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+# app/workers.py
+"""
+Parse/analiz işlerini GIL dışına taşıyan process havuzu.
+
+- PARSE_WORKERS: worker process sayısı (0 => aynı process'te çalıştır; testler için).
+- PARSE_QUEUE_DEPTH: aynı anda havuzda bekleyen/çalışan en fazla iş; dolunca PoolBusy.
+- PARSE_TASK_MAX_MB: worker başına adres alanı limiti (bir worker aynı anda tek iş
+  çalıştırdığı için iş başına limit). 0 => limitsiz.
+- run(..., timeout=): süre worker içinde (SIGALRM) uygulanır; süresi dolan iş gerçekten durur,
+  worker ve kuyruk slotu serbest kalır, çağırana TaskTimeout döner. Kuyrukta bekleme süreye
+  dahil değildir. PARSE_WORKERS=0 (aynı process) modunda timeout uygulanmaz.
+
+Worker'lar 'spawn' ile başlar ve initializer içinde openpyxl, fin_mapping indeksleri
+ve PDF fontları + logoyu önceden yükler; ilk iş soğuk import bedeli ödemez.
+
+Parse ve normalize cache'leri worker'larda yaşar: her iş, worker'daki sayaçların o iş boyunca
+değişimini sonucuyla birlikte döner; parent bunları toplar (cache_stats(), /admin/metrics ve
+mapping-debug sayfası).
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "2"))
+PARSE_QUEUE_DEPTH = int(os.getenv("PARSE_QUEUE_DEPTH", "16"))
+PARSE_TASK_MAX_MB = int(os.getenv("PARSE_TASK_MAX_MB", "1536"))
+
+
+class PoolBusy(RuntimeError):
+    """Kuyruk derinliği dolu; çağıran daha sonra tekrar denemeli."""
+
+
+class TaskTimeout(RuntimeError):
+    """İş worker içinde süre sınırını aştı ve durduruldu."""
+
+
+def _call_with_deadline(timeout_s: float, fn: Callable[..., Any], *args: Any) -> Any:
+    # worker process'in ana thread'inde çalışır: sinyal işi Python kodunun ortasında keser
+    def _expired(_signum, _frame):
+        raise TaskTimeout(f"Zaman aşımı ({timeout_s:.0f} sn).")
+
+    previous = signal.signal(signal.SIGALRM, _expired)
+    signal.setitimer(signal.ITIMER_REAL, timeout_s)
+    try:
+        return fn(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _cache_counters() -> Dict[str, Dict[str, float]]:
+    from app.fin_mapping import normalize_cache_counters
+    from app.parse_cache import parse_cache_counters
+
+    return {"parse_cache": parse_cache_counters(), "normalize_cache": normalize_cache_counters()}
+
+
+def _call_tracked(fn: Callable[..., Any], *args: Any) -> Tuple[Any, Dict[str, Dict[str, float]]]:
+    # worker'da çalışır: sonuç + bu işin cache sayaçlarına katkısı
+    before = _cache_counters()
+    result = fn(*args)
+    after = _cache_counters()
+    return result, {k: {n: v - before[k].get(n, 0) for n, v in after[k].items()} for k in after}
+
+
+def _worker_init(max_mb: int) -> None:
+    if max_mb > 0:
+        try:
+            import resource
+
+            limit = max_mb * 1024 * 1024
+            _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+            if hard != resource.RLIM_INFINITY:
+                limit = min(limit, hard)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+        except (ImportError, ValueError, OSError):
+            pass
+
+    # warm-up: ağır importlar + modül seviyesinde kurulan indeksler
+    import openpyxl  # noqa: F401
+    from app import analysis_engine, fin_mapping  # noqa: F401
+    from app.pdf_template import warm_up
+
+    warm_up()
+
+
+class ParsePool:
+    def __init__(self, workers: int, queue_depth: int, max_mb: int):
+        self.workers = workers
+        self.queue_depth = max(1, queue_depth)
+        self.max_mb = max_mb
+        self._slots = threading.BoundedSemaphore(self.queue_depth)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._counters: Dict[str, Dict[str, float]] = {}  # worker'lardan toplanan cache sayaçları
+
+    @property
+    def in_process(self) -> bool:
+        return self.workers <= 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_worker_init,
+                    initargs=(self.max_mb,),
+                )
+            return self._executor
+
+    def warm_up(self) -> None:
+        """Worker'ları önceden başlatır (startup'ta çağrılır)."""
+        if self.in_process:
+            return
+        ex = self._get_executor()
+        for f in [ex.submit(os.getpid) for _ in range(self.workers)]:
+            f.result()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise PoolBusy(f"Analiz kuyruğu dolu ({self.queue_depth}); biraz sonra tekrar deneyin.")
+
+        if self.in_process:
+            fut: Future = Future()
+            try:
+                fut.set_result(fn(*args))
+            except BaseException as e:
+                fut.set_exception(e)
+            finally:
+                self._slots.release()
+            return fut
+
+        try:
+            inner = self._get_executor().submit(_call_tracked, fn, *args)
+        except BrokenProcessPool:
+            # bir worker öldü (ör. bellek limiti): havuzu yenile, bir kez daha dene
+            self.restart()
+            try:
+                inner = self._get_executor().submit(_call_tracked, fn, *args)
+            except BaseException:
+                self._slots.release()
+                raise
+        except BaseException:
+            self._slots.release()
+            raise
+
+        fut = Future()
+        fut.set_running_or_notify_cancel()
+
+        def _done(f: Future) -> None:
+            self._slots.release()
+            if f.cancelled():
+                fut.set_exception(BrokenProcessPool("Havuz yeniden başlatıldı; iş iptal edildi."))
+                return
+            exc = f.exception()
+            if exc is not None:
+                fut.set_exception(exc)
+                return
+            result, delta = f.result()
+            self._add_counters(delta)
+            fut.set_result(result)
+
+        inner.add_done_callback(_done)
+        return fut
+
+    def _add_counters(self, delta: Dict[str, Dict[str, float]]) -> None:
+        with self._lock:
+            for name, values in delta.items():
+                total = self._counters.setdefault(name, {})
+                for k, v in values.items():
+                    total[k] = total.get(k, 0) + v
+
+    def cache_stats(self) -> Dict[str, dict]:
+        """Parse/normalize cache sayaçları; worker modunda worker'lardan toplanan, aksi halde bu process'in."""
+        from app.fin_mapping import NORMALIZE_CACHE_SIZE, normalize_cache_stats
+        from app.parse_cache import parse_cache_stats
+
+        if self.in_process:
+            counters = _cache_counters()
+            maxsize = NORMALIZE_CACHE_SIZE
+        else:
+            with self._lock:
+                counters = {k: dict(v) for k, v in self._counters.items()}
+            maxsize = NORMALIZE_CACHE_SIZE * self.workers  # her worker'ın kendi LRU'su var
+        return {
+            "parse_cache": parse_cache_stats(counters.get("parse_cache", {})),
+            "normalize_cache": normalize_cache_stats(counters.get("normalize_cache", {}), maxsize=maxsize),
+        }
+
+    def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        if timeout is not None and not self.in_process:
+            fut = self.submit(_call_with_deadline, timeout, fn, *args)
+        else:
+            fut = self.submit(fn, *args)
+        try:
+            return fut.result()
+        except BrokenProcessPool:
+            self.restart()
+            raise
+
+    async def run_async(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Event loop'u bloklamadan bekler."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def restart(self) -> None:
+        with self._lock:
+            ex, self._executor = self._executor, None
+        if ex is not None:
+            ex.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            ex, self._executor = self._executor, None
+        if ex is not None:
+            ex.shutdown(wait=wait, cancel_futures=True)
+
+
+pool = ParsePool(PARSE_WORKERS, PARSE_QUEUE_DEPTH, PARSE_TASK_MAX_MB)
+
+
+def parse_and_analyze(xlsx_path: str, sector: str) -> dict:
+    from app.analysis_engine import analyze_financials
+    from app.parse_cache import parse_financials_cached
+
+    return analyze_financials(parse_financials_cached(xlsx_path), sector=sector)
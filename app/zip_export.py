@@ -0,0 +1,183 @@
+# app/zip_export.py
+"""
+Seçili analiz PDF'lerini tek ZIP olarak stream eder (firma, tarih aralığı ya da tümü).
+
+- Arşiv hiçbir zaman bellekte tamamlanmaz: zipfile seek edilemeyen bir sink'e yazar
+  (data descriptor'lı girişler), sink her EXPORT_CHUNK_KB'lik dilimde boşaltılıp yield edilir.
+- PDF'ler ZIP_STORED eklenir (içerik zaten sıkıştırılmış; deflate sadece CPU harcar).
+- Analysis satırları id keyset'i ile partiler halinde, sadece gerekli kolonlarla okunur.
+  Diskte PDF'i olmayan satırlar pdf_files.ensure_pdf ile worker havuzunda üretilip kaydedilir
+  (web process'i render etmez; sonraki indirmeler dosyayı hazır bulur).
+- Bir girişin PDF'i üretilemezse arşiv yarıda kesilmez: yerine <giriş>.HATA.txt yazılır
+  (yanıt 200 ile başlamış olur; kesik arşiv yerine eksik girişi açıklayan not).
+- Bellek kullanımı analiz sayısından bağımsızdır (parti + tek dilim + ZIP merkez dizini).
+"""
+from __future__ import annotations
+
+import os
+import re
+import unicodedata
+import zipfile
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from time import monotonic, sleep
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.db import SessionLocal
+from app.models import Analysis, Company
+from app.pdf_files import ensure_pdf
+from app.workers import ParsePool, PoolBusy
+
+EXPORT_CHUNK_KB = int(os.getenv("EXPORT_CHUNK_KB", "256"))
+EXPORT_BATCH = int(os.getenv("EXPORT_BATCH", "500"))
+# eksik PDF için havuz doluysa en fazla bu kadar beklenir, sonra girişe hata notu yazılır
+EXPORT_BUSY_WAIT_S = float(os.getenv("EXPORT_BUSY_WAIT_S", "30"))
+
+Row = Tuple[int, datetime, Optional[str], int, str, str]  # id, created_at, pdf_path, company_id, name, sector
+
+
+class _Sink:
+    """Seek/tell desteklemeyen yazma hedefi; zipfile bunu stream moduna alır."""
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+        self.size = 0
+
+    def write(self, b) -> int:
+        self._parts.append(bytes(b))
+        self.size += len(b)
+        return len(b)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        self.size = 0
+        return data
+
+
+def _slug(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.replace("ı", "i").replace("İ", "I"))
+    text = text.encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-").lower() or "firma"
+
+
+def _filters(company_id: Optional[int], date_from: Optional[date], date_to: Optional[date]) -> list:
+    conds = []
+    if company_id is not None:
+        conds.append(Analysis.company_id == company_id)
+    if date_from is not None:
+        conds.append(Analysis.created_at >= datetime.combine(date_from, time.min))
+    if date_to is not None:
+        # bitiş günü dahil
+        conds.append(Analysis.created_at < datetime.combine(date_to + timedelta(days=1), time.min))
+    return conds
+
+
+def iter_export_rows(
+    company_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    batch_size: int = EXPORT_BATCH,
+) -> Iterator[Row]:
+    conds = _filters(company_id, date_from, date_to)
+    last_id = 0
+    while True:
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(Analysis.id, Analysis.created_at, Analysis.pdf_path, Company.id, Company.name, Company.sector)
+                .join(Company, Company.id == Analysis.company_id)
+                .where(Analysis.id > last_id, *conds)
+                .order_by(Analysis.id)
+                .limit(batch_size)
+            ).all()
+        finally:
+            db.close()
+        if not rows:
+            return
+        for r in rows:
+            yield tuple(r)
+        last_id = rows[-1][0]
+
+
+def _ensure_missing(pool: ParsePool, analysis_id: int) -> Path:
+    deadline = monotonic() + EXPORT_BUSY_WAIT_S
+    db = SessionLocal()
+    try:
+        analysis = db.get(Analysis, analysis_id)
+        if analysis is None:
+            raise LookupError("analiz silinmiş")
+        while True:
+            try:
+                return Path(ensure_pdf(db, analysis, pool))
+            except PoolBusy:
+                if monotonic() >= deadline:
+                    raise
+                sleep(0.5)
+    finally:
+        db.close()
+
+
+def _entry_name(row: Row) -> str:
+    analysis_id, created_at, _path, company_id, name, _sector = row
+    return f"{_slug(name)}-{company_id}/cashguard-admin-analiz-{analysis_id}-{created_at:%Y%m%d}.pdf"
+
+
+def stream_zip(
+    pool: ParsePool,
+    company_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> Iterator[bytes]:
+    """ZIP baytlarını dilim dilim üretir (StreamingResponse içeriği; eksik PDF'ler pool'da üretilir)."""
+    chunk = EXPORT_CHUNK_KB * 1024
+    sink = _Sink()
+    zf = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED, allowZip64=True)
+    count = 0
+    for row in iter_export_rows(company_id, date_from, date_to):
+        analysis_id, created_at, pdf_path, _cid, _name, _sector = row
+        info = zipfile.ZipInfo(_entry_name(row), date_time=created_at.timetuple()[:6])
+        info.compress_type = zipfile.ZIP_STORED
+
+        src = Path(pdf_path) if pdf_path else None
+        try:
+            if src is None or not src.is_file():
+                # diskte yok (silinmiş / hiç yazılmamış): worker'da üret, kaydet
+                src = _ensure_missing(pool, analysis_id)
+            f = src.open("rb")
+        except Exception as e:
+            zf.writestr(info.filename[:-4] + ".HATA.txt", f"Analiz {analysis_id} PDF'i eklenemedi: {e}\n")
+            count += 1
+            continue
+        with f, zf.open(info, "w") as dst:
+            while True:
+                buf = f.read(chunk)
+                if not buf:
+                    break
+                dst.write(buf)
+                if sink.size >= chunk:
+                    yield sink.drain()
+        count += 1
+        if sink.size >= chunk:
+            yield sink.drain()
+
+    if count == 0:
+        zf.writestr("BOS.txt", "Seçilen filtrelere uyan analiz bulunamadı.\n")
+    zf.close()
+    yield sink.drain()
+
+
+def export_filename(company_id: Optional[int], date_from: Optional[date], date_to: Optional[date]) -> str:
+    parts = ["cashguard-analizler"]
+    if company_id is not None:
+        parts.append(f"firma{company_id}")
+    if date_from is not None:
+        parts.append(f"{date_from:%Y%m%d}")
+    if date_to is not None:
+        parts.append(f"{date_to:%Y%m%d}")
+    return "-".join(parts) + ".zip"
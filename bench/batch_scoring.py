@@ -0,0 +1,87 @@
+"""
+batch_scoring.score_batch benchmark + regresyon kontrolü.
+
+Rastgele (eşik sınırlarını da kapsayan) anketler üretir; calculate_risk'i satır satır çağıran
+skaler döngüyle vektörel score_batch'i kıyaslar. Skor/seviye/mesajlar birebir aynı değilse
+farkları listeler ve 1 ile çıkar.
+
+Kullanım (repo kökünden):
+    python -m bench.batch_scoring
+    python -m bench.batch_scoring --sizes 1000 100000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.batch_scoring import FIELDS, iter_results, score_batch
+from app.scoring import PROFILES, calculate_risk
+
+
+def make_records(n: int, seed: int = 7) -> List[Dict]:
+    rnd = random.Random(seed)
+    sectors = list(PROFILES) + ["Energy ", "unknown", ""]
+    out = []
+    for _ in range(n):
+        out.append({
+            "sector": rnd.choice(sectors),
+            "collection_days": rnd.randint(0, 240),
+            "payable_days": rnd.randint(0, 150),
+            "fx_debt_ratio": rnd.randint(0, 100),
+            "fx_revenue_ratio": rnd.randint(0, 100),
+            "cash_buffer_months": rnd.randint(0, 9),
+            "top_customer_share": rnd.randint(0, 100),
+            "top_customer_2m_gap_month": rnd.choice([1, 2, 3, 4, 5, 6, 7, 99]),
+            "unplanned_deferral_12m": rnd.choice(["yes", "YES", "no", ""]),
+            "delay_issue": rnd.choice(["yes", "no", "Yes"]),
+            "short_debt_ratio": rnd.randint(0, 100),
+            "limit_pressure": rnd.choice(["yes", "no"]),
+            "hedging": rnd.choice(["none", "partial", "strong"]),
+        })
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = ap.parse_args()
+
+    failed = False
+    # records_s: kayıt listesi -> satır başına (score, level, messages) listesi (uçtan uca)
+    # columns_s: NumPy kolonları -> dizi sonuçlar (satır başına Python listesi üretmeden)
+    print(f"{'rows':>8} {'scalar_s':>9} {'records_s':>10} {'columns_s':>10} {'speedup':>8} {'mismatch':>9}")
+    for n in args.sizes:
+        records = make_records(n)
+
+        t0 = time.perf_counter()
+        expected = [calculate_risk(**r) for r in records]
+        t_scalar = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        got = list(iter_results(score_batch(records)))
+        t_records = time.perf_counter() - t0
+
+        columns = {k: np.array([r[k] for r in records]) for k in FIELDS}
+        t0 = time.perf_counter()
+        res = score_batch(columns)
+        t_columns = time.perf_counter() - t0
+        got_cols = list(iter_results(res))
+
+        diffs = [(i, e, g) for i, (e, g) in enumerate(zip(expected, got)) if tuple(e) != tuple(g)]
+        diffs += [(i, e, g) for i, (e, g) in enumerate(zip(expected, got_cols)) if tuple(e) != tuple(g)]
+        print(f"{n:>8} {t_scalar:>9.3f} {t_records:>10.3f} {t_columns:>10.3f} "
+              f"{t_scalar / max(t_columns, 1e-9):>7.1f}x {len(diffs):>9}")
+        for i, e, g in diffs[:10]:
+            print(f"  row {i}: scalar={e} batch={g}")
+        failed = failed or bool(diffs)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Toplu PDF yeniden üretim benchmark'ı (app.bulk_pdf).
+
+Geçici bir SQLite veritabanına N sentetik analiz yazar, `python -m app.bulk_pdf` CLI'sini ayrı
+bir process'te çalıştırır ve rapor/dk ile ana process'in tepe RSS'ini raporlar. Farklı N
+değerlerinde RSS'in sabit kalması beklenir (keyset okuma + sınırlı in-flight iş).
+
+Kullanım (repo kökünden):
+    python -m bench.bulk_pdf
+    python -m bench.bulk_pdf --sizes 500 5000 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+def _seed(db_url: str, n: int) -> None:
+    # ayrı process: DATABASE_URL app.db import edilmeden önce ayarlanmalı
+    code = f"""
+import json
+from app.db import Base, SessionLocal, engine
+from app.models import Analysis, Company
+Base.metadata.create_all(bind=engine)
+db = SessionLocal()
+companies = [Company(name=f"Örnek {{i}} A.Ş.", sector="energy") for i in range(50)]
+db.add_all(companies)
+db.commit()
+bullets = [f"Özet madde {{j + 1}}: nakit dönüşüm süresi ve kısa vadeli borç baskısı izlenmeli." for j in range(10)]
+rows = [{{"company_id": companies[i % 50].id, "result_json": json.dumps({{"bullets": bullets, "mapping_log": ["x" * 80] * 200}}, ensure_ascii=False)}}
+        for i in range({n})]
+db.bulk_insert_mappings(Analysis, rows)
+db.commit()
+"""
+    subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "DATABASE_URL": db_url})
+
+
+def run_case(n: int, workers: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{tmp}/bench.db"
+        _seed(db_url, n)
+        proc = subprocess.run(
+            [sys.executable, "-m", "app.bulk_pdf", "--workers", str(workers), "--out-dir", str(Path(tmp) / "pdf")],
+            check=True, capture_output=True, text=True, env={**os.environ, "DATABASE_URL": db_url},
+        )
+        return json.loads(proc.stdout)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[300, 3000])
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = ap.parse_args()
+
+    print(f"{'analyses':>9} {'workers':>8} {'seconds':>8} {'reports/min':>12} {'failed':>7} {'peak_rss_mb':>12}")
+    for n in args.sizes:
+        r = run_case(n, args.workers)
+        print(f"{n:>9} {args.workers:>8} {r['elapsed_s']:>8.1f} {r['reports_per_min']:>12.0f} "
+              f"{r['failed']:>7} {r.get('peak_rss_mb', 0):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
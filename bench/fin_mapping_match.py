@@ -0,0 +1,114 @@
+"""
+map_item_to_key benchmark + regresyon kontrolü.
+
+İndeksli eşleştiriciyi eski lineer algoritmayla (contains için terim başına regex,
+fuzzy için tüm terimlere SequenceMatcher) aynı korpus üzerinde kıyaslar; anahtarlar
+birebir aynı değilse farkları listeler ve 1 ile çıkar.
+
+Kullanım (repo kökünden):
+    python -m bench.fin_mapping_match
+    python -m bench.fin_mapping_match --xlsx "TEST SAVUNMA.xlsx" --variants 8
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from difflib import SequenceMatcher
+from typing import List, Optional
+
+from app import fin_mapping as fm
+
+
+def _reference_map(item_name: str) -> Optional[str]:
+    n = fm.normalize_text(item_name)
+    if not n:
+        return None
+    if n in fm._term_to_key:
+        return fm._term_to_key[n]
+    for term in fm._sorted_terms_for_contains:
+        if len(term) < 8 or term in fm._GENERIC_CONTAINS_BLACKLIST:
+            continue
+        if re.search(r"(?:^|\s)" + re.escape(term) + r"(?:$|\s)", n):
+            return fm._term_to_key[term]
+    best = None
+    for cand in fm._all_norm_terms:
+        ratio = SequenceMatcher(None, n, cand).ratio()
+        if best is None or ratio > best[1]:
+            best = (cand, ratio)
+    if best and best[1] >= 0.86:
+        return fm._term_to_key.get(best[0])
+    return None
+
+
+def build_corpus(xlsx: Optional[str], variants: int, seed: int = 3) -> List[str]:
+    rnd = random.Random(seed)
+    base = set(fm.CANONICAL_KEYS.values())
+    for key, terms in fm.SYNONYMS.items():
+        base.update(terms)
+        base.add(key)
+    if xlsx:
+        from openpyxl import load_workbook
+        wb = load_workbook(xlsx, data_only=True, read_only=True)
+        for ws in wb:
+            for row in ws.iter_rows(values_only=True):
+                base.update(v for v in row if isinstance(v, str))
+        wb.close()
+
+    def mutate(s: str) -> str:
+        chars = list(s)
+        if not chars:
+            return s
+        i = rnd.randrange(len(chars))
+        op = rnd.randint(0, 3)
+        if op == 0:
+            del chars[i]
+        elif op == 1:
+            chars.insert(i, rnd.choice("abcdeiklmnorstuyz "))
+        elif op == 2 and i + 1 < len(chars):
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+        else:
+            chars[i] = rnd.choice("abcdeiklmnorstuyz")
+        return "".join(chars)
+
+    out = set(base)
+    for t in base:
+        for _ in range(variants):
+            out.add(mutate(t))
+        out.add("Diğer " + t)
+        out.add(t + " Toplamı")
+    words = " ".join(base).split()
+    for _ in range(len(base) * 2):
+        out.add(" ".join(rnd.choice(words) for _ in range(rnd.randint(1, 6))))
+    return sorted(out)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--xlsx", default=None, help="Kalem adları korpusa eklenecek Excel")
+    ap.add_argument("--variants", type=int, default=4)
+    args = ap.parse_args()
+
+    corpus = build_corpus(args.xlsx, args.variants)
+
+    t0 = time.perf_counter()
+    expected = [_reference_map(x) for x in corpus]
+    t_ref = time.perf_counter() - t0
+
+    fm._map_normalized.cache_clear()
+    t0 = time.perf_counter()
+    got = [fm.map_item_to_key(x) for x in corpus]
+    t_idx = time.perf_counter() - t0
+
+    diffs = [(x, e, g) for x, e, g in zip(corpus, expected, got) if e != g]
+    print(f"corpus={len(corpus)}  linear={t_ref:.2f}s  indexed={t_idx:.2f}s  speedup={t_ref / max(t_idx, 1e-9):.1f}x")
+    print(f"mismatches={len(diffs)}")
+    for x, e, g in diffs[:20]:
+        print(f"  {x!r}: linear={e} indexed={g}")
+    sys.exit(1 if diffs else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Cold start benchmark'ı: `import app.main` + create_app() süresi.
+
+Her ölçüm yeni bir Python process'inde yapılır (modül cache'i yok):
+1) `python -X importtime -c "import app.main"` çıktısından app.main'in kümülatif süresi ve
+   en pahalı alt modüller,
+2) import + create_app() duvar saati,
+3) import sonrası yüklü ağır modüller (openpyxl, numpy, reportlab, smtplib) ve DB dosyasının
+   import sırasında oluşup oluşmadığı.
+
+--baseline REV verilirse aynı ölçümler `git archive REV` ile çıkarılan ağaçta da yapılır
+(factory öncesi sürümde create_app yoktur; modül seviyesindeki `app` kullanılır).
+
+Kullanım (repo kökünden):
+    python -m bench.import_time
+    python -m bench.import_time --baseline HEAD~1 --repeat 7
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ("openpyxl", "numpy", "reportlab", "smtplib")
+
+PROBE = """
+import json, os, sys, time
+t0 = time.perf_counter()
+import app.main as m
+t1 = time.perf_counter()
+application = m.create_app() if hasattr(m, "create_app") else m.app
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "factory_ms": (t2 - t1) * 1000,
+    "heavy": [n for n in %r if n in sys.modules],
+    "db_created": os.path.exists(os.environ["BENCH_DB"]),
+}))
+""" % (HEAVY,)
+
+
+def _env(tmp: str) -> Dict[str, str]:
+    db = os.path.join(tmp, "bench.db")
+    env = dict(os.environ)
+    env.update({"DATABASE_URL": f"sqlite:///{db}", "BENCH_DB": db, "PYTHONDONTWRITEBYTECODE": "1"})
+    env.pop("PYTHONPATH", None)
+    return env
+
+
+def _importtime(tree: Path) -> Tuple[float, List[Tuple[int, str]]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        r = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import app.main"],
+            cwd=tree, env=_env(tmp), capture_output=True, text=True, check=True,
+        )
+    total, rows = 0.0, []
+    for line in r.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = (p.strip() for p in line[len("import time:"):].split("|"))
+        rows.append((int(self_us), name))
+        if name == "app.main":
+            total = int(cum_us) / 1000
+    return total, sorted(rows, reverse=True)
+
+
+def _probe(tree: Path) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        r = subprocess.run([sys.executable, "-c", PROBE], cwd=tree, env=_env(tmp), capture_output=True, text=True, check=True)
+    return json.loads(r.stdout.strip().splitlines()[-1])
+
+
+def measure(label: str, tree: Path, repeat: int, top: int) -> dict:
+    _probe(tree)  # .pyc + disk cache ısınsın
+    totals, probes, rows = [], [], []
+    for _ in range(repeat):
+        total, rows = _importtime(tree)
+        totals.append(total)
+        probes.append(_probe(tree))
+    out = {
+        "importtime_ms": statistics.median(totals),
+        "import_ms": statistics.median(p["import_ms"] for p in probes),
+        "factory_ms": statistics.median(p["factory_ms"] for p in probes),
+        "heavy": probes[-1]["heavy"],
+        "db_created": probes[-1]["db_created"],
+    }
+    print(f"\n[{label}] {tree}")
+    print(f"  -X importtime app.main (kümülatif) p50 {out['importtime_ms']:8.1f} ms")
+    print(f"  import app.main  p50 {out['import_ms']:8.1f} ms;  create_app p50 {out['factory_ms']:6.1f} ms")
+    print(f"  import sonrası yüklü ağır modüller: {', '.join(out['heavy']) or '-'}")
+    print(f"  import DB dosyası oluşturdu mu: {'evet' if out['db_created'] else 'hayır'}")
+    print(f"  en pahalı {top} modül (self):")
+    for self_us, name in rows[:top]:
+        print(f"    {self_us / 1000:8.1f} ms  {name}")
+    return out
+
+
+def _extract(rev: str, dest: Path) -> Path:
+    data = subprocess.run(["git", "archive", rev], cwd=ROOT, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+        tar.extractall(dest, filter="data")
+    return dest
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=10)
+    ap.add_argument("--baseline", default=None, help="kıyas için git revizyonu (ör. HEAD~1)")
+    args = ap.parse_args()
+
+    current = measure("çalışma ağacı", ROOT, args.repeat, args.top)
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as tmp:
+            base = measure(args.baseline, _extract(args.baseline, Path(tmp)), args.repeat, args.top)
+        print(f"\nimport app.main: {base['import_ms']:.1f} ms -> {current['import_ms']:.1f} ms "
+              f"({base['import_ms'] - current['import_ms']:+.1f} ms kazanç)")
+
+
+if __name__ == "__main__":
+    main()
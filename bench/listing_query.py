@@ -0,0 +1,133 @@
+"""
+Admin liste sorguları benchmark'ı (app.listing).
+
+Geçici bir SQLite veritabanına N upload + M analiz yazar (yükün çoğu tek bir "büyük" firmada)
+ve büyük firmanın listesinde farklı derinliklerdeki sayfaların gecikmesini ölçer:
+- keyset    : listing.list_uploads / list_analyses (cursor ile devam)
+- offset    : aynı sıralama, OFFSET ile (eski yaklaşımın sayfalı hali)
+- latest    : "son excel upload" araması
+Sonra kompozit indeksler silinip aynı ölçüm tekrarlanır.
+
+Kullanım (repo kökünden):
+    python -m bench.listing_query
+    python -m bench.listing_query --uploads 100000 --analyses 100000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp.name}/bench.db"
+
+from sqlalchemy import select, text  # noqa: E402
+
+from app.db import SessionLocal, engine  # noqa: E402
+from app.migrations import ensure_schema  # noqa: E402
+from app.models import Analysis, Company, Upload  # noqa: E402
+from app import listing  # noqa: E402
+
+INDEXES = ("ix_uploads_company_uploaded", "ix_uploads_company_kind_uploaded", "ix_analyses_company_created")
+BIG = 1
+DEPTHS = (0, 10, 100, 1000)
+
+
+def seed(companies: int, uploads: int, analyses: int, big_share: float) -> None:
+    rnd = random.Random(7)
+    t0 = datetime(2020, 1, 1)
+    db = SessionLocal()
+    db.bulk_insert_mappings(Company, [{"id": c + 1, "name": f"Firma {c}", "sector": "energy"} for c in range(companies)])
+
+    def company() -> int:
+        return BIG if rnd.random() < big_share else rnd.randint(2, companies)
+
+    rows = []
+    for i in range(uploads):
+        rows.append({"company_id": company(), "kind": "excel" if i % 4 else "pdf", "filename": f"m{i}.xlsx",
+                     "path": "-", "uploaded_at": t0 + timedelta(minutes=i)})
+    db.bulk_insert_mappings(Upload, rows)
+    rows = [{"company_id": company(), "result_json": "{}", "created_at": t0 + timedelta(minutes=i)} for i in range(analyses)]
+    db.bulk_insert_mappings(Analysis, rows)
+    db.commit()
+    db.close()
+
+
+def _ms(fn, repeat: int) -> float:
+    lat = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        lat.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(lat)
+
+
+def _cursors(db, fetch, depths) -> dict:
+    """Her derinlik için o sayfaya ulaştıran cursor (sayfalar yürünerek bulunur)."""
+    out, cursor = {}, ""
+    for p in range(max(depths) + 1):
+        if p in depths:
+            out[p] = cursor
+        cursor = fetch(cursor)["next_cursor"]
+        if cursor is None:
+            break
+    return out
+
+
+def run(label: str, page_size: int, repeat: int) -> None:
+    db = SessionLocal()
+    big_uploads = db.execute(text("select count(*) from uploads where company_id = :c"), {"c": BIG}).scalar()
+    pages = big_uploads // page_size
+    depths = [d for d in DEPTHS if d < pages]
+    print(f"\n[{label}] büyük firma: {big_uploads} upload ({pages} sayfa x {page_size})")
+
+    up = lambda c: listing.list_uploads(db, BIG, cursor=c, limit=page_size)  # noqa: E731
+    an = lambda c: listing.list_analyses(db, BIG, ("current_ratio",), cursor=c, limit=page_size)  # noqa: E731
+    for name, fetch, model, col in (("uploads", up, Upload, Upload.uploaded_at), ("analyses", an, Analysis, Analysis.created_at)):
+        cursors = _cursors(db, fetch, depths)
+        for d in depths:
+            keyset = _ms(lambda: fetch(cursors[d]), repeat)
+            q = select(model.id, col).where(model.company_id == BIG).order_by(col.desc(), model.id.desc())
+            offset = _ms(lambda: db.execute(q.offset(d * page_size).limit(page_size)).all(), repeat)
+            print(f"  {name:8s} sayfa {d:5d}: keyset {keyset:7.2f} ms   offset {offset:7.2f} ms")
+
+    print(f"  latest_upload: {_ms(lambda: listing.latest_upload(db, BIG), repeat * 5):.3f} ms")
+    plan = db.execute(text(
+        "explain query plan select id from uploads where company_id = 1 and kind = 'excel' order by uploaded_at desc limit 1"
+    )).all()
+    print("  plan:", "; ".join(r[-1] for r in plan))
+    db.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--companies", type=int, default=500)
+    ap.add_argument("--uploads", type=int, default=100_000)
+    ap.add_argument("--analyses", type=int, default=100_000)
+    ap.add_argument("--big-share", type=float, default=0.6, help="büyük firmaya düşen satır oranı")
+    ap.add_argument("--page-size", type=int, default=50)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    ensure_schema(engine)
+    t0 = time.perf_counter()
+    seed(args.companies, args.uploads, args.analyses, args.big_share)
+    with engine.begin() as conn:
+        conn.execute(text("analyze"))
+    print(f"seed: {args.uploads} upload + {args.analyses} analiz, {time.perf_counter() - t0:.1f} s")
+
+    run("kompozit indeksler", args.page_size, args.repeat)
+
+    with engine.begin() as conn:
+        for name in INDEXES:
+            conn.execute(text(f"drop index {name}"))
+        conn.execute(text("analyze"))
+    run("indekssiz", args.page_size, max(3, args.repeat // 5))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Admin giriş gecikmesi benchmark'ı (app.passwords).
+
+1) Tek hash doğrulamasının maliyeti: eski SHA-256, PBKDF2, scrypt (güncel ayarlarla).
+2) Eşzamanlı giriş patlaması: C eşzamanlı /admin/login (ASGI üzerinden, ağ yok) sırasında
+   /health'e sürekli istek atılır. Giriş p50/p95, havuz dolu (503) sayısı ve /health gecikmesi
+   raporlanır; /health'in düşük kalması KDF'in event loop'u ve request thread'lerini
+   tıkamadığını gösterir.
+
+Kullanım (repo kökünden):
+    python -m bench.login_latency
+    PASSWORD_WORKERS=4 PASSWORD_QUEUE_DEPTH=64 python -m bench.login_latency --concurrency 64
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp.name}/bench.db"
+os.environ.setdefault("ADMIN_EMAIL", "bench@example.com")
+os.environ.setdefault("ADMIN_PASSWORD", "bench-password")
+os.environ.setdefault("PARSE_WORKERS", "0")
+
+import httpx  # noqa: E402
+
+from app import passwords  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def _pct(lat, q):
+    lat = sorted(lat)
+    return lat[min(len(lat) - 1, int(len(lat) * q))]
+
+
+def kdf_costs(repeat: int) -> None:
+    pw = "correct horse battery"
+    for label, stored in (
+        ("sha256 (eski)", passwords._legacy(pw)),
+        (f"pbkdf2_sha256 ({passwords.PASSWORD_PBKDF2_ITERATIONS} it)", passwords.hash_password(pw, "pbkdf2_sha256")),
+        (f"scrypt (n={passwords.PASSWORD_SCRYPT_N}, r={passwords.PASSWORD_SCRYPT_R})", passwords.hash_password(pw, "scrypt")),
+    ):
+        lat = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            assert passwords.verify_password(pw, stored)
+            lat.append((time.perf_counter() - t0) * 1000)
+        print(f"  {label:36s} {statistics.median(lat):8.2f} ms")
+
+
+async def burst(concurrency: int, rounds: int) -> None:
+    email, password = os.environ["ADMIN_EMAIL"], os.environ["ADMIN_PASSWORD"]
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="https://bench") as client:
+            # ilk giriş admin'i oluşturur (+ gerekirse rehash)
+            await client.post("/admin/login", data={"email": email, "password": password})
+
+            login_lat, statuses, health_lat = [], {}, []
+            stop = asyncio.Event()
+
+            async def login(i: int) -> None:
+                pw = password if i % 4 else "yanlis-sifre"
+                t0 = time.perf_counter()
+                r = await client.post("/admin/login", data={"email": email, "password": pw})
+                login_lat.append((time.perf_counter() - t0) * 1000)
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+            async def probe() -> None:
+                while not stop.is_set():
+                    t0 = time.perf_counter()
+                    await client.get("/health")
+                    health_lat.append((time.perf_counter() - t0) * 1000)
+                    await asyncio.sleep(0.005)
+
+            # boşta /health referansı
+            for _ in range(50):
+                t0 = time.perf_counter()
+                await client.get("/health")
+                health_lat.append((time.perf_counter() - t0) * 1000)
+            idle = statistics.median(health_lat)
+            health_lat.clear()
+
+            prober = asyncio.create_task(probe())
+            t0 = time.perf_counter()
+            for _ in range(rounds):
+                await asyncio.gather(*(login(i) for i in range(concurrency)))
+            wall = time.perf_counter() - t0
+            stop.set()
+            await prober
+
+    n = concurrency * rounds
+    print(f"  {n} giriş / {wall:.2f} s ({n / wall:.1f} giriş/s), durumlar: {dict(sorted(statuses.items()))}")
+    print(f"  giriş  p50 {statistics.median(login_lat):8.1f} ms   p95 {_pct(login_lat, 0.95):8.1f} ms")
+    print(f"  /health boşta p50 {idle:.2f} ms; patlama sırasında p50 {statistics.median(health_lat):.2f} ms "
+          f"p95 {_pct(health_lat, 0.95):.2f} ms ({len(health_lat)} istek)")
+    print(f"  havuz: {passwords.pool.stats()}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--rounds", type=int, default=3)
+    ap.add_argument("--repeat", type=int, default=10)
+    args = ap.parse_args()
+
+    print("Tek doğrulama:")
+    kdf_costs(args.repeat)
+    print(f"\nEşzamanlı giriş (algo={passwords.PASSWORD_HASH_ALGO}, workers={passwords.pool.workers}, "
+          f"queue={passwords.pool.queue_depth}, concurrency={args.concurrency}):")
+    asyncio.run(burst(args.concurrency, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
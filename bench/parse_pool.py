@@ -0,0 +1,75 @@
+"""
+ParsePool throughput benchmark: in-process (0) vs 1/2/4 worker process.
+
+Sentetik bir mizanı N kez (cache kapalı) parse+analyze eder; eşzamanlı istemcileri thread'lerle
+taklit eder ve toplam süre, iş/sn ve p50/p95 gecikmeyi raporlar. Worker'lar ölçümden önce
+warm_up() ile başlatılır, böylece spawn/import maliyeti sonuçlara karışmaz.
+
+Kullanım (repo kökünden):
+    python -m bench.parse_pool
+    python -m bench.parse_pool --rows 50000 --jobs 16 --workers 0 2 4
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+os.environ["PARSE_CACHE_ENABLED"] = "0"  # her iş gerçekten parse etsin
+
+from app.workers import ParsePool, parse_and_analyze  # noqa: E402
+from bench.parse_xlsx import make_mizan  # noqa: E402
+
+
+def run_case(path: Path, workers: int, jobs: int, clients: int) -> dict:
+    pool = ParsePool(workers, queue_depth=max(jobs, 1), max_mb=0)
+    pool.warm_up()
+    try:
+        def one(_i: int) -> float:
+            t0 = time.perf_counter()
+            pool.run(parse_and_analyze, str(path), "energy")
+            return time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as ex:
+            lat = sorted(ex.map(one, range(jobs)))
+        wall = time.perf_counter() - t0
+    finally:
+        pool.shutdown(wait=True)
+
+    return {
+        "wall_s": wall,
+        "jobs_per_s": jobs / wall,
+        "p50_s": statistics.median(lat),
+        "p95_s": lat[min(len(lat) - 1, int(len(lat) * 0.95))],
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, default=20_000)
+    ap.add_argument("--jobs", type=int, default=8)
+    ap.add_argument("--clients", type=int, default=4, help="Eşzamanlı istemci (thread) sayısı")
+    ap.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    ap.add_argument("--workdir", type=Path, default=None)
+    args = ap.parse_args()
+
+    workdir = args.workdir or Path(tempfile.gettempdir()) / "cashguard-bench"
+    workdir.mkdir(parents=True, exist_ok=True)
+    path = workdir / f"mizan_{args.rows}.xlsx"
+    if not path.exists():
+        make_mizan(path, args.rows)
+
+    print(f"rows={args.rows} jobs={args.jobs} clients={args.clients} cpu={os.cpu_count()}")
+    print(f"{'workers':>8} {'wall_s':>8} {'jobs/s':>8} {'p50_s':>7} {'p95_s':>7}")
+    for w in args.workers:
+        r = run_case(path, w, args.jobs, args.clients)
+        print(f"{w:>8} {r['wall_s']:>8.2f} {r['jobs_per_s']:>8.2f} {r['p50_s']:>7.2f} {r['p95_s']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
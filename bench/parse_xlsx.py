@@ -0,0 +1,100 @@
+"""
+parse_financials_xlsx benchmark: read-only streaming vs tam yükleme.
+
+Sentetik mizanlar (10k/100k/500k satır) üretir ve her (mod, boyut) kombinasyonunu ayrı bir
+process'te çalıştırıp duvar saati süresini ve peak RSS'i raporlar.
+
+Kullanım (repo kökünden):
+    python -m bench.parse_xlsx
+    python -m bench.parse_xlsx --sizes 10000 100000 --repeat 3
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from openpyxl import Workbook
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_ACCOUNTS = [
+    (100, "Kasa"), (102, "Bankalar"), (120, "Alıcılar"), (153, "Ticari Mallar"),
+    (191, "İndirilecek KDV"), (253, "Tesis Makine ve Cihazlar"), (257, "Birikmiş Amortismanlar (-)"),
+    (300, "Banka Kredileri"), (320, "Satıcılar"), (360, "Ödenecek Vergi ve Fonlar"),
+    (400, "Banka Kredileri"), (500, "Sermaye"), (570, "Geçmiş Yıllar Karları"),
+    (600, "Yurtiçi Satışlar"), (620, "Satılan Mamuller Maliyeti"), (632, "Genel Yönetim Giderleri"),
+    (660, "Kısa Vadeli Borçlanma Giderleri"), (780, "Finansman Giderleri"),
+]
+
+
+def make_mizan(path: Path, n_rows: int, seed: int = 42) -> None:
+    rnd = random.Random(seed)
+    wb = Workbook(write_only=True)
+
+    ws = wb.create_sheet("MIZAN")
+    ws.append(["Sentetik Mizan"])
+    ws.append([])
+    ws.append(["Hesap Kodu", "Hesap Adı", "Borç", "Alacak", "Bakiye Borç", "Bakiye Alacak"])
+    for i in range(n_rows):
+        code3, name = _ACCOUNTS[i % len(_ACCOUNTS)]
+        bal = round(rnd.uniform(-1e5, 1e5), 2)
+        ws.append([f"{code3}.{i % 97:02d}.{i:06d}", f"{name} {i}", abs(bal), 0, max(bal, 0), max(-bal, 0)])
+
+    gelir = wb.create_sheet("GELIR")
+    gelir.append(["Gelir Tablosu"])
+    gelir.append(["Açıklama", "Tutar"])
+    for name, val in [("Net Satışlar", 1.2e7), ("Satışların Maliyeti", -8e6), ("Finansman Giderleri", -4e5)]:
+        gelir.append([name, val])
+
+    wb.save(str(path))
+
+
+_CHILD = r"""
+import json, resource, sys, time
+sys.path.insert(0, sys.argv[1])
+from app.analysis_engine import parse_financials_xlsx
+t0 = time.perf_counter()
+for _ in range(int(sys.argv[4])):
+    fin = parse_financials_xlsx(sys.argv[2], read_only=(sys.argv[3] == "streaming"))
+wall = (time.perf_counter() - t0) / int(sys.argv[4])
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"wall_s": wall, "peak_rss_mb": rss_kb / 1024.0,
+                  "rows": len(fin["mapping_log"]["trial_balance_rows"])}))
+"""
+
+
+def run_case(path: Path, mode: str, repeat: int) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, str(ROOT), str(path), mode, str(repeat)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    ap.add_argument("--repeat", type=int, default=1)
+    ap.add_argument("--workdir", type=Path, default=None, help="Sentetik xlsx'lerin yazılacağı klasör")
+    args = ap.parse_args()
+
+    workdir = args.workdir or Path(tempfile.gettempdir()) / "cashguard-bench"
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    print(f"{'rows':>8} {'mode':>10} {'wall_s':>9} {'peak_rss_mb':>12}")
+    for n in args.sizes:
+        path = workdir / f"mizan_{n}.xlsx"
+        if not path.exists():
+            make_mizan(path, n)
+        for mode in ("full", "streaming"):
+            r = run_case(path, mode, args.repeat)
+            print(f"{n:>8} {mode:>10} {r['wall_s']:>9.2f} {r['peak_rss_mb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+PDF render benchmark: build_pdf_report (public) ve build_admin_analysis_pdf (admin).
+
+Her rapor türü için tek sayfalık ve çok sayfalık (uzun mesaj/madde listesi) bir örnek
+render eder; saniyedeki render sayısını ve PDF başına bayt sayısını raporlar. İlk render
+(font kaydı, logo yükleme) ayrı gösterilir.
+
+Kullanım (repo kökünden):
+    python -m bench.pdf_render
+    python -m bench.pdf_render --seconds 5
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, Dict, List, Tuple
+
+from app.admin_pdf import build_admin_analysis_pdf
+from app.pdf_report import build_pdf_report
+
+_MESSAGES = [
+    "Vade makası çok yüksek (tahsilat-ödeme farkı 90+ gün).",
+    "Döviz uyumsuzluğu yüksek (döviz borcu gelirden belirgin fazla).",
+    "Nakit tamponu yetersiz (3 aydan az).",
+]
+
+
+def _payload(n_messages: int) -> dict:
+    return {
+        "company": "Örnek Savunma A.Ş.",
+        "sector": "Savunma Sanayi",
+        "score": 42,
+        "level": "RED",
+        "messages": [_MESSAGES[i % 3] + f" ({i + 1})" for i in range(n_messages)],
+        "collection_days": 150,
+        "payable_days": 45,
+        "fx_debt_ratio": 60,
+        "fx_revenue_ratio": 20,
+        "cash_buffer_months": 2,
+        "top_customer_share": 55,
+        "delay_issue": "yes",
+        "short_debt_ratio": 65,
+        "limit_pressure": "yes",
+        "hedging": "none",
+    }
+
+
+def _bullets(n: int) -> List[str]:
+    return [f"Özet madde {i + 1}: nakit dönüşüm süresi ve kısa vadeli borç baskısı izlenmeli." for i in range(n)]
+
+
+CASES: Dict[str, Callable[[], bytes]] = {
+    "public_1p": lambda: build_pdf_report(_payload(3)),
+    "public_3p": lambda: build_pdf_report(_payload(60)),
+    "admin_1p": lambda: build_admin_analysis_pdf("Örnek A.Ş.", "Enerji", _bullets(10)),
+    "admin_3p": lambda: build_admin_analysis_pdf("Örnek A.Ş.", "Enerji", _bullets(90)),
+}
+
+
+def run(fn: Callable[[], bytes], seconds: float) -> Tuple[float, float, int]:
+    t0 = time.perf_counter()
+    first = fn()
+    cold_ms = (time.perf_counter() - t0) * 1000
+
+    n = 0
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        fn()
+        n += 1
+    return cold_ms, n / (time.perf_counter() - t0), len(first)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--seconds", type=float, default=2.0, help="Vaka başına ölçüm süresi")
+    args = ap.parse_args()
+
+    print(f"{'case':>10} {'cold_ms':>8} {'renders/s':>10} {'bytes':>8}")
+    for name, fn in CASES.items():
+        cold_ms, rps, size = run(fn, args.seconds)
+        print(f"{name:>10} {cold_ms:>8.1f} {rps:>10.1f} {size:>8}")
+
+
+if __name__ == "__main__":
+    main()
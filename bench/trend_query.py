@@ -0,0 +1,95 @@
+"""
+Firma metrik trendi benchmark'ı (app.timeseries).
+
+Geçici bir SQLite veritabanına N firma x M aylık analiz (analysis_metrics dahil) yazar;
+rebuild() süresini, trend() sorgusunun p50/p95 gecikmesini ve yeni bir ay eklemenin
+(record()) maliyetini raporlar. Hiçbir Excel parse edilmez.
+
+Kullanım (repo kökünden):
+    python -m bench.trend_query
+    python -m bench.trend_query --companies 200 --months 120
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp.name}/bench.db"
+
+from app.analysis_store import METRIC_KEYS  # noqa: E402
+from app.db import SessionLocal, engine  # noqa: E402
+from app.migrations import ensure_schema  # noqa: E402
+from app.models import Analysis, AnalysisJob, AnalysisMetrics, Company, Upload  # noqa: E402
+from app import timeseries  # noqa: E402
+
+
+def seed(companies: int, months: int) -> None:
+    rnd = random.Random(11)
+    db = SessionLocal()
+    db.bulk_insert_mappings(Company, [{"id": c + 1, "name": f"Firma {c}", "sector": "energy"} for c in range(companies)])
+    analyses, metrics, uploads, jobs = [], [], [], []
+    aid = 0
+    for c in range(1, companies + 1):
+        for m in range(months):
+            aid += 1
+            period = timeseries._add_months(timeseries.month_start(timeseries.date(2015, 1, 1)), m)
+            analyses.append({"id": aid, "company_id": c, "result_json": "{}"})
+            metrics.append({"analysis_id": aid, **{k: rnd.uniform(-3, 3) for k in METRIC_KEYS}})
+            uploads.append({"id": aid, "company_id": c, "kind": "excel", "filename": "m.xlsx", "path": "-", "period": period})
+            jobs.append({"company_id": c, "upload_id": aid, "status": "done", "analysis_id": aid})
+    for model, rows in ((Analysis, analyses), (AnalysisMetrics, metrics), (Upload, uploads), (AnalysisJob, jobs)):
+        db.bulk_insert_mappings(model, rows)
+    db.commit()
+    db.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--companies", type=int, default=100)
+    ap.add_argument("--months", type=int, default=120)
+    ap.add_argument("--queries", type=int, default=500)
+    args = ap.parse_args()
+
+    ensure_schema(engine)
+    seed(args.companies, args.months)
+
+    t0 = time.perf_counter()
+    points = timeseries.rebuild()
+    print(f"rebuild: {points} nokta, {time.perf_counter() - t0:.2f} s")
+
+    rnd = random.Random(5)
+    db = SessionLocal()
+    for label, kwargs in (
+        ("trend (8 metrik, tüm dönem)", {}),
+        ("trend (1 metrik, son 24 ay)", {"metrics": ["current_ratio"], "period_from": timeseries.date(2023, 1, 1)}),
+    ):
+        lat = []
+        for _ in range(args.queries):
+            cid = rnd.randint(1, args.companies)
+            t0 = time.perf_counter()
+            timeseries.trend(db, cid, **kwargs)
+            lat.append((time.perf_counter() - t0) * 1000)
+        lat.sort()
+        print(f"{label}: p50 {statistics.median(lat):.2f} ms  p95 {lat[int(len(lat) * 0.95)]:.2f} ms")
+
+    # geçmişe (ortaya) yeni bir ay eklemek: sonraki 12 ayın türetilmiş değerleri yeniden hesaplanır
+    lat = []
+    for i in range(20):
+        cid = rnd.randint(1, args.companies)
+        a = Analysis(company_id=cid, result_json="{}")
+        db.add(a)
+        db.commit()
+        t0 = time.perf_counter()
+        timeseries.record(db, cid, a.id, timeseries.date(2019, 1 + i % 12, 1), {k: 1.0 for k in METRIC_KEYS})
+        lat.append((time.perf_counter() - t0) * 1000)
+    print(f"record (geçmiş ay): p50 {statistics.median(lat):.1f} ms  max {max(lat):.1f} ms")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
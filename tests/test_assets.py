@@ -0,0 +1,30 @@
+from app.assets import minify_css, minify_js
+
+
+def test_js_block_comments_do_not_swallow_code():
+    out = minify_js("/* a */ x = 1;\nfoo();\ny = 2; /* b */")
+    assert out == "x = 1;\nfoo();\ny = 2;\n"
+
+
+def test_js_template_literal_kept_verbatim():
+    src = "const t = `line1\n    indented ${a /* c */ + `in ${b}`} // not a comment\n  end`;\n"
+    assert minify_js(src) == src
+
+
+def test_js_strings_and_regex_kept():
+    src = "s = '// x'; u = \"/* y */\";\nr = /[/]\\/x/g.test(s); z = a / b / c;\nreturn /a  b/;\n"
+    assert minify_js(src) == src
+
+
+def test_js_drops_comments_indentation_and_blank_lines():
+    src = "function f() {\n    // yorum\n\n    return 1;  /* sondaki */\n}\n"
+    assert minify_js(src) == "function f() {\nreturn 1;\n}\n"
+
+
+def test_css_keeps_descendant_pseudo_selector():
+    assert minify_css(".card :first-child { color: red; }") == ".card :first-child{color:red}\n"
+
+
+def test_css_strings_untouched():
+    out = minify_css('a::before { content: "x  ;}  /* y */" ; }\n/* c */ b > c , d { margin: 0 auto }')
+    assert out == 'a::before{content:"x  ;}  /* y */"}b>c,d{margin:0 auto}\n'